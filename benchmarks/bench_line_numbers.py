@@ -0,0 +1,112 @@
+"""
+Benchmark de la numeración de líneas del código: modo 'inline' frente a 'table'
+
+Con los archivos de código de bench_pipeline mide, para cada modo, el
+tiempo de generar el HTML y el de maquetarlo con WeasyPrint, junto con
+las páginas resultantes. El modo 'table' obliga a WeasyPrint a partir
+entre páginas una única fila de tabla con todo el archivo, y su coste
+crece mucho más deprisa con la longitud.
+
+Uso:
+    python benchmarks/bench_line_numbers.py
+    python benchmarks/bench_line_numbers.py --scale 4 --output resultados.json
+"""
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from bench_pipeline import generate_corpus  # noqa: E402
+
+
+def run_case(name: str, files: list[str], mode: str) -> dict:
+    """
+    Mide un caso con un modo de numeración (en un proceso nuevo)
+
+    Args:
+        name: Nombre del caso
+        files: Archivos de código del caso
+        mode: 'inline' o 'table'
+
+    Returns:
+        Resultado del caso
+    """
+    from src.pdf_generator import PDFGenerator
+    from src.utils import get_language_from_extension, read_file_content
+
+    generator = PDFGenerator(line_number_mode=mode, parallel_threshold=None)
+    generator.warm_up()
+
+    html_seconds = render_seconds = 0.0
+    pages = lines = 0
+    for path in files:
+        content = read_file_content(path)
+        lines += content.count('\n') + 1
+
+        started = time.perf_counter()
+        html_content = generator.code_converter.convert(
+            content, get_language_from_extension(path), Path(path).name, True
+        )
+        full_html = generator._get_html_template(html_content, title=Path(path).name)
+        html_seconds += time.perf_counter() - started
+
+        started = time.perf_counter()
+        pages += len(generator._render_html(full_html).pages)
+        render_seconds += time.perf_counter() - started
+
+    return {
+        'case': name,
+        'mode': mode,
+        'lines': lines,
+        'pages': pages,
+        'html_s': round(html_seconds, 4),
+        'render_s': round(render_seconds, 4),
+        'total_s': round(html_seconds + render_seconds, 4),
+    }
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    """Punto de entrada del benchmark"""
+    parser = argparse.ArgumentParser(description='Benchmark de la numeración de líneas')
+    parser.add_argument('--scale', type=float, default=1.0, help='Factor de tamaño del corpus')
+    parser.add_argument('--output', help='Guardar los resultados en este JSON')
+    args = parser.parse_args(argv)
+
+    results = []
+    with tempfile.TemporaryDirectory(prefix='padlef-bench-') as tmp_dir:
+        corpus = generate_corpus(Path(tmp_dir), args.scale)
+        for name, files in corpus.items():
+            if not name.startswith('code'):
+                continue
+            by_mode = {}
+            for mode in ('table', 'inline'):
+                # Un proceso nuevo por medida para no heredar cachés de la anterior
+                with ProcessPoolExecutor(max_workers=1) as executor:
+                    by_mode[mode] = executor.submit(run_case, name, files, mode).result()
+            inline, table = by_mode['inline'], by_mode['table']
+            inline['speedup'] = round(table['total_s'] / inline['total_s'], 2) if inline['total_s'] else None
+            for result in (table, inline):
+                results.append(result)
+                print(json.dumps(result, ensure_ascii=False), flush=True)
+
+    if args.output:
+        report = {
+            'python': sys.version.split()[0],
+            'platform': sys.platform,
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'results': results,
+        }
+        Path(args.output).write_text(json.dumps(report, indent=2, ensure_ascii=False), encoding='utf-8')
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,133 @@
+"""
+Benchmark de los backends de Markdown
+
+Convierte a HTML los corpus Markdown de bench_pipeline con cada backend
+disponible y compara el tiempo, el rendimiento en MB/s y si el texto
+visible resultante es equivalente al de markdown2.
+
+Uso:
+    python benchmarks/bench_markdown.py
+    python benchmarks/bench_markdown.py --scale 4 --repeat 5 --output resultados.json
+"""
+
+import argparse
+import html
+import json
+import re
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from bench_pipeline import generate_corpus  # noqa: E402
+
+
+_TAG_RE = re.compile(r'<[^>]+>')
+_SPACE_RE = re.compile(r'\s+')
+
+
+def visible_text(html_content: str) -> str:
+    """Texto visible de un HTML, sin etiquetas ni diferencias de espaciado"""
+    return _SPACE_RE.sub('', html.unescape(_TAG_RE.sub('', html_content)))
+
+
+def run_backend(name: str, documents: list[str], repeat: int) -> dict:
+    """
+    Mide un backend sobre un conjunto de documentos
+
+    Args:
+        name: Nombre del backend
+        documents: Contenidos Markdown
+        repeat: Veces que se convierte el conjunto (se toma la mejor)
+
+    Returns:
+        Resultado del backend
+    """
+    from src.converters import MarkdownConverter
+
+    converter = MarkdownConverter(backend=name)
+    size_mb = sum(len(document.encode('utf-8')) for document in documents) / (1024 * 1024)
+
+    # La primera pasada incluye la creación de la instancia y el resaltado en frío
+    started = time.perf_counter()
+    outputs = [converter.backend.convert(document) for document in documents]
+    first = time.perf_counter() - started
+
+    best = first
+    for _ in range(max(0, repeat - 1)):
+        started = time.perf_counter()
+        for document in documents:
+            converter.backend.convert(document)
+        best = min(best, time.perf_counter() - started)
+
+    return {
+        'backend': name,
+        'first_s': round(first, 4),
+        'best_s': round(best, 4),
+        'mb_per_s': round(size_mb / best, 2) if best else None,
+        'outputs': outputs,
+    }
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    """Punto de entrada del benchmark"""
+    from src.converters.markdown_backends import BACKENDS, DEFAULT_BACKEND
+
+    parser = argparse.ArgumentParser(description='Benchmark de los backends de Markdown')
+    parser.add_argument('--scale', type=float, default=1.0, help='Factor de tamaño del corpus')
+    parser.add_argument('--repeat', type=int, default=3, help='Repeticiones por backend')
+    parser.add_argument('--backends', nargs='*', default=sorted(BACKENDS),
+                        help='Backends a medir (por defecto, todos)')
+    parser.add_argument('--output', help='Guardar los resultados en este JSON')
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory(prefix='padlef-bench-') as tmp_dir:
+        corpus = generate_corpus(Path(tmp_dir), args.scale)
+        documents = [
+            Path(path).read_text(encoding='utf-8')
+            for name, files in corpus.items() if name.startswith('markdown')
+            for path in files
+        ]
+
+    results = []
+    for name in args.backends:
+        try:
+            result = run_backend(name, documents, args.repeat)
+        except ValueError as e:
+            print(f"{name}: omitido ({e})", file=sys.stderr)
+            continue
+        outputs = result.pop('outputs')
+        results.append((result, [visible_text(output) for output in outputs]))
+
+    if not results:
+        print("Error: ningún backend disponible", file=sys.stderr)
+        return 1
+
+    # Se compara con markdown2 (o con el primer backend medido)
+    reference_result, reference_texts = next(
+        (item for item in results if item[0]['backend'] == DEFAULT_BACKEND),
+        results[0]
+    )
+    for result, texts in results:
+        result['speedup'] = round(reference_result['best_s'] / result['best_s'], 2) if result['best_s'] else None
+        result['same_text'] = texts == reference_texts
+        print(json.dumps(result, ensure_ascii=False), flush=True)
+
+    if args.output:
+        report = {
+            'python': sys.version.split()[0],
+            'platform': sys.platform,
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'reference': reference_result['backend'],
+            'results': [result for result, _ in results],
+        }
+        Path(args.output).write_text(json.dumps(report, indent=2, ensure_ascii=False), encoding='utf-8')
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
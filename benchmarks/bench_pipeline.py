@@ -0,0 +1,272 @@
+"""
+Benchmark del pipeline de conversión a PDF
+
+Genera corpus sintéticos (Markdown pequeño y enorme, código largo en varios
+lenguajes y texto plano grande) y mide por separado cada etapa: lectura del
+archivo, detección del tipo y del lenguaje, generación de HTML del
+conversor, plantilla y renderizado con WeasyPrint. Cada caso se ejecuta en un proceso nuevo para que el pico de
+memoria (RSS) sea el del propio caso.
+
+Uso:
+    python benchmarks/bench_pipeline.py --output resultados.json
+    python benchmarks/bench_pipeline.py --save-baseline benchmarks/baseline.json
+    python benchmarks/bench_pipeline.py --baseline benchmarks/baseline.json
+"""
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO
+from pathlib import Path
+from typing import Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+
+# Tolerancia por defecto antes de considerar que un caso ha empeorado
+DEFAULT_TOLERANCE = 0.15
+
+_PYTHON_BLOCK = '''
+class Item{n}:
+    """Elemento de ejemplo {n}"""
+
+    def __init__(self, value: int = {n}):
+        self.value = value
+
+    def compute(self, factor: float) -> float:
+        # Cálculo de ejemplo
+        return sum(i * factor for i in range(self.value % 50))
+'''
+
+_JS_BLOCK = '''
+export function handler{n}(request, response) {{
+  const items = request.body.items || [];
+  // Filtrar y transformar
+  const result = items.filter((x) => x.id > {n}).map((x) => ({{ ...x, ok: true }}));
+  return response.json({{ count: result.length, result }});
+}}
+'''
+
+_JAVA_BLOCK = '''
+public class Service{n} {{
+    private final int limit = {n};
+
+    public List<String> run(List<String> input) {{
+        // Procesar la entrada
+        return input.stream().limit(limit).map(String::trim).collect(Collectors.toList());
+    }}
+}}
+'''
+
+_MARKDOWN_SECTION = '''
+## Sección {n}
+
+Texto de ejemplo con **negrita**, *cursiva* y `código en línea` para la sección {n}.
+
+- Elemento uno
+- Elemento dos con [enlace](https://example.com/{n})
+
+| Columna | Valor |
+|---------|-------|
+| a{n}    | {n}   |
+
+```python
+def ejemplo_{n}():
+    return {n}
+```
+'''
+
+
+def generate_corpus(directory: Path, scale: float = 1.0) -> dict[str, list[str]]:
+    """
+    Genera los archivos sintéticos de cada caso
+
+    Args:
+        directory: Directorio donde escribir los archivos
+        scale: Factor de tamaño del corpus
+
+    Returns:
+        Diccionario caso -> lista de archivos
+    """
+    def write(name: str, content: str) -> str:
+        path = directory / name
+        path.write_text(content, encoding='utf-8')
+        return str(path)
+
+    def repeat(block: str, count: int) -> str:
+        return ''.join(block.format(n=i) for i in range(max(1, int(count * scale))))
+
+    return {
+        'markdown_small': [
+            write(f'small_{i}.md', f'# Documento {i}\n' + repeat(_MARKDOWN_SECTION, 3))
+            for i in range(20)
+        ],
+        'markdown_huge': [write('huge.md', '# Manual\n' + repeat(_MARKDOWN_SECTION, 400))],
+        'code_python': [write('long.py', repeat(_PYTHON_BLOCK, 400))],
+        'code_javascript': [write('long.js', repeat(_JS_BLOCK, 500))],
+        'code_java': [write('long.java', repeat(_JAVA_BLOCK, 400))],
+        'text_large': [write('large.txt', repeat('Línea de registro {n}: operación completada sin errores\n', 20000))],
+    }
+
+
+def _peak_rss_mb() -> Optional[float]:
+    """Pico de memoria residente del proceso en MB (None si no disponible)"""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux devuelve KB y macOS bytes
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def run_case(name: str, files: list[str], render: bool) -> dict:
+    """
+    Ejecuta un caso midiendo cada etapa del pipeline
+
+    Args:
+        name: Nombre del caso
+        files: Archivos del caso
+        render: Si medir también el renderizado con WeasyPrint
+
+    Returns:
+        Métricas del caso
+    """
+    from src.instrumentation import STAGES, ConversionStats
+    from src.pdf_generator import PDFGenerator
+    from src.utils import read_file_content
+
+    generator = PDFGenerator()
+    stats = ConversionStats(input_file=name)
+    total_bytes = 0
+    pages = 0
+
+    for input_file in files:
+        path = Path(input_file)
+        total_bytes += path.stat().st_size
+
+        with stats.stage('detect'):
+            kind = generator._get_converter_kind(input_file)
+
+        with stats.stage('read'):
+            content = read_file_content(input_file)
+
+        # El lenguaje del código se resuelve en 'detect', no en 'convert'
+        html_content = generator._convert_to_html(content, input_file, kind, True, stats)
+
+        with stats.stage('template'):
+            full_html = generator._get_html_template(html_content, title=path.name)
+
+        if render:
+            with stats.stage('render'):
+                document = generator._render_html(full_html)
+                document.write_pdf(BytesIO())
+            pages += len(document.pages)
+
+    stages = {stage: stats.stages.get(stage, 0.0) for stage in STAGES}
+    total = sum(stages.values())
+    return {
+        'case': name,
+        'files': len(files),
+        'bytes': total_bytes,
+        'stages': {stage: round(seconds, 4) for stage, seconds in stages.items()},
+        'seconds': round(total, 4),
+        'mb_per_second': round(total_bytes / total / 1e6, 3) if total else None,
+        'pages': pages if render else None,
+        'pages_per_second': round(pages / stages['render'], 2) if render and stages['render'] else None,
+        'peak_rss_mb': _peak_rss_mb(),
+    }
+
+
+def compare(results: list[dict], baseline: dict, tolerance: float) -> list[str]:
+    """
+    Compara los resultados con una línea base
+
+    Args:
+        results: Métricas de la ejecución actual
+        baseline: Línea base cargada del JSON
+        tolerance: Empeoramiento relativo permitido (0.15 = 15%)
+
+    Returns:
+        Descripción de cada regresión encontrada
+    """
+    previous = {case['case']: case for case in baseline.get('results', [])}
+    regressions = []
+
+    for case in results:
+        old = previous.get(case['case'])
+        if old is None:
+            continue
+
+        checks = [('seconds', case['seconds'], old.get('seconds'))]
+        checks += [
+            (f"stages.{stage}", seconds, old.get('stages', {}).get(stage))
+            for stage, seconds in case['stages'].items()
+        ]
+        checks.append(('peak_rss_mb', case['peak_rss_mb'], old.get('peak_rss_mb')))
+
+        for metric, new_value, old_value in checks:
+            # Ignorar valores ausentes o demasiado pequeños para ser fiables
+            if not new_value or not old_value or old_value < 0.01:
+                continue
+            if new_value > old_value * (1 + tolerance):
+                change = (new_value / old_value - 1) * 100
+                regressions.append(
+                    f"{case['case']}: {metric} {old_value} -> {new_value} (+{change:.1f}%)"
+                )
+
+    return regressions
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    """Punto de entrada del benchmark"""
+    parser = argparse.ArgumentParser(description='Benchmark del pipeline de conversión')
+    parser.add_argument('--scale', type=float, default=1.0, help='Factor de tamaño del corpus')
+    parser.add_argument('--cases', nargs='*', help='Ejecutar solo estos casos')
+    parser.add_argument('--no-render', action='store_true', help='No medir WeasyPrint')
+    parser.add_argument('--output', help='Guardar los resultados en este JSON')
+    parser.add_argument('--baseline', help='Comparar con esta línea base JSON')
+    parser.add_argument('--save-baseline', help='Guardar los resultados como línea base')
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE,
+                        help='Empeoramiento relativo permitido (por defecto 0.15)')
+    args = parser.parse_args(argv)
+
+    results = []
+    with tempfile.TemporaryDirectory(prefix='padlef-bench-') as tmp_dir:
+        corpus = generate_corpus(Path(tmp_dir), args.scale)
+        for name, files in corpus.items():
+            if args.cases and name not in args.cases:
+                continue
+            # Un proceso nuevo por caso para medir su propio pico de memoria
+            with ProcessPoolExecutor(max_workers=1) as executor:
+                result = executor.submit(run_case, name, files, not args.no_render).result()
+            results.append(result)
+            print(json.dumps(result, ensure_ascii=False), flush=True)
+
+    report = {
+        'python': sys.version.split()[0],
+        'platform': sys.platform,
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'results': results,
+    }
+    for path in (args.output, args.save_baseline):
+        if path:
+            Path(path).write_text(json.dumps(report, indent=2, ensure_ascii=False), encoding='utf-8')
+
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text(encoding='utf-8'))
+        regressions = compare(results, baseline, args.tolerance)
+        for regression in regressions:
+            print(f"REGRESIÓN: {regression}", file=sys.stderr)
+        if regressions:
+            return 1
+        print("Sin regresiones respecto a la línea base", file=sys.stderr)
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,198 @@
+"""
+Informe del tiempo de importación y del arranque en frío
+
+Importa cada punto de entrada en un proceso nuevo con ``python -X importtime``
+y resume el tiempo acumulado, los módulos más lentos y qué dependencias
+pesadas (WeasyPrint, markdown2, Pygments, pypdf) se cargan al arrancar.
+Con --gui mide además el tiempo hasta que la ventana es visible
+(usa QT_QPA_PLATFORM=offscreen si no hay pantalla).
+
+Uso:
+    python benchmarks/import_time.py
+    python benchmarks/import_time.py --gui --save-baseline import_baseline.json
+    python benchmarks/import_time.py --gui --baseline import_baseline.json
+"""
+
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Optional
+
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Tolerancia por defecto antes de considerar que un arranque ha empeorado
+DEFAULT_TOLERANCE = 0.25
+
+# Módulos que importa cada forma de arrancar la aplicación
+ENTRY_POINTS = {
+    'gui': 'src.gui.main_window',
+    'cli': 'src.cli',
+    'batch': 'src.batch',
+    'pdf_generator': 'src.pdf_generator',
+}
+
+# Dependencias cuya carga debería quedar fuera del arranque
+HEAVY_MODULES = ('weasyprint', 'markdown2', 'pygments', 'pypdf', 'fontTools')
+
+_IMPORTTIME_RE = re.compile(r'^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)')
+
+
+def measure_import(module: str, top: int) -> dict:
+    """
+    Importa un módulo en un proceso nuevo y analiza la salida de -X importtime
+
+    Args:
+        module: Nombre del módulo a importar
+        top: Número de importaciones más lentas a incluir
+
+    Returns:
+        Diccionario con el tiempo total, los módulos pesados cargados y
+        las importaciones más lentas
+    """
+    completed = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=ROOT, capture_output=True, text=True
+    )
+    if completed.returncode != 0:
+        error = completed.stderr.strip().splitlines()
+        return {'module': module, 'error': error[-1] if error else 'error desconocido'}
+
+    imports = []
+    for line in completed.stderr.splitlines():
+        match = _IMPORTTIME_RE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            imports.append((name, len(indent), int(self_us), int(cumulative_us)))
+
+    # La línea del propio módulo trae el tiempo acumulado de toda su importación;
+    # sus dependencias directas son las líneas con un nivel más de sangría
+    entry = next((item for item in imports if item[0] == module), None)
+    child_indent = entry[1] + 2 if entry else 0
+    children = [item for item in imports if item[1] == child_indent]
+    loaded = {name.split('.')[0] for name, _, _, _ in imports}
+
+    return {
+        'module': module,
+        'seconds': round(entry[3] / 1e6, 4) if entry else None,
+        'modules_loaded': len(imports),
+        'heavy_loaded': [name for name in HEAVY_MODULES if name in loaded],
+        'slowest': [
+            {'module': name, 'seconds': round(cumulative / 1e6, 4)}
+            for name, _, _, cumulative in sorted(children, key=lambda item: -item[3])[:top]
+        ],
+    }
+
+
+def measure_gui_startup() -> dict:
+    """
+    Arranca la GUI y mide el tiempo hasta que la ventana es visible
+
+    Returns:
+        Diccionario con el tiempo hasta la ventana y los módulos pesados
+        ya cargados en ese momento
+    """
+    env = dict(os.environ, PADLEF_STARTUP_REPORT='1')
+    env.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    start = time.perf_counter()
+    completed = subprocess.run(
+        [sys.executable, str(ROOT / 'main.py')],
+        cwd=ROOT, env=env, capture_output=True, text=True
+    )
+    wall = time.perf_counter() - start
+
+    for line in reversed(completed.stderr.splitlines()):
+        if line.startswith('{'):
+            report = json.loads(line)
+            report['process_seconds'] = round(wall, 4)
+            return {'module': 'main.py', **report}
+    error = completed.stderr.strip().splitlines()
+    return {'module': 'main.py', 'error': error[-1] if error else 'sin informe de arranque'}
+
+
+def compare(results: list[dict], baseline: dict, tolerance: float) -> list[str]:
+    """
+    Compara los resultados con una línea base
+
+    Args:
+        results: Resultados actuales
+        baseline: Informe guardado con --save-baseline
+        tolerance: Empeoramiento relativo permitido
+
+    Returns:
+        Descripción de cada regresión encontrada
+    """
+    previous = {result['module']: result for result in baseline.get('results', [])}
+    regressions = []
+    for result in results:
+        old = previous.get(result['module'])
+        if old is None or 'error' in result or 'error' in old:
+            continue
+        for metric in ('seconds', 'window_shown_seconds'):
+            if metric in result and old.get(metric):
+                if result[metric] > old[metric] * (1 + tolerance):
+                    regressions.append(
+                        f"{result['module']}: {metric} {old[metric]} -> {result[metric]}"
+                    )
+        new_heavy = set(result.get('heavy_loaded', result.get('loaded_at_startup', [])))
+        old_heavy = set(old.get('heavy_loaded', old.get('loaded_at_startup', [])))
+        for name in sorted(new_heavy - old_heavy):
+            regressions.append(f"{result['module']}: ahora carga {name} al arrancar")
+    return regressions
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    """Punto de entrada del informe"""
+    parser = argparse.ArgumentParser(description='Informe del tiempo de importación')
+    parser.add_argument('--entries', nargs='*', choices=sorted(ENTRY_POINTS),
+                        help='Medir solo estos puntos de entrada')
+    parser.add_argument('--gui', action='store_true',
+                        help='Medir también el tiempo hasta mostrar la ventana')
+    parser.add_argument('--top', type=int, default=10, help='Importaciones más lentas a listar')
+    parser.add_argument('--output', help='Guardar los resultados en este JSON')
+    parser.add_argument('--baseline', help='Comparar con esta línea base JSON')
+    parser.add_argument('--save-baseline', help='Guardar los resultados como línea base')
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE,
+                        help='Empeoramiento relativo permitido (por defecto 0.25)')
+    args = parser.parse_args(argv)
+
+    results = []
+    for name in args.entries or ENTRY_POINTS:
+        result = measure_import(ENTRY_POINTS[name], args.top)
+        results.append(result)
+        print(json.dumps(result, ensure_ascii=False), flush=True)
+
+    if args.gui:
+        result = measure_gui_startup()
+        results.append(result)
+        print(json.dumps(result, ensure_ascii=False), flush=True)
+
+    report = {
+        'python': sys.version.split()[0],
+        'platform': sys.platform,
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'results': results,
+    }
+    for path in (args.output, args.save_baseline):
+        if path:
+            Path(path).write_text(json.dumps(report, indent=2, ensure_ascii=False), encoding='utf-8')
+
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text(encoding='utf-8'))
+        regressions = compare(results, baseline, args.tolerance)
+        for regression in regressions:
+            print(f"REGRESIÓN: {regression}", file=sys.stderr)
+        if regressions:
+            return 1
+        print("Sin regresiones respecto a la línea base", file=sys.stderr)
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -52,6 +52,7 @@ def build_executable():
                 "--hidden-import=weasyprint",
                 "--hidden-import=markdown2",
                 "--hidden-import=pygments",
+                "--hidden-import=pypdf",
                 "--hidden-import=PyQt6",
                 "main.py"
             ]
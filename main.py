@@ -1,7 +1,13 @@
 
 
+import time
+
+# Instante de arranque, para medir el tiempo hasta mostrar la ventana
+_STARTED_AT = time.perf_counter()
+
 import sys
 import os
+import multiprocessing
 from pathlib import Path
 
 
@@ -30,10 +36,16 @@ def main():
         # Configurar GTK3 antes de importar la GUI
         setup_gtk_path()
         
+        # Con argumentos se usa la línea de comandos, que no importa Qt
+        if len(sys.argv) > 1:
+            from src.cli import main as cli_main
+            
+            sys.exit(cli_main(sys.argv[1:]))
+        
         # Importar después de configurar el PATH
         from src.gui.main_window import run_app
         
-        run_app()
+        run_app(started_at=_STARTED_AT)
     except Exception as e:
         print(f"Error al iniciar la aplicación: {e}")
         import traceback
@@ -42,5 +54,7 @@ def main():
 
 
 if __name__ == "__main__":
+    # Necesario para el pool de procesos en el ejecutable empaquetado
+    multiprocessing.freeze_support()
     main()
 
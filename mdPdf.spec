@@ -19,6 +19,7 @@ a = Analysis(
         'weasyprint',
         'markdown2',
         'pygments',
+        'pypdf',
         'PyQt6',
         'PIL',
     ],
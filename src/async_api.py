@@ -0,0 +1,166 @@
+"""
+API asíncrona de conversión para aplicaciones asyncio
+"""
+
+import asyncio
+from typing import TYPE_CHECKING, AsyncIterator, Optional
+
+from .batch import BatchConverter, BatchResult, get_output_path
+
+if TYPE_CHECKING:
+    from .cache import OutputCache
+
+
+class AsyncPDFGenerator:
+    """
+    Convierte archivos a PDF sin bloquear el bucle de eventos
+
+    La lectura, la conversión y el renderizado se ejecutan en el pool de
+    procesos de BatchConverter; el bucle de eventos solo espera resultados.
+    """
+
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        style: str = 'default',
+        cache: Optional['OutputCache'] = None,
+        max_concurrency: Optional[int] = None,
+        generator_options: Optional[dict] = None
+    ):
+        """
+        Inicializa el generador asíncrono
+
+        Args:
+            workers: Número de procesos worker (por defecto, uno por núcleo)
+            style: Estilo de Pygments para resaltado de código
+            cache: Caché de PDFs compartida por los workers (opcional)
+            max_concurrency: Conversiones enviadas al pool a la vez
+                (por defecto, el doble de workers para que no se queden sin trabajo)
+            generator_options: Argumentos adicionales del PDFGenerator de
+                cada worker (renderizador, backend, opciones del PDF...; ver
+                PDFGenerator.get_worker_options)
+        """
+        self.batch = BatchConverter(
+            workers=workers,
+            style=style,
+            cache=cache,
+            generator_options=generator_options
+        )
+        self.max_concurrency = max_concurrency or self.batch.workers * 2
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+    async def _convert(
+        self,
+        input_file: str,
+        output_file: Optional[str],
+        line_numbers: bool
+    ) -> BatchResult:
+        """Envía una conversión al pool respetando el límite de concurrencia"""
+        async with self._semaphore:
+            # Cancelar la espera cancela también la conversión si aún no empezó
+            return await asyncio.wrap_future(
+                self.batch.submit(input_file, output_file, line_numbers)
+            )
+
+    async def convert_to_pdf(
+        self,
+        input_file: str,
+        output_file: Optional[str] = None,
+        line_numbers: bool = True
+    ) -> str:
+        """
+        Convierte un archivo a PDF
+
+        Args:
+            input_file: Ruta del archivo de entrada
+            output_file: Ruta del archivo PDF de salida (opcional)
+            line_numbers: Si mostrar números de línea en código
+
+        Returns:
+            Ruta del archivo PDF generado
+        """
+        result = await self._convert(input_file, output_file, line_numbers)
+        if not result.ok:
+            raise Exception(result.error)
+        return result.output_file
+
+    async def iter_convert(
+        self,
+        input_files: list[str],
+        output_directory: Optional[str] = None,
+        line_numbers: bool = True
+    ) -> AsyncIterator[BatchResult]:
+        """
+        Convierte varios archivos devolviendo los resultados según terminan
+
+        Si se cancela la tarea que la consume o se cierra el iterador
+        (p. ej. con contextlib.aclosing al salir de un bucle con break),
+        se cancelan las conversiones pendientes.
+
+        Args:
+            input_files: Lista de rutas de archivos de entrada
+            output_directory: Directorio de salida (opcional)
+            line_numbers: Si mostrar números de línea en código
+
+        Yields:
+            Resultado de cada archivo en orden de finalización
+        """
+        tasks = {
+            asyncio.ensure_future(self._convert(
+                input_file,
+                get_output_path(input_file, output_directory),
+                line_numbers
+            )): input_file
+            for input_file in input_files
+        }
+
+        try:
+            pending = set(tasks)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    try:
+                        yield task.result()
+                    except Exception as e:
+                        # El proceso worker murió o no pudo devolver el resultado
+                        yield BatchResult(input_file=tasks[task], error=str(e))
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def convert_many(
+        self,
+        input_files: list[str],
+        output_directory: Optional[str] = None,
+        line_numbers: bool = True
+    ) -> list[BatchResult]:
+        """
+        Convierte varios archivos y devuelve todos los resultados
+
+        Args:
+            input_files: Lista de rutas de archivos de entrada
+            output_directory: Directorio de salida (opcional)
+            line_numbers: Si mostrar números de línea en código
+
+        Returns:
+            Lista de resultados en orden de finalización
+        """
+        return [
+            result
+            async for result in self.iter_convert(input_files, output_directory, line_numbers)
+        ]
+
+    async def warm_up(self) -> None:
+        """Arranca los workers y espera a que carguen la pila de conversión"""
+        await asyncio.gather(*(asyncio.wrap_future(f) for f in self.batch.warm_up()))
+
+    async def aclose(self) -> None:
+        """Detiene el pool de procesos sin bloquear el bucle de eventos"""
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self.batch.shutdown, True)
+
+    async def __aenter__(self) -> 'AsyncPDFGenerator':
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback) -> None:
+        await self.aclose()
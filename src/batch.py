@@ -0,0 +1,446 @@
+"""
+Motor de conversión por lotes en paralelo con un pool de procesos
+"""
+
+import os
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Iterator, Optional, Union
+
+from .converters.highlight_cache import DEFAULT_LINE_NUMBER_MODE
+from .converters.markdown_backends import DEFAULT_BACKEND
+from .images import DEFAULT_IMAGE_DPI
+from .monospace_pdf import DEFAULT_TEXT_RENDERER
+
+if TYPE_CHECKING:
+    from multiprocessing.context import BaseContext
+
+    from .cache import OutputCache
+    from .instrumentation import SlowestFilesProfiler
+
+
+# Generador propio de cada proceso worker (se crea una sola vez por proceso)
+_worker_generator = None
+
+# Métricas de la última conversión del proceso worker
+_worker_stats = None
+
+
+def _store_worker_stats(stats) -> None:
+    """Guarda las métricas de la última conversión del worker"""
+    global _worker_stats
+    _worker_stats = stats
+
+
+def _init_worker(
+    style: str,
+    cache_options: Optional[dict],
+    profiler_options: Optional[dict] = None,
+    generator_options: Optional[dict] = None
+) -> None:
+    """
+    Inicializa un proceso worker con su propio PDFGenerator ya cargado
+
+    Args:
+        style: Estilo de Pygments para resaltado de código
+        cache_options: Argumentos para crear la caché de salida (opcional)
+        profiler_options: Argumentos para crear el perfilador (opcional)
+        generator_options: Otras opciones de PDFGenerator (backend de
+            Markdown, numeración de líneas...)
+    """
+    global _worker_generator
+    from .cache import OutputCache
+    from .instrumentation import SlowestFilesProfiler
+    from .pdf_generator import PDFGenerator
+
+    cache = OutputCache(**cache_options) if cache_options is not None else None
+    profiler = SlowestFilesProfiler(**profiler_options) if profiler_options is not None else None
+    _worker_generator = PDFGenerator(
+        style=style,
+        cache=cache,
+        on_stats=_store_worker_stats,
+        profiler=profiler,
+        # Los workers ya reparten el lote; no abren un pool propio por archivo
+        render_workers=1,
+        **(generator_options or {})
+    )
+
+
+def _warm_up_worker() -> int:
+    """Carga WeasyPrint, fuentes y hojas de estilo en el proceso worker"""
+    _worker_generator.warm_up()
+    return os.getpid()
+
+
+def _convert_in_worker(
+    input_file: str,
+    output_file: Optional[str],
+    line_numbers: bool
+) -> 'BatchResult':
+    """
+    Convierte un archivo usando el generador del proceso actual
+
+    Args:
+        input_file: Ruta del archivo de entrada
+        output_file: Ruta del archivo PDF de salida (opcional)
+        line_numbers: Si mostrar números de línea en código
+
+    Returns:
+        Resultado de la conversión (nunca lanza excepciones)
+    """
+    global _worker_stats
+    _worker_stats = None
+    start = time.perf_counter()
+    try:
+        result = _worker_generator.convert_to_pdf(input_file, output_file, line_numbers)
+        return BatchResult(
+            input_file=input_file,
+            output_file=result,
+            elapsed=time.perf_counter() - start,
+            cached=_worker_stats is not None and _worker_stats.cached,
+            stats=_worker_stats.to_dict() if _worker_stats is not None else None
+        )
+    except Exception as e:
+        return BatchResult(
+            input_file=input_file,
+            error=str(e),
+            elapsed=time.perf_counter() - start,
+            stats=_worker_stats.to_dict() if _worker_stats is not None else None
+        )
+
+
+def _render_in_worker(
+    html_content: str,
+    output_file: str,
+    base_url: Optional[str] = None
+) -> tuple[int, Optional[int]]:
+    """
+    Renderiza una parte de un documento grande con el generador del proceso actual
+
+    Args:
+        html_content: HTML completo de la parte
+        output_file: Ruta del PDF parcial
+        base_url: Ruta desde la que se resuelven las imágenes relativas
+
+    Returns:
+        Tupla (páginas de la parte, bytes ahorrados o None si no se miden)
+    """
+    from .instrumentation import ConversionStats
+
+    stats = ConversionStats(input_file=output_file)
+    pages = _worker_generator._generate_pdf_from_html(html_content, output_file, base_url, stats)
+    return pages, stats.saved_bytes
+
+
+def _convert_content_in_worker(
+    content: Union[str, bytes],
+    filename: Optional[str],
+    kind: Optional[str],
+    line_numbers: bool
+) -> bytes:
+    """
+    Convierte contenido en memoria usando el generador del proceso actual
+
+    Returns:
+        Bytes del PDF generado
+    """
+    return _worker_generator.convert_content(
+        content, filename=filename, kind=kind, line_numbers=line_numbers
+    )
+
+
+def get_output_path(input_file: str, output_directory: Optional[str]) -> Optional[str]:
+    """
+    Calcula la ruta del PDF de salida para un archivo de entrada
+
+    Args:
+        input_file: Ruta del archivo de entrada
+        output_directory: Directorio de salida (opcional)
+
+    Returns:
+        Ruta del PDF de salida, o None para usar la ruta por defecto
+    """
+    if not output_directory:
+        return None
+    return str(Path(output_directory) / Path(input_file).with_suffix('.pdf').name)
+
+
+def default_worker_count() -> int:
+    """Número de workers por defecto (uno por núcleo disponible)"""
+    return os.cpu_count() or 1
+
+
+@dataclass
+class BatchResult:
+    """Resultado de la conversión de un archivo dentro de un lote"""
+
+    input_file: str
+    output_file: Optional[str] = None
+    error: Optional[str] = None
+    elapsed: float = 0.0
+    cached: bool = False
+    stats: Optional[dict] = None
+
+    @property
+    def ok(self) -> bool:
+        """Indica si la conversión terminó sin errores"""
+        return self.error is None
+
+
+class BatchConverter:
+    """Convierte lotes de archivos a PDF repartiéndolos entre varios procesos"""
+
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        style: str = 'default',
+        cache: Optional['OutputCache'] = None,
+        profiler: Optional['SlowestFilesProfiler'] = None,
+        markdown_backend: str = DEFAULT_BACKEND,
+        line_number_mode: str = DEFAULT_LINE_NUMBER_MODE,
+        text_renderer: str = DEFAULT_TEXT_RENDERER,
+        image_dpi: Optional[int] = DEFAULT_IMAGE_DPI,
+        optimize_images: bool = False,
+        jpeg_quality: Optional[int] = None,
+        full_fonts: bool = False,
+        compress: bool = True,
+        report_savings: bool = False,
+        generator_options: Optional[dict] = None,
+        mp_context: Optional['BaseContext'] = None
+    ):
+        """
+        Inicializa el motor de conversión por lotes
+
+        Args:
+            workers: Número de procesos worker (por defecto, uno por núcleo)
+            style: Estilo de Pygments para resaltado de código
+            cache: Caché de PDFs compartida por los workers (opcional)
+            profiler: Perfilador de los archivos más lentos del lote (opcional)
+            markdown_backend: Backend de Markdown ('markdown2' o 'markdown-it')
+            line_number_mode: Numeración de líneas del código ('inline' o 'table')
+            text_renderer: Renderizado de texto y código ('html' o 'direct')
+            image_dpi: Resolución a la que se reducen las imágenes (None
+                para no reducirlas)
+            optimize_images, jpeg_quality, full_fonts, compress,
+            report_savings: Opciones de salida del PDF (ver PDFGenerator)
+            generator_options: Opciones de PDFGenerator para los workers que
+                sustituyen a las anteriores (p. ej. las de
+                PDFGenerator.get_worker_options(), para convertir igual que
+                un generador ya configurado)
+            mp_context: Contexto de multiprocessing del pool (por defecto,
+                el de la plataforma; 'spawn' en procesos con hilos, como la GUI)
+        """
+        self.workers = max(1, workers or default_worker_count())
+        self.style = style
+        self.generator_options = {
+            'markdown_backend': markdown_backend,
+            'line_number_mode': line_number_mode,
+            'text_renderer': text_renderer,
+            'image_dpi': image_dpi,
+            'optimize_images': optimize_images,
+            'jpeg_quality': jpeg_quality,
+            'full_fonts': full_fonts,
+            'compress': compress,
+            'report_savings': report_savings,
+        }
+        self.generator_options.update(generator_options or {})
+        self.cache = cache
+        self.profiler = profiler
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self._stats_lock = threading.Lock()
+        self.mp_context = mp_context
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        """Crea el pool de procesos la primera vez que se necesita"""
+        if self._executor is None:
+            cache_options = None
+            if self.cache is not None:
+                cache_options = {
+                    'directory': str(self.cache.directory),
+                    'max_bytes': self.cache.max_bytes,
+                    'use_hardlinks': self.cache.use_hardlinks,
+                }
+            profiler_options = None
+            if self.profiler is not None:
+                profiler_options = {
+                    'directory': str(self.profiler.directory),
+                    'top_n': self.profiler.top_n,
+                }
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=self.mp_context,
+                initializer=_init_worker,
+                initargs=(self.style, cache_options, profiler_options, self.generator_options)
+            )
+        return self._executor
+
+    def warm_up(self) -> list[Future]:
+        """
+        Arranca los procesos worker y precarga en ellos la pila de conversión
+
+        No espera a que terminen: la precarga ocurre en segundo plano y la
+        primera conversión real ya no paga la importación de WeasyPrint.
+
+        Returns:
+            Futuros de la precarga de cada worker
+        """
+        executor = self._get_executor()
+        return [executor.submit(_warm_up_worker) for _ in range(self.workers)]
+
+    def submit(
+        self,
+        input_file: str,
+        output_file: Optional[str] = None,
+        line_numbers: bool = True
+    ) -> 'Future[BatchResult]':
+        """
+        Encola la conversión de un archivo en el pool de procesos
+
+        Args:
+            input_file: Ruta del archivo de entrada
+            output_file: Ruta del archivo PDF de salida (opcional)
+            line_numbers: Si mostrar números de línea en código
+
+        Returns:
+            Futuro con el resultado de la conversión
+        """
+        future = self._get_executor().submit(
+            _convert_in_worker, input_file, output_file, line_numbers
+        )
+        future.add_done_callback(self._count_cache_result)
+        return future
+
+    def submit_content(
+        self,
+        content: Union[str, bytes],
+        filename: Optional[str] = None,
+        kind: Optional[str] = None,
+        line_numbers: bool = True
+    ) -> 'Future[bytes]':
+        """
+        Encola la conversión de contenido en memoria en el pool de procesos
+
+        Args:
+            content: Texto o bytes del documento
+            filename: Nombre de referencia para deducir tipo y lenguaje (opcional)
+            kind: 'markdown', 'code' o 'text' (por defecto, según filename)
+            line_numbers: Si mostrar números de línea en código
+
+        Returns:
+            Futuro con los bytes del PDF
+        """
+        return self._get_executor().submit(
+            _convert_content_in_worker, content, filename, kind, line_numbers
+        )
+
+    def _count_cache_result(self, future: Future) -> None:
+        """Suma el acierto o fallo de caché de una conversión terminada"""
+        if self.cache is None or future.cancelled() or future.exception() is not None:
+            return
+        result = future.result()
+        if result.ok:
+            with self._stats_lock:
+                if result.cached:
+                    self.cache_hits += 1
+                else:
+                    self.cache_misses += 1
+
+    def iter_convert(
+        self,
+        input_files: list[str],
+        output_directory: Optional[str] = None,
+        line_numbers: bool = True
+    ) -> Iterator[BatchResult]:
+        """
+        Convierte archivos en paralelo devolviendo los resultados según terminan
+
+        Args:
+            input_files: Lista de rutas de archivos de entrada
+            output_directory: Directorio de salida (opcional)
+            line_numbers: Si mostrar números de línea en código
+
+        Yields:
+            Resultado de cada archivo en orden de finalización
+        """
+        futures = {
+            self.submit(
+                input_file,
+                get_output_path(input_file, output_directory),
+                line_numbers
+            ): input_file
+            for input_file in input_files
+        }
+
+        try:
+            for future in as_completed(futures):
+                try:
+                    yield future.result()
+                except Exception as e:
+                    # El proceso worker murió o no pudo devolver el resultado
+                    yield BatchResult(input_file=futures[future], error=str(e))
+        finally:
+            # Si el consumidor abandona la iteración, descartar lo pendiente
+            for future in futures:
+                future.cancel()
+
+    def convert(
+        self,
+        input_files: list[str],
+        output_directory: Optional[str] = None,
+        line_numbers: bool = True
+    ) -> list[BatchResult]:
+        """
+        Convierte archivos en paralelo y devuelve todos los resultados
+
+        Args:
+            input_files: Lista de rutas de archivos de entrada
+            output_directory: Directorio de salida (opcional)
+            line_numbers: Si mostrar números de línea en código
+
+        Returns:
+            Lista de resultados en orden de finalización
+        """
+        return list(self.iter_convert(input_files, output_directory, line_numbers))
+
+    def cache_stats(self) -> dict:
+        """
+        Obtiene los contadores de caché acumulados por este lote
+
+        Returns:
+            Diccionario con aciertos y fallos de la caché de salida
+        """
+        with self._stats_lock:
+            hits, misses = self.cache_hits, self.cache_misses
+        total = hits + misses
+        return {
+            'hits': hits,
+            'misses': misses,
+            'hit_rate': hits / total if total else 0.0,
+        }
+
+    def shutdown(self, cancel_pending: bool = False) -> None:
+        """
+        Detiene el pool de procesos
+
+        Si hay perfilador, deja solo los perfiles de los archivos más lentos
+        de todo el lote.
+
+        Args:
+            cancel_pending: Si cancelar las conversiones aún no iniciadas
+        """
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=cancel_pending)
+            self._executor = None
+            if self.profiler is not None:
+                self.profiler.finalize()
+
+    def __enter__(self) -> 'BatchConverter':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.shutdown(cancel_pending=exc_type is not None)
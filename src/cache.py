@@ -0,0 +1,308 @@
+"""
+Caché persistente de PDFs generados, direccionada por contenido
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+
+# Tamaño máximo por defecto de la caché en disco (512 MB)
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+_HASH_BLOCK_SIZE = 1024 * 1024
+
+# ioctl de Linux que clona un archivo compartiendo bloques (Btrfs, XFS...)
+_FICLONE = 0x40049409
+
+
+def get_default_cache_dir() -> Path:
+    """
+    Obtiene el directorio de caché por defecto según la plataforma
+
+    Se puede sobrescribir con la variable de entorno PADLEF_CACHE_DIR.
+
+    Returns:
+        Ruta del directorio de caché
+    """
+    env_dir = os.environ.get('PADLEF_CACHE_DIR')
+    if env_dir:
+        return Path(env_dir)
+
+    if sys.platform == 'win32':
+        base = os.environ.get('LOCALAPPDATA') or Path.home() / 'AppData' / 'Local'
+    else:
+        base = os.environ.get('XDG_CACHE_HOME') or Path.home() / '.cache'
+
+    return Path(base) / 'padlef' / 'pdf'
+
+
+def hash_file(filepath: str) -> str:
+    """
+    Calcula el hash SHA-256 del contenido de un archivo
+
+    Args:
+        filepath: Ruta del archivo
+
+    Returns:
+        Hash en hexadecimal
+    """
+    digest = hashlib.sha256()
+    with open(filepath, 'rb') as f:
+        for block in iter(lambda: f.read(_HASH_BLOCK_SIZE), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _reflink(source: Path, target: Path) -> bool:
+    """
+    Clona un archivo con copia en escritura si el sistema de archivos lo permite
+
+    Returns:
+        True si se ha clonado; si no, target queda vacío
+    """
+    if sys.platform != 'linux':
+        return False
+    import fcntl
+
+    with open(source, 'rb') as src, open(target, 'wb') as dst:
+        try:
+            fcntl.ioctl(dst.fileno(), _FICLONE, src.fileno())
+            return True
+        except OSError:
+            return False
+
+
+class OutputCache:
+    """Guarda PDFs generados indexados por el hash de su entrada y opciones"""
+
+    def __init__(
+        self,
+        directory: Optional[str] = None,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        use_hardlinks: bool = False
+    ):
+        """
+        Inicializa la caché
+
+        Args:
+            directory: Directorio de la caché (opcional)
+            max_bytes: Tamaño máximo total antes de expulsar entradas (LRU)
+            use_hardlinks: Si enlazar los PDFs en lugar de copiarlos. Ahorra
+                espacio, pero editar un PDF de salida modifica la entrada de
+                caché y las salidas conservan la fecha de la entrada. Por
+                defecto se copian (con un clon reflink si es posible)
+        """
+        self.directory = Path(directory) if directory else get_default_cache_dir()
+        self.max_bytes = max_bytes
+        self.use_hardlinks = use_hardlinks
+
+        self.hits = 0
+        self.misses = 0
+
+        self._size: Optional[int] = None
+        self._lock = threading.Lock()
+
+    def make_key(self, input_file: str, **options) -> str:
+        """
+        Calcula la clave de caché de un archivo
+
+        Args:
+            input_file: Ruta del archivo de entrada
+            **options: Opciones que afectan al PDF (tipo de conversor, estilo...)
+
+        Returns:
+            Clave en hexadecimal
+        """
+        digest = hashlib.sha256()
+        digest.update(hash_file(input_file).encode('ascii'))
+        digest.update(json.dumps(options, sort_keys=True).encode('utf-8'))
+        return digest.hexdigest()
+
+    def _entry_path(self, key: str) -> Path:
+        """Ruta de la entrada de caché para una clave"""
+        return self.directory / key[:2] / f"{key}.pdf"
+
+    @staticmethod
+    def _metadata_path(entry: Path) -> Path:
+        """Ruta de los metadatos (número de páginas...) de una entrada"""
+        return entry.with_suffix('.json')
+
+    def fetch(self, key: str, output_file: str) -> Optional[dict]:
+        """
+        Materializa un PDF cacheado en la ruta de salida
+
+        Args:
+            key: Clave de caché
+            output_file: Ruta del archivo PDF de salida
+
+        Returns:
+            Metadatos guardados con la entrada (p. ej. 'pages'; vacío si no
+            los hay), o None si no había entrada
+        """
+        entry = self._entry_path(key)
+        try:
+            # Marcar la entrada como usada recientemente (política LRU) solo
+            # en la fecha de acceso: la de modificación la comparten las
+            # salidas enlazadas y la usa watch para saber si están al día
+            os.utime(entry, ns=(time.time_ns(), entry.stat().st_mtime_ns))
+            self._materialize(entry, Path(output_file))
+        except OSError:
+            with self._lock:
+                self.misses += 1
+            return None
+
+        try:
+            metadata = json.loads(self._metadata_path(entry).read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            metadata = {}
+        with self._lock:
+            self.hits += 1
+        return metadata if isinstance(metadata, dict) else {}
+
+    def _materialize(self, entry: Path, output_path: Path) -> None:
+        """Copia (o enlaza, con use_hardlinks) una entrada de caché en la ruta de salida"""
+        # Nunca escribir sobre una salida que pueda estar enlazada con la caché
+        output_path.unlink(missing_ok=True)
+        if self.use_hardlinks:
+            try:
+                os.link(entry, output_path)
+                return
+            except OSError:
+                # Otro sistema de archivos o sin soporte de enlaces
+                pass
+        if not _reflink(entry, output_path):
+            shutil.copyfile(entry, output_path)
+
+    def detach(self, output_file: str) -> None:
+        """
+        Elimina un PDF de salida enlazado con la caché antes de sobrescribirlo
+
+        Sin esto, escribir sobre la salida modificaría también la entrada
+        de caché compartida a través del enlace.
+
+        Args:
+            output_file: Ruta del archivo PDF de salida
+        """
+        try:
+            if os.stat(output_file).st_nlink > 1:
+                os.unlink(output_file)
+        except FileNotFoundError:
+            pass
+
+    def store(self, key: str, output_file: str, metadata: Optional[dict] = None) -> None:
+        """
+        Guarda un PDF recién generado en la caché
+
+        Args:
+            key: Clave de caché
+            output_file: Ruta del PDF generado
+            metadata: Datos que fetch() devuelve con la entrada (opcional,
+                p. ej. {'pages': 3})
+        """
+        entry = self._entry_path(key)
+        entry.parent.mkdir(parents=True, exist_ok=True)
+
+        if metadata:
+            # Antes que el PDF: una entrada visible siempre tiene sus metadatos
+            fd, tmp_path = tempfile.mkstemp(dir=entry.parent, suffix='.tmp')
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(metadata, f)
+            os.replace(tmp_path, self._metadata_path(entry))
+
+        # Copiar a un temporal y renombrar para que sea atómico entre procesos
+        fd, tmp_path = tempfile.mkstemp(dir=entry.parent, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as dst, open(output_file, 'rb') as src:
+                shutil.copyfileobj(src, dst)
+            # mkstemp crea el archivo como privado; usar los permisos del PDF original
+            shutil.copymode(output_file, tmp_path)
+            os.replace(tmp_path, entry)
+        except Exception:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
+
+        with self._lock:
+            if self._size is not None:
+                self._size += entry.stat().st_size
+        self._evict_if_needed()
+
+    def _scan(self) -> list[tuple[float, int, Path]]:
+        """Lista las entradas como (último uso, tamaño, ruta)"""
+        entries = []
+        if not self.directory.exists():
+            return entries
+        for entry in self.directory.glob('*/*.pdf'):
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_atime, stat.st_size, entry))
+        return entries
+
+    def _evict_if_needed(self) -> None:
+        """Expulsa las entradas usadas hace más tiempo si se supera el límite"""
+        with self._lock:
+            if self._size is None:
+                self._size = sum(size for _, size, _ in self._scan())
+            if self._size <= self.max_bytes:
+                return
+
+            # Reducir hasta el 90% del límite para no expulsar en cada escritura
+            entries = sorted(self._scan())
+            total = sum(size for _, size, _ in entries)
+            target = int(self.max_bytes * 0.9)
+            for _, size, entry in entries:
+                if total <= target:
+                    break
+                try:
+                    entry.unlink()
+                    total -= size
+                except OSError:
+                    continue
+                self._metadata_path(entry).unlink(missing_ok=True)
+            self._size = total
+
+    def record(self, hits: int = 0, misses: int = 0) -> None:
+        """
+        Suma contadores obtenidos en otros procesos
+
+        Args:
+            hits: Aciertos a sumar
+            misses: Fallos a sumar
+        """
+        with self._lock:
+            self.hits += hits
+            self.misses += misses
+
+    def stats(self) -> dict:
+        """
+        Obtiene los contadores de la caché
+
+        Returns:
+            Diccionario con aciertos, fallos y tasa de aciertos
+        """
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / total if total else 0.0,
+            }
+
+    def clear(self) -> None:
+        """Elimina todas las entradas de la caché"""
+        with self._lock:
+            if self.directory.exists():
+                shutil.rmtree(self.directory)
+            self._size = 0
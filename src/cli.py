@@ -0,0 +1,542 @@
+"""
+Interfaz de línea de comandos (sin dependencias de Qt)
+"""
+
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Iterator, Optional
+
+from .batch import BatchConverter, BatchResult, default_worker_count, get_output_path
+from .cache import OutputCache
+from .converters.highlight_cache import DEFAULT_LINE_NUMBER_MODE, LINE_NUMBER_MODES
+from .converters.markdown_backends import BACKENDS, DEFAULT_BACKEND
+from .images import DEFAULT_IMAGE_DPI
+from .instrumentation import SlowestFilesProfiler
+from .monospace_pdf import DEFAULT_TEXT_RENDERER, TEXT_RENDERERS
+from .pdf_generator import DEFAULT_PARALLEL_THRESHOLD, PDFGenerator
+from .watch import DEFAULT_DEBOUNCE, DEFAULT_POLL_INTERVAL, FileWatcher, is_up_to_date, watch
+
+
+# Opciones que en --server decide el propio servidor
+_SERVER_SIDE_OPTIONS = (
+    'style', 'line_number_mode', 'text_renderer', 'image_dpi', 'optimize_images',
+    'jpeg_quality', 'full_fonts', 'uncompressed', 'report_savings', 'markdown_backend',
+    'render_workers', 'parallel_threshold', 'cache', 'cache_dir', 'profile_slowest',
+)
+
+
+def add_pdf_arguments(parser: argparse.ArgumentParser) -> None:
+    """
+    Añade las opciones que afectan al PDF (compartidas con 'padlef serve')
+
+    Args:
+        parser: Parser al que se añaden
+    """
+    parser.add_argument(
+        '--line-number-mode', choices=LINE_NUMBER_MODES, default=DEFAULT_LINE_NUMBER_MODE,
+        help="Numeración de líneas del código: 'inline' (rápida en archivos largos) o 'table'"
+    )
+    parser.add_argument(
+        '--text-renderer', choices=TEXT_RENDERERS, default=DEFAULT_TEXT_RENDERER,
+        help="Renderizado de texto y código: 'html' (WeasyPrint) o 'direct' "
+             "(páginas monoespaciadas sin maquetación, mucho más rápido)"
+    )
+    parser.add_argument(
+        '--image-dpi', type=int, default=DEFAULT_IMAGE_DPI, metavar='PPP',
+        help=f'Reducir las imágenes más anchas que la página a esta resolución '
+             f'(0 = sin reducir, por defecto {DEFAULT_IMAGE_DPI})'
+    )
+    parser.add_argument(
+        '--optimize-images', action='store_true',
+        help='Recomprimir las imágenes y limitarlas a --image-dpi según su tamaño en la página'
+    )
+    parser.add_argument(
+        '--jpeg-quality', type=int, metavar='Q',
+        help='Calidad (0-95) con la que se recomprimen los JPEG'
+    )
+    parser.add_argument(
+        '--full-fonts', action='store_true',
+        help='Embeber las fuentes completas en lugar de solo los glifos usados'
+    )
+    parser.add_argument(
+        '--uncompressed', action='store_true',
+        help='No comprimir los flujos del PDF (para depurar)'
+    )
+    parser.add_argument(
+        '--report-savings', action='store_true',
+        help='Indicar en cada archivo los bytes ahorrados frente a las opciones por defecto'
+    )
+    parser.add_argument(
+        '--markdown-backend', choices=sorted(BACKENDS), default=DEFAULT_BACKEND,
+        help='Motor de Markdown (markdown-it necesita markdown-it-py y mdit-py-plugins)'
+    )
+
+
+def get_generator_options(args: argparse.Namespace) -> dict:
+    """
+    Obtiene los argumentos de PDFGenerator de las opciones de add_pdf_arguments()
+
+    Args:
+        args: Argumentos ya interpretados
+
+    Returns:
+        Diccionario de argumentos de PDFGenerator
+    """
+    return {
+        'markdown_backend': args.markdown_backend,
+        'line_number_mode': args.line_number_mode,
+        'text_renderer': args.text_renderer,
+        'image_dpi': args.image_dpi or None,
+        'optimize_images': args.optimize_images,
+        'jpeg_quality': args.jpeg_quality,
+        'full_fonts': args.full_fonts,
+        'compress': not args.uncompressed,
+        'report_savings': args.report_savings,
+    }
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """
+    Construye el parser de argumentos de la línea de comandos
+
+    Returns:
+        Parser configurado
+    """
+    parser = argparse.ArgumentParser(
+        prog='padlef',
+        description='Convierte archivos Markdown, texto y código fuente a PDF'
+    )
+    parser.add_argument(
+        'inputs', nargs='+',
+        help='Archivos, directorios o patrones glob (p. ej. "docs/**/*.md")'
+    )
+    parser.add_argument(
+        '-j', '--jobs', type=int, default=1,
+        help='Número de procesos en paralelo (0 = uno por núcleo, por defecto 1)'
+    )
+    parser.add_argument(
+        '-o', '--output-dir',
+        help='Directorio de salida (por defecto, junto a cada archivo)'
+    )
+    parser.add_argument(
+        '--line-numbers', action=argparse.BooleanOptionalAction, default=True,
+        help='Mostrar números de línea en código (por defecto activado)'
+    )
+    parser.add_argument(
+        '--style', default='default',
+        help='Estilo de Pygments para el resaltado de código'
+    )
+    add_pdf_arguments(parser)
+    parser.add_argument(
+        '--render-workers', type=int, default=1, metavar='N',
+        help='Procesos que renderizan en paralelo las partes de un documento grande '
+             'en el modo secuencial (0 = uno por núcleo, por defecto 1: sin partir)'
+    )
+    parser.add_argument(
+        '--parallel-threshold', type=int, default=DEFAULT_PARALLEL_THRESHOLD, metavar='BYTES',
+        help=f'Tamaño a partir del cual un documento se parte con --render-workers '
+             f'(por defecto {DEFAULT_PARALLEL_THRESHOLD})'
+    )
+    parser.add_argument(
+        '--bundle', metavar='PDF',
+        help='Combinar todos los archivos en un único PDF con índice'
+    )
+    parser.add_argument(
+        '--no-toc', action='store_true',
+        help='No generar el índice en el PDF combinado (--bundle)'
+    )
+    parser.add_argument(
+        '--cache', action='store_true',
+        help='Reutilizar PDFs de archivos sin cambios desde la caché en disco'
+    )
+    parser.add_argument(
+        '--cache-dir',
+        help='Directorio de la caché (implica --cache)'
+    )
+    parser.add_argument(
+        '--server', metavar='DIRECCIÓN',
+        help='Enviar los archivos a un servidor "padlef serve" (host:puerto o unix:/ruta)'
+    )
+    parser.add_argument(
+        '--watch', action='store_true',
+        help='Seguir vigilando las entradas y reconvertir los archivos que cambien'
+    )
+    parser.add_argument(
+        '--watch-interval', type=float, default=DEFAULT_POLL_INTERVAL, metavar='SEG',
+        help=f'Segundos entre sondeos en --watch (por defecto {DEFAULT_POLL_INTERVAL})'
+    )
+    parser.add_argument(
+        '--debounce', type=float, default=DEFAULT_DEBOUNCE, metavar='SEG',
+        help=f'Segundos sin cambios antes de reconvertir (por defecto {DEFAULT_DEBOUNCE})'
+    )
+    parser.add_argument(
+        '--profile-slowest', type=int, metavar='N', default=0,
+        help='Guardar perfiles de cProfile de los N archivos más lentos'
+    )
+    parser.add_argument(
+        '--profile-dir', default='padlef-profiles',
+        help='Directorio de los perfiles (por defecto padlef-profiles)'
+    )
+    return parser
+
+
+def expand_inputs(inputs: list[str], extensions: list[str]) -> list[str]:
+    """
+    Expande archivos, directorios y patrones glob a una lista de archivos
+
+    Los directorios se recorren recursivamente y solo se incluyen los archivos
+    con extensiones soportadas. Los archivos indicados explícitamente se
+    incluyen siempre.
+
+    Args:
+        inputs: Rutas o patrones indicados por el usuario
+        extensions: Extensiones soportadas (con punto)
+
+    Returns:
+        Lista de archivos sin duplicados, en el orden encontrado
+    """
+    supported = {ext.lower() for ext in extensions}
+    files: list[str] = []
+    seen: set[str] = set()
+
+    def add(path: str) -> None:
+        key = os.path.abspath(path)
+        if key not in seen:
+            seen.add(key)
+            files.append(path)
+
+    for item in inputs:
+        if glob.has_magic(item):
+            matches = sorted(glob.glob(item, recursive=True))
+        else:
+            matches = [item]
+
+        for match in matches:
+            path = Path(match)
+            if path.is_dir():
+                for root, _, names in os.walk(path):
+                    for name in sorted(names):
+                        if Path(name).suffix.lower() in supported:
+                            add(os.path.join(root, name))
+            elif path.is_file():
+                add(match)
+            else:
+                print(f"Advertencia: no se encuentra {match}", file=sys.stderr)
+
+    return files
+
+
+def _iter_sequential(
+    generator: PDFGenerator,
+    input_files: list[str],
+    output_directory: Optional[str],
+    line_numbers: bool
+) -> Iterator[BatchResult]:
+    """Convierte los archivos uno a uno en este proceso"""
+    collected = []
+    generator.on_stats = collected.append
+
+    for input_file in input_files:
+        collected.clear()
+        start = time.perf_counter()
+        try:
+            output_file = generator.convert_to_pdf(
+                input_file,
+                get_output_path(input_file, output_directory),
+                line_numbers
+            )
+            result = BatchResult(
+                input_file=input_file,
+                output_file=output_file,
+                elapsed=time.perf_counter() - start
+            )
+        except Exception as e:
+            result = BatchResult(
+                input_file=input_file,
+                error=str(e),
+                elapsed=time.perf_counter() - start
+            )
+        if collected:
+            result.stats = collected[-1].to_dict()
+            result.cached = collected[-1].cached
+        yield result
+
+
+def _run_bundle(generator: PDFGenerator, input_files: list[str], args) -> int:
+    """Genera un único PDF combinado y emite un registro por archivo fallido y el resumen"""
+    failed = []
+
+    def on_error(input_file: str, error: Exception) -> None:
+        failed.append(input_file)
+        _emit({'input': input_file, 'output': args.bundle, 'status': 'error', 'error': str(error)})
+
+    start = time.perf_counter()
+    try:
+        output_file = generator.convert_to_bundle(
+            input_files,
+            args.bundle,
+            line_numbers=args.line_numbers,
+            table_of_contents=not args.no_toc,
+            on_error=on_error
+        )
+    except Exception as e:
+        _emit({'output': args.bundle, 'status': 'error', 'error': str(e)})
+        output_file = None
+
+    elapsed = time.perf_counter() - start
+    _emit({'summary': {
+        'files': len(input_files),
+        'converted': len(input_files) - len(failed) if output_file else 0,
+        'failed': len(failed) if output_file else len(input_files),
+        'output': output_file,
+        'seconds': round(elapsed, 4),
+    }})
+    return 1 if failed or output_file is None else 0
+
+
+def _run_on_server(input_files: list[str], args) -> int:
+    """Envía el lote a un servidor de conversión y reenvía sus registros"""
+    from .server import ServerClient
+
+    # Estas opciones se fijan al arrancar el servidor: no se ignoran en silencio
+    parser = build_parser()
+    fixed = [
+        f"--{dest.replace('_', '-')}"
+        for dest in _SERVER_SIDE_OPTIONS
+        if getattr(args, dest) != parser.get_default(dest)
+    ]
+    if fixed:
+        print(
+            f"Error: estas opciones se indican al arrancar el servidor "
+            f"(padlef serve), no con --server: {', '.join(fixed)}",
+            file=sys.stderr
+        )
+        return 2
+
+    start = time.perf_counter()
+    converted = failed = 0
+    try:
+        for record in ServerClient(args.server).iter_convert(
+            input_files, args.output_dir, args.line_numbers
+        ):
+            if record['status'] == 'ok':
+                converted += 1
+            else:
+                failed += 1
+            _emit(record)
+    except Exception as e:
+        print(f"Error: no se pudo usar el servidor {args.server}: {e}", file=sys.stderr)
+        return 1
+
+    elapsed = time.perf_counter() - start
+    _emit({'summary': {
+        'files': len(input_files),
+        'converted': converted,
+        'failed': failed,
+        'server': args.server,
+        'seconds': round(elapsed, 4),
+        'files_per_second': round(len(input_files) / elapsed, 2) if elapsed else None,
+    }})
+    return 1 if failed else 0
+
+
+def _emit_results(results: Iterator[BatchResult], cache: Optional[OutputCache]) -> tuple[int, int]:
+    """
+    Emite el registro JSON de cada resultado
+
+    Returns:
+        Tupla (archivos convertidos, archivos con error)
+    """
+    converted = failed = 0
+    for result in results:
+        record = {
+            'input': result.input_file,
+            'output': result.output_file,
+            'status': 'ok' if result.ok else 'error',
+            'seconds': round(result.elapsed, 4),
+        }
+        if cache is not None:
+            record['cached'] = result.cached
+        if result.stats is not None:
+            record['stages'] = result.stats['stages']
+            record['input_bytes'] = result.stats['input_bytes']
+            record['output_bytes'] = result.stats['output_bytes']
+            record['pages'] = result.stats['pages']
+            if result.stats.get('saved_bytes') is not None:
+                record['saved_bytes'] = result.stats['saved_bytes']
+        if result.ok:
+            converted += 1
+        else:
+            failed += 1
+            record['error'] = result.error
+        _emit(record)
+    return converted, failed
+
+
+def _run_watch(
+    generator: PDFGenerator,
+    batch: Optional[BatchConverter],
+    args
+) -> tuple[int, int]:
+    """
+    Vigila las entradas y reconvierte los archivos que cambien hasta Ctrl+C
+
+    Reutiliza el generador o el pool ya cargados, de modo que cada
+    reconversión solo paga el trabajo del propio archivo.
+
+    Returns:
+        Tupla (archivos reconvertidos, archivos con error)
+    """
+    # Los directorios se vigilan enteros (para ver archivos nuevos);
+    # los archivos y patrones glob, tal como se expandieron
+    extensions = generator.get_supported_extensions()
+    roots = [item for item in args.inputs if not glob.has_magic(item) and os.path.isdir(item)]
+    others = [item for item in args.inputs if item not in roots]
+    if others:
+        roots += expand_inputs(others, extensions)
+    watcher = FileWatcher(roots, extensions, debounce=args.debounce)
+    totals = [0, 0]
+
+    def rebuild(changed: list[str]) -> None:
+        if batch is not None and len(changed) > 1:
+            results = batch.iter_convert(changed, args.output_dir, args.line_numbers)
+        else:
+            results = _iter_sequential(generator, changed, args.output_dir, args.line_numbers)
+        converted, failed = _emit_results(results, generator.cache)
+        totals[0] += converted
+        totals[1] += failed
+
+    def removed(files: list[str]) -> None:
+        for input_file in files:
+            _emit({'input': input_file, 'status': 'removed'})
+
+    _emit({'watching': watcher.roots, 'files': len(watcher.snapshot())})
+    try:
+        watch(watcher, rebuild, removed, interval=args.watch_interval)
+    except KeyboardInterrupt:
+        pass
+    return totals[0], totals[1]
+
+
+def _emit(record: dict) -> None:
+    """Escribe un registro JSON por línea en la salida estándar"""
+    print(json.dumps(record, ensure_ascii=False), flush=True)
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    """
+    Punto de entrada de la línea de comandos
+
+    Escribe en la salida estándar una línea JSON por archivo y una línea
+    final con el resumen del lote. "padlef serve ..." arranca el servidor
+    de conversión persistente (ver src/server.py).
+
+    Args:
+        argv: Argumentos (por defecto, los de sys.argv)
+
+    Returns:
+        Código de salida: 0 si todo fue bien, 1 si hubo errores,
+        2 si no se encontraron archivos
+    """
+    if argv is None:
+        argv = sys.argv[1:]
+    if argv and argv[0] == 'serve':
+        from .server import main as serve_main
+
+        return serve_main(argv[1:])
+
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.watch and (args.server or args.bundle):
+        parser.error('--watch no se puede combinar con --server ni con --bundle')
+
+    cache = None
+    if args.cache or args.cache_dir:
+        cache = OutputCache(directory=args.cache_dir)
+
+    profiler = None
+    if args.profile_slowest > 0:
+        profiler = SlowestFilesProfiler(args.profile_dir, args.profile_slowest)
+
+    try:
+        generator = PDFGenerator(
+            style=args.style,
+            cache=cache,
+            profiler=profiler,
+            render_workers=args.render_workers,
+            parallel_threshold=args.parallel_threshold,
+            **get_generator_options(args)
+        )
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 2
+    input_files = expand_inputs(args.inputs, generator.get_supported_extensions())
+    if not input_files:
+        print("Error: no se encontraron archivos para convertir", file=sys.stderr)
+        return 2
+
+    if args.bundle:
+        return _run_bundle(generator, input_files, args)
+
+    if args.server:
+        return _run_on_server(input_files, args)
+
+    jobs = args.jobs if args.jobs > 0 else default_worker_count()
+    jobs = min(jobs, len(input_files))
+
+    start = time.perf_counter()
+    batch = None
+
+    if args.watch:
+        # Al vigilar, la primera pasada solo convierte lo que esté desactualizado
+        input_files = [f for f in input_files if not is_up_to_date(f, args.output_dir)]
+
+    if jobs > 1:
+        batch = BatchConverter(
+            workers=jobs,
+            style=args.style,
+            cache=cache,
+            profiler=profiler,
+            # Mismas opciones que el generador del modo secuencial
+            generator_options=generator.get_worker_options()
+        )
+        results = batch.iter_convert(input_files, args.output_dir, args.line_numbers)
+    else:
+        results = _iter_sequential(generator, input_files, args.output_dir, args.line_numbers)
+
+    try:
+        converted, failed = _emit_results(results, cache)
+        if args.watch:
+            rebuilt, rebuild_failed = _run_watch(generator, batch, args)
+            converted += rebuilt
+            failed += rebuild_failed
+    finally:
+        if batch is not None:
+            batch.shutdown(cancel_pending=True)
+        generator.close()
+
+    elapsed = time.perf_counter() - start
+    summary = {
+        'files': len(input_files),
+        'converted': converted,
+        'failed': failed,
+        'jobs': jobs,
+        'seconds': round(elapsed, 4),
+        'files_per_second': round(len(input_files) / elapsed, 2) if elapsed else None,
+    }
+    if cache is not None:
+        summary['cache'] = batch.cache_stats() if batch is not None else cache.stats()
+    if profiler is not None:
+        summary['profiles'] = profiler.finalize()
+    _emit({'summary': summary})
+
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,10 +1,41 @@
 """
 Módulo de conversores para diferentes tipos de archivos
+
+Los conversores se importan la primera vez que se usan, para que cargar el
+paquete (y el registro de tipos) no importe markdown2 ni Pygments.
 """
 
-from .markdown_converter import MarkdownConverter
-from .code_converter import CodeConverter
-from .text_converter import TextConverter
+from .registry import (
+    ConverterSpec,
+    file_dialog_filter,
+    get_converter_kind,
+    get_language,
+    get_registered_kind,
+    get_spec,
+    register_converter,
+    supported_extensions,
+)
+
+# Clase exportada -> módulo que la define
+_LAZY_EXPORTS = {
+    'MarkdownConverter': '.markdown_converter',
+    'CodeConverter': '.code_converter',
+    'TextConverter': '.text_converter',
+}
+
+__all__ = [
+    'MarkdownConverter', 'CodeConverter', 'TextConverter',
+    'ConverterSpec', 'register_converter', 'get_converter_kind', 'get_registered_kind',
+    'get_language', 'get_spec', 'supported_extensions', 'file_dialog_filter',
+]
+
 
-__all__ = ['MarkdownConverter', 'CodeConverter', 'TextConverter']
+def __getattr__(name: str):
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    from importlib import import_module
 
+    value = getattr(import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
@@ -0,0 +1,63 @@
+"""
+Subclase de markdown2 que resalta el código con la caché compartida
+"""
+
+import re
+import unicodedata
+
+import markdown2
+from pygments.util import ClassNotFound
+
+from .highlight_cache import HighlightCache
+
+
+_SLUGIFY_STRIP_RE = re.compile(r'[^\w\s-]')
+_SLUGIFY_HYPHENATE_RE = re.compile(r'[-\s]+')
+
+
+def slugify(value: str) -> str:
+    """
+    Genera el ID de un encabezado igual que el extra header-ids de markdown2
+
+    Copia de markdown2._slugify (privada), para que otros backends den los
+    mismos IDs sin depender de ella.
+
+    Args:
+        value: Texto del encabezado
+
+    Returns:
+        ID en minúsculas, sin signos y con guiones en lugar de espacios
+    """
+    value = unicodedata.normalize('NFKD', value).encode('utf-8', 'ignore').decode()
+    value = _SLUGIFY_STRIP_RE.sub('', value).strip().lower()
+    return _SLUGIFY_HYPHENATE_RE.sub('-', value)
+
+
+class CachedMarkdown(markdown2.Markdown):
+    """
+    Markdown que resuelve lexers y resalta bloques de código con una caché compartida
+
+    Sobrescribe _get_pygments_lexer y _color_with_pygments, que no son API
+    pública de markdown2: por eso su versión está acotada en requirements.txt.
+    """
+
+    def __init__(self, highlight_cache: HighlightCache, **kwargs):
+        super().__init__(**kwargs)
+        self.highlight_cache = highlight_cache
+
+    def _get_pygments_lexer(self, lexer_name: str):
+        """Obtiene el lexer de un bloque ```lenguaje desde la caché (None si no existe)"""
+        try:
+            return self.highlight_cache.get_lexer(lexer_name)
+        except ClassNotFound:
+            return None
+
+    def _color_with_pygments(self, codeblock: str, lexer, **formatter_opts) -> str:
+        """Resalta un bloque reutilizando el HTML si ya se resaltó el mismo código"""
+        language = lexer.aliases[0] if lexer.aliases else lexer.name
+        return self.highlight_cache.get_highlighted(
+            language,
+            codeblock,
+            lambda: super(CachedMarkdown, self)._color_with_pygments(codeblock, lexer, **formatter_opts),
+            **formatter_opts
+        )
@@ -2,24 +2,155 @@
 Conversor de archivos de código fuente a HTML con resaltado de sintaxis
 """
 
-from pygments import highlight
-from pygments.lexers import get_lexer_by_name, guess_lexer
+import itertools
+from pygments import format as format_tokens, highlight
 from pygments.formatters import HtmlFormatter
-from typing import Optional
+from functools import lru_cache
+from typing import Iterable, Iterator, Optional
 from pathlib import Path
 
+from .highlight_cache import DEFAULT_LINE_NUMBER_MODE, LINE_NUMBER_MODES, HighlightCache
+from .language_detection import LanguageDetector
+
+
+@lru_cache(maxsize=None)
+def _get_style_defs(style: str) -> str:
+    """Genera (una sola vez por estilo) el CSS de Pygments"""
+    formatter = HtmlFormatter(style=style)
+    return formatter.get_style_defs('.highlight')
+
+
+def _split_tokens(tokens: Iterable[tuple], block_lines: int) -> Iterator[list[tuple]]:
+    """
+    Agrupa un flujo de tokens de Pygments en bloques de líneas completas
+
+    Los tokens que contienen saltos de línea se parten para que cada
+    bloque termine exactamente en un salto de línea.
+
+    Args:
+        tokens: Tokens (tipo, valor) del lexer
+        block_lines: Líneas por bloque
+
+    Yields:
+        Lista de tokens de cada bloque
+    """
+    block = []
+    lines = 0
+    for token_type, value in tokens:
+        start = 0
+        while True:
+            end = value.find('\n', start)
+            if end < 0:
+                if start < len(value):
+                    block.append((token_type, value[start:]))
+                break
+            block.append((token_type, value[start:end + 1]))
+            start = end + 1
+            lines += 1
+            if lines >= block_lines:
+                yield block
+                block = []
+                lines = 0
+    if block:
+        yield block
+
+
+class _DetectedLanguage(str):
+    """Lenguaje ya resuelto por detect_language(): _get_lexer no lo vuelve a detectar"""
+
 
 class CodeConverter:
     """Convierte archivos de código a HTML con resaltado de sintaxis"""
     
-    def __init__(self, style: str = 'default'):
+    def __init__(self, style: str = 'default', line_number_mode: str = DEFAULT_LINE_NUMBER_MODE):
         """
         Inicializa el conversor
         
         Args:
             style: Estilo de Pygments a usar (default, monokai, github, etc.)
+            line_number_mode: Numeración de líneas: 'inline' (un número al
+                inicio de cada línea, rápido de paginar) o 'table' (tabla de
+                dos columnas de Pygments)
         """
+        if line_number_mode not in LINE_NUMBER_MODES:
+            raise ValueError(f"Modo de numeración de líneas no soportado: {line_number_mode}")
         self.style = style
+        self.line_number_mode = line_number_mode
+        self.highlight_cache = HighlightCache(style=style)
+        self.language_detector = LanguageDetector()
+    
+    def _get_lexer(
+        self,
+        language: str,
+        code_content: str,
+        filename: Optional[str] = None,
+        **options
+    ):
+        """
+        Obtiene el lexer apropiado para el código
+        
+        Args:
+            language: Lenguaje de programación
+            code_content: Contenido del código (para detectar el lenguaje)
+            filename: Nombre del archivo (para detectar el lenguaje)
+            **options: Opciones adicionales del lexer
+            
+        Returns:
+            Lexer de Pygments (texto plano si no se reconoce el lenguaje)
+        """
+        try:
+            if not isinstance(language, _DetectedLanguage) and (not language or language == 'text'):
+                # Detectar el lenguaje con señales baratas antes de adivinar
+                language = self.language_detector.detect(code_content, filename)
+            return self.highlight_cache.get_lexer(language, **options)
+        except Exception:
+            # Si falla, usar texto plano
+            from pygments.lexers import TextLexer
+            return TextLexer(**options)
+    
+    def detect_language(
+        self,
+        code_content: str,
+        language: str = 'text',
+        filename: Optional[str] = None
+    ) -> str:
+        """
+        Resuelve el lenguaje igual que convert(), pero por separado
+
+        Permite medir la detección como una etapa propia: el resultado se
+        puede pasar a convert() y al resto de métodos sin que se vuelva a
+        detectar, aunque sea 'text'.
+
+        Args:
+            code_content: Contenido del código (o su primer bloque)
+            language: Lenguaje conocido ('text' si hay que detectarlo)
+            filename: Nombre del archivo (para detectar el lenguaje)
+
+        Returns:
+            Alias de Pygments
+        """
+        if language and language != 'text':
+            return language
+        return _DetectedLanguage(self.language_detector.detect(code_content, filename))
+    
+    def _get_header(self, filename: str, lexer, language: str) -> str:
+        """Genera el encabezado HTML con información del archivo"""
+        language_name = lexer.name if hasattr(lexer, 'name') else language
+        html_content = f'<div class="document-header">'
+        html_content += f'<div class="document-title">{filename}</div>'
+        html_content += f'<div class="document-info">Archivo de código - {language_name}</div>'
+        html_content += f'</div>'
+        return html_content
+    
+    def _get_block_formatter(self, line_numbers: bool, line_start: int) -> HtmlFormatter:
+        """Crea un formateador cuya numeración empieza en una línea dada"""
+        return HtmlFormatter(
+            style=self.style,
+            linenos=self.line_number_mode if line_numbers else False,
+            linenostart=line_start,
+            cssclass='highlight',
+            full=False
+        )
     
     def convert(
         self, 
@@ -40,25 +171,11 @@ class CodeConverter:
         Returns:
             Contenido HTML con código resaltado
         """
-        try:
-            # Obtener el lexer apropiado
-            if language and language != 'text':
-                lexer = get_lexer_by_name(language, stripall=True)
-            else:
-                # Intentar adivinar el lenguaje
-                lexer = guess_lexer(code_content)
-        except Exception:
-            # Si falla, usar texto plano
-            from pygments.lexers import TextLexer
-            lexer = TextLexer()
+        # Obtener el lexer apropiado
+        lexer = self._get_lexer(language, code_content, filename, stripall=True)
         
-        # Configurar el formateador HTML
-        formatter = HtmlFormatter(
-            style=self.style,
-            linenos='table' if line_numbers else False,
-            cssclass='highlight',
-            full=False
-        )
+        # Obtener el formateador HTML (reutilizado entre archivos)
+        formatter = self.highlight_cache.get_formatter(line_numbers, self.line_number_mode)
         
         # Generar HTML con resaltado
         highlighted_code = highlight(code_content, lexer, formatter)
@@ -66,16 +183,150 @@ class CodeConverter:
         # Agregar encabezado con información del archivo
         html_content = ''
         if filename:
-            language_name = lexer.name if hasattr(lexer, 'name') else language
-            html_content += f'<div class="document-header">'
-            html_content += f'<div class="document-title">{filename}</div>'
-            html_content += f'<div class="document-info">Archivo de código - {language_name}</div>'
-            html_content += f'</div>'
+            html_content += self._get_header(filename, lexer, language)
         
         html_content += f'<div class="code-content">{highlighted_code}</div>'
         
         return html_content
     
+    def tokenize(
+        self,
+        code_content: str,
+        language: str = 'text',
+        filename: Optional[str] = None
+    ) -> tuple:
+        """
+        Analiza el código con el mismo lexer que convert(), sin generar HTML
+        
+        Args:
+            code_content: Contenido del código
+            language: Lenguaje de programación
+            filename: Nombre del archivo (para detectar el lenguaje)
+            
+        Returns:
+            Tupla (lexer, iterador de tokens (tipo, texto))
+        """
+        lexer = self._get_lexer(language, code_content, filename, stripall=True)
+        return lexer, lexer.get_tokens(code_content)
+
+    def tokenize_chunks(
+        self,
+        chunks: Iterable[str],
+        language: str = 'text',
+        filename: Optional[str] = None
+    ) -> tuple:
+        """
+        Analiza el código por bloques, sin tenerlo entero en memoria
+
+        Igual que en convert_chunks(), el lexer se resuelve con el primer
+        bloque, no se recortan líneas en blanco y su estado no se conserva
+        entre bloques.
+
+        Args:
+            chunks: Bloques de líneas completas del archivo
+            language: Lenguaje de programación
+            filename: Nombre del archivo (para detectar el lenguaje)
+
+        Returns:
+            Tupla (lexer, iterador de tokens (tipo, texto))
+        """
+        chunks = iter(chunks)
+        first = next(chunks, '')
+        lexer = self._get_lexer(language, first, filename, stripnl=False)
+
+        def tokens() -> Iterator[tuple]:
+            for chunk in itertools.chain((first,), chunks):
+                if chunk:
+                    yield from lexer.get_tokens(chunk)
+
+        return lexer, tokens()
+
+    def convert_chunks(
+        self,
+        chunks: Iterable[str],
+        language: str = 'text',
+        filename: Optional[str] = None,
+        line_numbers: bool = True
+    ) -> Iterator[str]:
+        """
+        Convierte código fuente por bloques, sin tenerlo entero en memoria
+        
+        El lexer se resuelve una sola vez con el primer bloque y la
+        numeración de líneas continúa de un bloque al siguiente. El estado
+        del lexer no se conserva entre bloques, así que una construcción que
+        cruce un límite (p. ej. una cadena multilínea) puede resaltarse de
+        forma distinta que en el modo normal.
+        
+        Args:
+            chunks: Bloques de líneas completas del archivo
+            language: Lenguaje de programación
+            filename: Nombre del archivo (opcional, solo en el primer bloque)
+            line_numbers: Si mostrar números de línea
+            
+        Yields:
+            Fragmento HTML de cada bloque
+        """
+        lexer = None
+        line_start = 1
+        
+        for chunk in chunks:
+            html_content = ''
+            if lexer is None:
+                # Sin recortar espacios para no desplazar la numeración
+                lexer = self._get_lexer(language, chunk, filename, stripnl=False)
+                if filename:
+                    html_content += self._get_header(filename, lexer, language)
+            
+            formatter = self._get_block_formatter(line_numbers, line_start)
+            highlighted_code = highlight(chunk, lexer, formatter)
+            html_content += f'<div class="code-content">{highlighted_code}</div>'
+            line_start += chunk.count('\n')
+            
+            yield html_content
+    
+    def convert_blocks(
+        self,
+        code_content: str,
+        language: str = 'text',
+        filename: Optional[str] = None,
+        line_numbers: bool = True,
+        block_lines: int = 2000
+    ) -> list[str]:
+        """
+        Convierte código fuente en varios fragmentos HTML de líneas consecutivas
+        
+        El código se analiza una sola vez con el lexer y el flujo de tokens
+        se parte por líneas, así que el resaltado es el mismo que con
+        convert() y la numeración continúa de un fragmento al siguiente.
+        
+        Args:
+            code_content: Contenido del código
+            language: Lenguaje de programación
+            filename: Nombre del archivo (opcional, solo en el primer fragmento)
+            line_numbers: Si mostrar números de línea
+            block_lines: Líneas por fragmento
+            
+        Returns:
+            Lista de fragmentos HTML en orden
+        """
+        lexer = self._get_lexer(language, code_content, filename, stripall=True)
+        
+        blocks = []
+        line_start = 1
+        for tokens in _split_tokens(lexer.get_tokens(code_content), block_lines):
+            html_content = ''
+            if filename and not blocks:
+                html_content += self._get_header(filename, lexer, language)
+            
+            formatter = self._get_block_formatter(line_numbers, line_start)
+            highlighted_code = format_tokens(tokens, formatter)
+            html_content += f'<div class="code-content">{highlighted_code}</div>'
+            line_start += sum(value.count('\n') for _, value in tokens)
+            
+            blocks.append(html_content)
+        
+        return blocks
+    
     def convert_file(self, filepath: str, line_numbers: bool = True) -> str:
         """
         Convierte un archivo de código a HTML
@@ -98,6 +349,15 @@ class CodeConverter:
         
         return self.convert(content, language, filename, line_numbers)
     
+    def cache_info(self) -> dict:
+        """
+        Obtiene las estadísticas de la caché de lexers y formateadores
+        
+        Returns:
+            Diccionario con aciertos, fallos y tasa de aciertos
+        """
+        return self.highlight_cache.stats()
+    
     def get_css(self) -> str:
         """
         Obtiene el CSS necesario para el resaltado de sintaxis
@@ -105,6 +365,5 @@ class CodeConverter:
         Returns:
             CSS de Pygments
         """
-        formatter = HtmlFormatter(style=self.style)
-        return formatter.get_style_defs('.highlight')
+        return _get_style_defs(self.style)
 
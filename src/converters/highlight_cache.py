@@ -0,0 +1,194 @@
+"""
+Caché de lexers y formateadores de Pygments reutilizables entre archivos
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Callable
+
+if TYPE_CHECKING:
+    from pygments.formatters import HtmlFormatter
+
+
+# Marca para lenguajes que Pygments no conoce (evita repetir la búsqueda)
+_NOT_FOUND = object()
+
+# Bloques de código resaltados que se conservan como máximo (LRU)
+DEFAULT_MAX_BLOCKS = 2048
+
+# Modos de numeración de líneas de Pygments: 'inline' pone el número al
+# inicio de cada línea y WeasyPrint la pagina línea a línea; 'table' crea
+# una tabla de dos columnas con una única fila para todo el archivo
+LINE_NUMBER_MODES = ('inline', 'table')
+DEFAULT_LINE_NUMBER_MODE = 'inline'
+
+
+class HighlightCache:
+    """
+    Memoriza lexers y formateadores por (lenguaje, estilo, números de línea)
+    y el HTML de bloques de código ya resaltados
+    """
+
+    def __init__(self, style: str = 'default', max_blocks: int = DEFAULT_MAX_BLOCKS):
+        """
+        Inicializa la caché
+
+        Args:
+            style: Estilo de Pygments de los formateadores
+            max_blocks: Bloques resaltados que se conservan como máximo
+        """
+        self.style = style
+        self.max_blocks = max_blocks
+        self.hits = 0
+        self.misses = 0
+        self.block_hits = 0
+        self.block_misses = 0
+
+        self._lexers: dict[tuple, object] = {}
+        self._formatters: dict[tuple, 'HtmlFormatter'] = {}
+        self._blocks: OrderedDict[tuple, str] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _count(self, hit: bool) -> None:
+        """Actualiza los contadores de aciertos y fallos"""
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def get_lexer(self, language: str, **options):
+        """
+        Obtiene un lexer por nombre, creándolo solo la primera vez
+
+        Args:
+            language: Nombre o alias del lenguaje en Pygments
+            **options: Opciones del lexer (stripall, stripnl...)
+
+        Returns:
+            Lexer de Pygments
+
+        Raises:
+            pygments.util.ClassNotFound: Si el lenguaje no existe
+        """
+        key = (language, tuple(sorted(options.items())))
+        lexer = self._lexers.get(key)
+        if lexer is not None:
+            self._count(True)
+            if lexer is _NOT_FOUND:
+                from pygments.util import ClassNotFound
+
+                raise ClassNotFound(f"no lexer for alias {language!r} found")
+            return lexer
+
+        self._count(False)
+        # Pygments (formateadores y lexers) se carga con el primer resaltado
+        from pygments.lexers import get_lexer_by_name
+        from pygments.util import ClassNotFound
+
+        try:
+            lexer = get_lexer_by_name(language, **options)
+        except ClassNotFound:
+            with self._lock:
+                self._lexers[key] = _NOT_FOUND
+            raise
+        with self._lock:
+            self._lexers[key] = lexer
+        return lexer
+
+    def get_formatter(
+        self,
+        line_numbers: bool,
+        line_number_mode: str = DEFAULT_LINE_NUMBER_MODE
+    ) -> 'HtmlFormatter':
+        """
+        Obtiene el formateador HTML, creándolo solo la primera vez
+
+        Args:
+            line_numbers: Si mostrar números de línea
+            line_number_mode: 'inline' o 'table'
+
+        Returns:
+            Formateador HTML de Pygments
+        """
+        key = (self.style, line_numbers, line_number_mode)
+        formatter = self._formatters.get(key)
+        if formatter is not None:
+            self._count(True)
+            return formatter
+
+        self._count(False)
+        from pygments.formatters import HtmlFormatter
+
+        formatter = HtmlFormatter(
+            style=self.style,
+            linenos=line_number_mode if line_numbers else False,
+            cssclass='highlight',
+            full=False
+        )
+        with self._lock:
+            self._formatters[key] = formatter
+        return formatter
+
+    def get_highlighted(self, language: str, code: str, render: Callable[[], str], **options) -> str:
+        """
+        Obtiene el HTML resaltado de un bloque, generándolo solo si no está en caché
+
+        Args:
+            language: Lenguaje del bloque
+            code: Código del bloque
+            render: Función que genera el HTML si no está en caché
+            **options: Opciones que afectan al HTML (estilo, clase CSS...)
+
+        Returns:
+            HTML del bloque resaltado
+        """
+        digest = hashlib.blake2b(code.encode('utf-8'), digest_size=16).digest()
+        key = (language, digest, repr(sorted(options.items())))
+        with self._lock:
+            html = self._blocks.get(key)
+            if html is not None:
+                self._blocks.move_to_end(key)
+                self.block_hits += 1
+                return html
+            self.block_misses += 1
+
+        html = render()
+        with self._lock:
+            self._blocks[key] = html
+            self._blocks.move_to_end(key)
+            while len(self._blocks) > self.max_blocks:
+                self._blocks.popitem(last=False)
+        return html
+
+    def stats(self) -> dict:
+        """
+        Obtiene los contadores de la caché
+
+        Returns:
+            Diccionario con aciertos, fallos, tasa de aciertos y tamaño
+        """
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / total if total else 0.0,
+                'lexers': len(self._lexers),
+                'formatters': len(self._formatters),
+                'blocks': len(self._blocks),
+                'block_hits': self.block_hits,
+                'block_misses': self.block_misses,
+            }
+
+    def clear(self) -> None:
+        """Vacía la caché y reinicia los contadores"""
+        with self._lock:
+            self._lexers.clear()
+            self._formatters.clear()
+            self._blocks.clear()
+            self.hits = 0
+            self.misses = 0
+            self.block_hits = 0
+            self.block_misses = 0
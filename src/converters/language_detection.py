@@ -0,0 +1,192 @@
+"""
+Detección rápida del lenguaje de un archivo de código
+"""
+
+import fnmatch
+import re
+import threading
+from functools import lru_cache
+from pathlib import PurePath
+from typing import Optional
+
+from pygments.lexers import (
+    find_lexer_class_by_name,
+    find_lexer_class_for_filename,
+    get_all_lexers,
+    guess_lexer
+)
+from pygments.modeline import get_filetype_from_line
+from pygments.util import ClassNotFound
+
+
+# Tamaño máximo del fragmento que se pasa a guess_lexer
+GUESS_SAMPLE_SIZE = 8 * 1024
+
+# Zona del inicio y del final del archivo donde se buscan las modelines
+_MODELINE_SCAN_SIZE = 4 * 1024
+_MODELINE_MAX_LINES = 5
+
+_SHEBANG_RE = re.compile(r'^#!\s*(\S+)(?:[ \t]+(\S+))?')
+_EMACS_MODE_RE = re.compile(r'-\*-.*?\bmode:\s*([\w+#-]+).*?-\*-|-\*-\s*([\w+#-]+)\s*-\*-', re.I)
+
+# Patrones de Pygments que solo miran la extensión ('*.py')
+_SUFFIX_PATTERN_RE = re.compile(r'^\*\.[^.*?\[]+$')
+
+
+@lru_cache(maxsize=None)
+def _get_name_patterns() -> re.Pattern:
+    """
+    Une (una sola vez) los patrones de nombre de Pygments que no son '*.ext'
+
+    Un archivo que encaja en alguno (CMakeLists.txt, Makefile.am,
+    x.yaml.j2) no se resuelve solo por su extensión.
+
+    Returns:
+        Expresión regular que encaja con esos nombres
+    """
+    patterns = {
+        pattern
+        for _, _, filenames, _ in get_all_lexers()
+        for pattern in filenames
+        if not _SUFFIX_PATTERN_RE.match(pattern)
+    }
+    return re.compile('|'.join(fnmatch.translate(pattern) for pattern in sorted(patterns)))
+
+
+# Intérpretes de shebang cuyo nombre no es un alias de Pygments
+_INTERPRETER_ALIASES = {
+    'node': 'javascript',
+    'nodejs': 'javascript',
+    'deno': 'typescript',
+    'sh': 'bash',
+    'dash': 'bash',
+    'ksh': 'bash',
+    'ash': 'bash',
+    'rscript': 'r',
+    'tclsh': 'tcl',
+    'wish': 'tcl',
+    'pwsh': 'powershell',
+    'osascript': 'applescript',
+}
+
+
+class LanguageDetector:
+    """Detecta el lenguaje probando primero las señales más baratas"""
+
+    def __init__(self, sample_size: int = GUESS_SAMPLE_SIZE):
+        """
+        Inicializa el detector
+
+        Args:
+            sample_size: Caracteres iniciales que se analizan con guess_lexer
+        """
+        self.sample_size = sample_size
+        self._filename_cache: dict[str, Optional[str]] = {}
+        self._alias_cache: dict[str, Optional[str]] = {}
+        self._lock = threading.Lock()
+
+    def detect(self, content: str, filename: Optional[str] = None) -> str:
+        """
+        Determina el alias de Pygments para un contenido
+
+        Orden: shebang, modelines (vim/emacs), nombre de archivo y, solo
+        como último recurso, guess_lexer sobre el inicio del contenido.
+
+        Args:
+            content: Contenido del archivo
+            filename: Nombre del archivo (opcional)
+
+        Returns:
+            Alias de Pygments ('text' si no se reconoce)
+        """
+        language = (
+            self._from_shebang(content)
+            or self._from_modeline(content)
+            or (self._from_filename(filename) if filename else None)
+            or self._from_guess(content)
+        )
+        return language or 'text'
+
+    def _resolve_alias(self, name: str) -> Optional[str]:
+        """Normaliza un nombre de lenguaje a un alias válido de Pygments"""
+        key = name.lower()
+        with self._lock:
+            if key in self._alias_cache:
+                return self._alias_cache[key]
+
+        alias = _INTERPRETER_ALIASES.get(key, key)
+        try:
+            alias = find_lexer_class_by_name(alias).aliases[0]
+        except ClassNotFound:
+            alias = None
+
+        with self._lock:
+            self._alias_cache[key] = alias
+        return alias
+
+    def _from_shebang(self, content: str) -> Optional[str]:
+        """Detecta el lenguaje a partir de la línea #! inicial"""
+        if not content.startswith('#!'):
+            return None
+        match = _SHEBANG_RE.match(content[:256])
+        if not match:
+            return None
+
+        interpreter = PurePath(match.group(1)).name
+        if interpreter == 'env' and match.group(2):
+            interpreter = match.group(2)
+        # python3.11 -> python3 -> python
+        for candidate in (interpreter, interpreter.rstrip('0123456789.')):
+            alias = self._resolve_alias(candidate) if candidate else None
+            if alias:
+                return alias
+        return None
+
+    def _from_modeline(self, content: str) -> Optional[str]:
+        """Detecta el lenguaje a partir de modelines de vim o emacs"""
+        head = content[:_MODELINE_SCAN_SIZE].splitlines()[:_MODELINE_MAX_LINES]
+        tail = content[-_MODELINE_SCAN_SIZE:].splitlines()[-_MODELINE_MAX_LINES:]
+
+        for line in head + tail:
+            name = get_filetype_from_line(line)
+            if not name:
+                match = _EMACS_MODE_RE.search(line)
+                name = (match.group(1) or match.group(2)) if match else None
+            if name:
+                alias = self._resolve_alias(name)
+                if alias:
+                    return alias
+        return None
+
+    def _from_filename(self, filename: str) -> Optional[str]:
+        """Detecta el lenguaje por nombre de archivo, cacheado por patrón"""
+        path = PurePath(filename)
+        # Mismo patrón para todos los archivos con igual extensión; sin
+        # extensión (Makefile) o con un patrón propio (CMakeLists.txt) se
+        # usa el nombre completo
+        if not path.suffix or _get_name_patterns().match(path.name):
+            pattern = path.name
+        else:
+            pattern = path.suffix.lower()
+
+        with self._lock:
+            if pattern in self._filename_cache:
+                return self._filename_cache[pattern]
+
+        lexer_class = find_lexer_class_for_filename(path.name)
+        alias = lexer_class.aliases[0] if lexer_class and lexer_class.aliases else None
+
+        with self._lock:
+            self._filename_cache[pattern] = alias
+        return alias
+
+    def _from_guess(self, content: str) -> Optional[str]:
+        """Último recurso: guess_lexer solo sobre el inicio del contenido"""
+        sample = content[:self.sample_size]
+        if not sample.strip():
+            return None
+        try:
+            lexer = guess_lexer(sample)
+        except ClassNotFound:
+            return None
+        return lexer.aliases[0] if lexer.aliases else None
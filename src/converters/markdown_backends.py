@@ -0,0 +1,160 @@
+"""
+Backends intercambiables para convertir Markdown a HTML
+"""
+
+import threading
+from typing import TYPE_CHECKING, Optional
+
+if TYPE_CHECKING:
+    from .highlight_cache import HighlightCache
+
+
+# Backend por defecto
+DEFAULT_BACKEND = 'markdown2'
+
+
+class MarkdownBackend:
+    """Interfaz común de los backends de Markdown"""
+
+    name = ''
+
+    def convert(self, text: str) -> str:
+        """
+        Convierte un documento Markdown a HTML
+
+        Args:
+            text: Contenido Markdown
+
+        Returns:
+            HTML del documento
+        """
+        raise NotImplementedError
+
+
+class Markdown2Backend(MarkdownBackend):
+    """markdown2 con una instancia reutilizada por hilo"""
+
+    name = 'markdown2'
+
+    def __init__(self, extras: list[str], highlight_cache: 'HighlightCache'):
+        """
+        Inicializa el backend
+
+        Args:
+            extras: Extras de markdown2
+            highlight_cache: Caché de lexers y bloques resaltados
+        """
+        self.extras = list(extras)
+        self.highlight_cache = highlight_cache
+        self._local = threading.local()
+
+    def convert(self, text: str) -> str:
+        # Markdown.convert() reinicia su estado al empezar cada documento,
+        # así que la instancia (y sus extras ya preparados) se reutiliza
+        markdown = getattr(self._local, 'markdown', None)
+        if markdown is None:
+            from .cached_markdown import CachedMarkdown
+
+            markdown = CachedMarkdown(self.highlight_cache, extras=self.extras)
+            self._local.markdown = markdown
+        return str(markdown.convert(text))
+
+
+class MarkdownItBackend(MarkdownBackend):
+    """
+    markdown-it-py (CommonMark) configurado para imitar los extras de markdown2
+
+    Tablas, tachado, listas de tareas, notas al pie, IDs de encabezados y
+    saltos de línea como <br>. Los bloques ``` se resaltan con la misma
+    caché y el mismo HTML que markdown2.
+    """
+
+    name = 'markdown-it'
+
+    def __init__(self, extras: list[str], highlight_cache: 'HighlightCache'):
+        """
+        Inicializa el backend
+
+        Args:
+            extras: Extras de markdown2 que se imitan
+            highlight_cache: Caché de lexers y bloques resaltados
+        """
+        from .cached_markdown import CachedMarkdown, slugify
+
+        try:
+            from markdown_it import MarkdownIt
+            from mdit_py_plugins.anchors import anchors_plugin
+            from mdit_py_plugins.footnote import footnote_plugin
+            from mdit_py_plugins.tasklists import tasklists_plugin
+        except ImportError:
+            raise ValueError(
+                "El backend 'markdown-it' necesita: pip install markdown-it-py mdit-py-plugins"
+            )
+
+        # Se usa solo para resaltar, con el mismo formateador que markdown2
+        self._highlighter = CachedMarkdown(highlight_cache)
+
+        md = MarkdownIt('commonmark', {'html': True, 'breaks': 'break-on-newline' in extras})
+        if 'tables' in extras:
+            md.enable('table')
+        if 'strike' in extras:
+            md.enable('strikethrough')
+        if 'task_list' in extras:
+            md.use(tasklists_plugin)
+        if 'footnotes' in extras:
+            md.use(footnote_plugin)
+        if 'header-ids' in extras:
+            md.use(anchors_plugin, max_level=6, slug_func=slugify)
+        if 'fenced-code-blocks' in extras:
+            self._default_fence = md.renderer.rules['fence']
+            md.renderer.rules['fence'] = self._render_fence
+        self._md = md
+
+    def _render_fence(self, tokens, idx, options, env) -> str:
+        """Resalta los bloques ``` con lenguaje conocido como lo hace markdown2"""
+        token = tokens[idx]
+        language = token.info.strip().split()[0] if token.info.strip() else ''
+        lexer = self._highlighter._get_pygments_lexer(language) if language else None
+        if lexer is None:
+            return self._default_fence(tokens, idx, options, env)
+        code = token.content[:-1] if token.content.endswith('\n') else token.content
+        return self._highlighter._color_with_pygments(code, lexer) + '\n'
+
+    def convert(self, text: str) -> str:
+        return self._md.render(text)
+
+
+# Backends disponibles por nombre
+BACKENDS = {
+    Markdown2Backend.name: Markdown2Backend,
+    MarkdownItBackend.name: MarkdownItBackend,
+}
+
+
+def create_backend(
+    name: str = DEFAULT_BACKEND,
+    extras: Optional[list[str]] = None,
+    highlight_cache: Optional['HighlightCache'] = None
+) -> MarkdownBackend:
+    """
+    Crea un backend de Markdown por nombre
+
+    Args:
+        name: Nombre del backend ('markdown2' o 'markdown-it')
+        extras: Extras de markdown2 (o que el backend debe imitar)
+        highlight_cache: Caché de lexers y bloques resaltados (opcional)
+
+    Returns:
+        Backend listo para convertir
+
+    Raises:
+        ValueError: Si el backend no existe o falta su dependencia
+    """
+    backend_class = BACKENDS.get(name)
+    if backend_class is None:
+        raise ValueError(f"Backend de Markdown desconocido: {name} (disponibles: {', '.join(BACKENDS)})")
+    if highlight_cache is None:
+        from .highlight_cache import HighlightCache
+
+        highlight_cache = HighlightCache()
+    return backend_class(extras or [], highlight_cache)
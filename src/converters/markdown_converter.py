@@ -2,15 +2,37 @@
 Conversor de archivos Markdown a HTML
 """
 
-import markdown2
+import re
 from typing import Optional
 
+from .highlight_cache import HighlightCache
+from .markdown_backends import DEFAULT_BACKEND, create_backend
+
+
+# Encabezados de nivel 1 a 3 al inicio de línea: posibles cortes entre secciones
+_SECTION_RE = re.compile(r'^<h[1-3][ >]', re.MULTILINE)
+
+# Etiquetas de bloque que no se pueden dejar abiertas en un corte
+_BLOCK_TAG_RE = re.compile(r'<(/?)(?:div|section|details|blockquote|table|ul|ol)\b', re.IGNORECASE)
+
 
 class MarkdownConverter:
     """Convierte archivos Markdown a HTML"""
     
-    def __init__(self):
-        """Inicializa el conversor con extras de markdown2"""
+    def __init__(
+        self,
+        highlight_cache: Optional[HighlightCache] = None,
+        backend: str = DEFAULT_BACKEND
+    ):
+        """
+        Inicializa el conversor con extras de markdown2
+        
+        Args:
+            highlight_cache: Caché de lexers y bloques resaltados, compartible
+                con CodeConverter (opcional)
+            backend: Backend de Markdown ('markdown2' o 'markdown-it')
+        """
+        self.highlight_cache = highlight_cache or HighlightCache()
         self.extras = [
             'fenced-code-blocks',  # Bloques de código con ```
             'tables',              # Soporte para tablas
@@ -22,6 +44,7 @@ class MarkdownConverter:
             'footnotes',           # Notas al pie
             'cuddled-lists',       # Listas sin líneas en blanco
         ]
+        self.backend = create_backend(backend, self.extras, self.highlight_cache)
     
     def convert(self, markdown_content: str, filename: Optional[str] = None) -> str:
         """
@@ -35,10 +58,7 @@ class MarkdownConverter:
             Contenido HTML generado
         """
         # Convertir Markdown a HTML
-        html_content = markdown2.markdown(
-            markdown_content,
-            extras=self.extras
-        )
+        html_content = self.backend.convert(markdown_content)
         
         # Agregar encabezado si se proporciona nombre de archivo
         if filename:
@@ -69,4 +89,45 @@ class MarkdownConverter:
         
         filename = Path(filepath).name
         return self.convert(content, filename)
-
+    
+    def split_sections(self, html_content: str, max_parts: int) -> list[str]:
+        """
+        Parte el HTML de un documento en secciones consecutivas de tamaño parecido
+        
+        Los cortes solo se hacen justo antes de un encabezado de nivel 1 a 3
+        que no esté dentro de otro bloque, de modo que cada parte es HTML
+        válido por sí misma. Como el documento se convierte entero antes de
+        partirlo, los IDs de los encabezados son los mismos que sin partir.
+        
+        Args:
+            html_content: HTML generado por convert()
+            max_parts: Número máximo de partes
+            
+        Returns:
+            Lista de fragmentos HTML en orden (uno solo si no hay cortes seguros)
+        """
+        if max_parts <= 1:
+            return [html_content]
+        
+        # Cortes seguros: encabezados con todos los bloques anteriores cerrados
+        boundaries = []
+        depth = 0
+        previous = 0
+        for match in _SECTION_RE.finditer(html_content):
+            for tag in _BLOCK_TAG_RE.finditer(html_content, previous, match.start()):
+                depth += -1 if tag.group(1) else 1
+            previous = match.start()
+            if depth == 0 and match.start() > 0:
+                boundaries.append(match.start())
+        
+        target = len(html_content) / max_parts
+        parts = []
+        start = 0
+        for boundary in boundaries:
+            if len(parts) == max_parts - 1:
+                break
+            if boundary - start >= target:
+                parts.append(html_content[start:boundary])
+                start = boundary
+        parts.append(html_content[start:])
+        return parts
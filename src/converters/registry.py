@@ -0,0 +1,290 @@
+"""
+Registro de conversores: extensiones, tipos MIME y fábricas de cada tipo
+
+Resolver el conversor de un archivo es una búsqueda en un diccionario por
+extensión. Los módulos de cada conversor (y sus dependencias pesadas, como
+markdown2 o Pygments) solo se importan cuando se crea el primero.
+"""
+
+import os
+import threading
+from dataclasses import dataclass, field
+from typing import Callable, Optional, Union
+
+
+# Tipo usado para extensiones y tipos MIME desconocidos
+DEFAULT_KIND = 'text'
+
+# Tipo de los archivos sin extensión que empiezan por #! (scripts)
+SHEBANG_KIND = 'code'
+
+
+@dataclass(frozen=True)
+class ConverterSpec:
+    """Descripción de un tipo de conversor registrado"""
+    kind: str
+    factory: Callable[[object], object]
+    description: str = ''
+    extensions: tuple = ()
+    mime_types: tuple = ()
+    # Lenguaje de Pygments por extensión (solo para conversores de código)
+    languages: dict = field(default_factory=dict)
+
+
+_specs: dict[str, ConverterSpec] = {}
+# Extensión (con punto, en minúsculas) -> (tipo, lenguaje)
+_by_extension: dict[str, tuple[str, str]] = {}
+_by_mime_type: dict[str, str] = {}
+# Tipo resuelto por tipo MIME para extensiones no registradas
+_guessed: dict[str, str] = {}
+_lock = threading.Lock()
+
+
+def register_converter(
+    kind: str,
+    factory: Callable[[object], object],
+    extensions: tuple = (),
+    mime_types: tuple = (),
+    languages: Optional[dict] = None,
+    description: str = ''
+) -> ConverterSpec:
+    """
+    Registra (o reemplaza) un tipo de conversor
+
+    Args:
+        kind: Nombre del tipo ('markdown', 'code', 'text'...)
+        factory: Función que recibe el PDFGenerator y crea el conversor; el
+            conversor debe ofrecer convert(contenido, nombre) -> HTML
+        extensions: Extensiones con punto ('.rst')
+        mime_types: Tipos MIME que se resuelven a este tipo cuando la
+            extensión no está registrada
+        languages: Lenguaje de Pygments por extensión (opcional)
+        description: Nombre legible para diálogos y ayudas
+
+    Returns:
+        Especificación registrada
+    """
+    extensions = tuple(ext.lower() for ext in extensions)
+    languages = {ext.lower(): language for ext, language in (languages or {}).items()}
+    spec = ConverterSpec(kind, factory, description, extensions, tuple(mime_types), languages)
+    with _lock:
+        previous = _specs.get(kind)
+        if previous is not None:
+            # Al reemplazar un tipo, sus extensiones y tipos MIME anteriores
+            # dejan de apuntar a él (salvo que otro tipo ya los haya tomado)
+            for ext in previous.extensions:
+                if _by_extension.get(ext, (None,))[0] == kind:
+                    del _by_extension[ext]
+            for mime_type in previous.mime_types:
+                if _by_mime_type.get(mime_type) == kind:
+                    del _by_mime_type[mime_type]
+        _specs[kind] = spec
+        for ext in extensions:
+            _by_extension[ext] = (kind, languages.get(ext, 'text'))
+        for mime_type in spec.mime_types:
+            _by_mime_type[mime_type] = kind
+        _guessed.clear()
+    return spec
+
+
+def get_spec(kind: str) -> ConverterSpec:
+    """
+    Obtiene la especificación de un tipo de conversor
+
+    Raises:
+        ValueError: Si el tipo no está registrado
+    """
+    spec = _specs.get(kind)
+    if spec is None:
+        raise ValueError(f"Tipo de contenido no soportado: {kind}")
+    return spec
+
+
+def _extension(filepath: str) -> str:
+    """Extensión con punto y en minúsculas"""
+    return os.path.splitext(filepath)[1].lower()
+
+
+def get_converter_kind(filepath: str, head: Union[str, bytes, None] = None) -> str:
+    """
+    Determina el tipo de conversor de un archivo
+
+    Primero por extensión; los archivos sin extensión cuyo contenido
+    empieza por #! son scripts de código. Si no, por el tipo MIME que
+    sugiere el nombre. Por defecto, texto plano.
+
+    Args:
+        filepath: Ruta o nombre del archivo
+        head: Inicio del contenido (opcional; solo se usa sin extensión)
+
+    Returns:
+        Tipo de conversor registrado
+    """
+    ext = _extension(filepath)
+    entry = _by_extension.get(ext)
+    if entry is not None:
+        return entry[0]
+
+    if not ext and head and head[:2] in ('#!', b'#!') and SHEBANG_KIND in _specs:
+        return SHEBANG_KIND
+
+    kind = _guessed.get(ext)
+    if kind is None:
+        import mimetypes
+
+        # Bajo el cerrojo, para no guardar una resolución anterior a un
+        # register_converter() que se ejecute a la vez
+        with _lock:
+            kind = _guessed.get(ext)
+            if kind is None:
+                mime_type = mimetypes.guess_type(f"archivo{ext}")[0] if ext else None
+                kind = _by_mime_type.get(mime_type, DEFAULT_KIND)
+                _guessed[ext] = kind
+    return kind
+
+
+def get_registered_kind(filepath: str) -> Optional[str]:
+    """
+    Obtiene el tipo registrado para la extensión exacta de un archivo
+
+    A diferencia de get_converter_kind(), no recurre al tipo MIME ni al
+    texto plano por defecto.
+
+    Args:
+        filepath: Ruta o nombre del archivo
+
+    Returns:
+        Tipo de conversor, o None si la extensión no está registrada
+    """
+    entry = _by_extension.get(_extension(filepath))
+    return entry[0] if entry is not None else None
+
+
+def get_language(filepath: str) -> str:
+    """
+    Obtiene el lenguaje de Pygments asociado a la extensión de un archivo
+
+    Returns:
+        Nombre del lenguaje, o 'text' si la extensión no tiene uno
+    """
+    entry = _by_extension.get(_extension(filepath))
+    return entry[1] if entry is not None else 'text'
+
+
+def supported_extensions() -> list[str]:
+    """Extensiones registradas (con punto), en orden de registro"""
+    return list(_by_extension)
+
+
+def file_dialog_filter() -> str:
+    """
+    Filtro de un diálogo de archivos con todos los tipos registrados
+
+    Returns:
+        Filtro al estilo de Qt: todos los soportados, uno por tipo y todos
+    """
+    all_patterns = ' '.join(f'*{ext}' for ext in _by_extension)
+    filters = [f"Todos los archivos soportados ({all_patterns})"]
+    for spec in _specs.values():
+        if spec.extensions:
+            patterns = ' '.join(f'*{ext}' for ext in spec.extensions)
+            filters.append(f"{spec.description or spec.kind} ({patterns})")
+    filters.append("Todos los archivos (*.*)")
+    return ';;'.join(filters)
+
+
+# Lenguaje de Pygments de cada extensión de código
+_CODE_LANGUAGES = {
+    '.py': 'python',
+    '.js': 'javascript',
+    '.jsx': 'jsx',
+    '.ts': 'typescript',
+    '.tsx': 'tsx',
+    '.java': 'java',
+    '.c': 'c',
+    '.cpp': 'cpp',
+    '.h': 'c',
+    '.hpp': 'cpp',
+    '.cs': 'csharp',
+    '.php': 'php',
+    '.rb': 'ruby',
+    '.go': 'go',
+    '.rs': 'rust',
+    '.swift': 'swift',
+    '.kt': 'kotlin',
+    '.scala': 'scala',
+    '.r': 'r',
+    '.html': 'html',
+    '.css': 'css',
+    '.scss': 'scss',
+    '.sass': 'sass',
+    '.json': 'json',
+    '.xml': 'xml',
+    '.yaml': 'yaml',
+    '.yml': 'yaml',
+    '.sh': 'bash',
+    '.bash': 'bash',
+    '.sql': 'sql',
+    '.vue': 'vue',
+    '.dart': 'dart',
+    '.lua': 'lua',
+    '.perl': 'perl',
+    '.asm': 'nasm',
+}
+
+
+def _create_markdown_converter(generator):
+    """Crea el conversor de Markdown con el backend del generador"""
+    from .markdown_converter import MarkdownConverter
+
+    # Los bloques ``` de Markdown comparten lexers y resaltado con el código
+    return MarkdownConverter(
+        highlight_cache=generator.code_converter.highlight_cache,
+        backend=generator.markdown_backend
+    )
+
+
+def _create_code_converter(generator):
+    """Crea el conversor de código con el estilo y la numeración del generador"""
+    from .code_converter import CodeConverter
+
+    return CodeConverter(style=generator.style, line_number_mode=generator.line_number_mode)
+
+
+def _create_text_converter(generator):
+    """Crea el conversor de texto plano"""
+    from .text_converter import TextConverter
+
+    return TextConverter()
+
+
+register_converter(
+    'markdown',
+    _create_markdown_converter,
+    extensions=('.md', '.markdown'),
+    mime_types=('text/markdown', 'text/x-markdown'),
+    description='Markdown'
+)
+
+register_converter(
+    'text',
+    _create_text_converter,
+    extensions=('.txt',),
+    mime_types=('text/plain',),
+    description='Texto'
+)
+
+register_converter(
+    'code',
+    _create_code_converter,
+    extensions=tuple(_CODE_LANGUAGES),
+    languages=_CODE_LANGUAGES,
+    mime_types=(
+        'text/x-python', 'text/javascript', 'application/javascript',
+        'application/json', 'application/xml', 'text/xml', 'text/html',
+        'text/css', 'text/x-c', 'text/x-java-source', 'text/x-sh',
+        'application/x-sh', 'application/x-perl', 'text/x-perl',
+        'application/x-yaml', 'text/x-yaml', 'application/sql',
+    ),
+    description='Código fuente'
+)
@@ -1,7 +1,7 @@
 
 
 import html
-from typing import Optional
+from typing import Iterable, Iterator, Optional
 from pathlib import Path
 
 
@@ -55,6 +55,24 @@ class TextConverter:
         
         return html_content
     
+    def convert_chunks(
+        self,
+        chunks: Iterable[str],
+        filename: Optional[str] = None
+    ) -> Iterator[str]:
+        """
+        Convierte texto plano por bloques, sin tenerlo entero en memoria
+        
+        Args:
+            chunks: Bloques de líneas completas del archivo
+            filename: Nombre del archivo (opcional, solo en el primer bloque)
+            
+        Yields:
+            Fragmento HTML de cada bloque
+        """
+        for i, chunk in enumerate(chunks):
+            yield self.convert(chunk, filename if i == 0 else None)
+    
     def convert_file(self, filepath: str, preserve_formatting: bool = True) -> str:
         """
         Convierte un archivo de texto a HTML
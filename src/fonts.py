@@ -0,0 +1,106 @@
+"""
+Familias de fuentes de los PDFs fijadas con @font-face
+
+La plantilla pide 'Segoe UI' y 'Consolas', que solo existen en Windows. En
+vez de dejar que fontconfig busque un sustituto en cada maquetación, las
+familias 'padlef-sans' y 'padlef-mono' se declaran con @font-face: primero
+las fuentes incluidas en templates/fonts (si las hay) y después, en orden
+de preferencia, fuentes instaladas conocidas. WeasyPrint resuelve estas
+reglas una sola vez, al parsear la hoja de estilo con la configuración de
+fuentes compartida del proceso.
+"""
+
+from functools import lru_cache
+from pathlib import Path
+
+
+# Fuentes incluidas con la aplicación: <familia>-<variante>.<formato>,
+# p. ej. padlef-sans-bold.ttf o padlef-mono-regular.woff2
+FONTS_DIR = Path(__file__).parent.parent / 'templates' / 'fonts'
+
+_FONT_FORMATS = ('.woff2', '.woff', '.otf', '.ttf')
+
+# Variantes: (nombre, font-weight, font-style)
+_VARIANTS = (
+    ('regular', 'normal', 'normal'),
+    ('bold', 'bold', 'normal'),
+    ('italic', 'normal', 'italic'),
+    ('bolditalic', 'bold', 'italic'),
+)
+
+# Fuentes instaladas de cada familia, en orden de preferencia:
+# (familia, palabra de la cursiva en el nombre completo)
+FONT_FAMILIES = {
+    'padlef-sans': (
+        ('Segoe UI', 'Italic'),
+        ('Arial', 'Italic'),
+        ('Liberation Sans', 'Italic'),
+        ('DejaVu Sans', 'Oblique'),
+        ('Noto Sans', 'Italic'),
+    ),
+    'padlef-mono': (
+        ('Consolas', 'Italic'),
+        ('Monaco', 'Italic'),
+        ('Courier New', 'Italic'),
+        ('Liberation Mono', 'Italic'),
+        ('DejaVu Sans Mono', 'Oblique'),
+        ('Noto Sans Mono', 'Italic'),
+    ),
+}
+
+
+def _local_name(family: str, italic_word: str, variant: str) -> str:
+    """Nombre completo de una variante instalada ('DejaVu Sans Bold Oblique')"""
+    suffix = {
+        'regular': '',
+        'bold': ' Bold',
+        'italic': f' {italic_word}',
+        'bolditalic': f' Bold {italic_word}',
+    }[variant]
+    return f"{family}{suffix}"
+
+
+def _bundled_font(family: str, variant: str) -> str:
+    """URL de la fuente incluida de una variante, o cadena vacía si no existe"""
+    for extension in _FONT_FORMATS:
+        path = FONTS_DIR / f"{family}-{variant}{extension}"
+        if path.is_file():
+            return path.resolve().as_uri()
+    return ''
+
+
+@lru_cache(maxsize=None)
+def get_font_face_css() -> str:
+    """
+    Genera (una sola vez por proceso) las reglas @font-face de la plantilla
+
+    Returns:
+        CSS con una regla por familia y variante
+    """
+    rules = []
+    for family, candidates in FONT_FAMILIES.items():
+        for variant, weight, style in _VARIANTS:
+            sources = []
+            bundled = _bundled_font(family, variant)
+            if bundled:
+                sources.append(f"url('{bundled}')")
+            sources.extend(
+                f"local('{_local_name(name, italic_word, variant)}')"
+                for name, italic_word in candidates
+            )
+            rules.append(
+                "@font-face {\n"
+                f"    font-family: '{family}';\n"
+                f"    font-weight: {weight};\n"
+                f"    font-style: {style};\n"
+                f"    src: {', '.join(sources)};\n"
+                "}"
+            )
+    return '\n\n'.join(rules) + '\n'
+
+
+# Documento mínimo que usa todas las variantes, para precargar las fuentes
+FONT_SAMPLE_HTML = (
+    '<p>Aa <b>Aa</b> <i>Aa</i> <b><i>Aa</i></b></p>'
+    '<pre>Aa <b>Aa</b> <i>Aa</i> <b><i>Aa</i></b></pre>'
+)
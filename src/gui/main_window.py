@@ -2,55 +2,115 @@
 Ventana principal de la aplicación mdPdf
 """
 
+import json
+import multiprocessing
+import os
 import sys
+import threading
+import time
+from concurrent.futures import as_completed
 from pathlib import Path
 from typing import List, Optional
 
 from PyQt6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
     QPushButton, QLabel, QListWidget, QFileDialog, QMessageBox,
-    QCheckBox, QGroupBox, QProgressBar
+    QCheckBox, QGroupBox, QProgressBar, QListWidgetItem
 )
-from PyQt6.QtCore import Qt, QThread, pyqtSignal
-from PyQt6.QtGui import QIcon, QDragEnterEvent, QDropEvent, QPixmap, QPainter
+from PyQt6.QtCore import Qt, QThread, QTimer, pyqtSignal
+from PyQt6.QtGui import QIcon, QDragEnterEvent, QDropEvent, QPixmap, QPainter, QColor
 from PyQt6.QtSvg import QSvgRenderer
 
-from ..pdf_generator import PDFGenerator
+from ..batch import BatchConverter, BatchResult, get_output_path
+from ..converters import file_dialog_filter
+
+
+# Texto y color de cada estado de archivo en la lista
+FILE_STATUS = {
+    'pending': ("En cola", "#7f8c8d"),
+    'ok': ("Convertido", "#27ae60"),
+    'error': ("Error", "#c0392b"),
+    'cancelled': ("Cancelado", "#7f8c8d"),
+}
 
 
 class ConversionThread(QThread):
-    """Thread para realizar la conversión en segundo plano"""
+    """Thread que reparte la conversión entre los procesos del pool"""
     
-    progress = pyqtSignal(int, int)  # (actual, total)
+    progress = pyqtSignal(int, int, object, object)  # (archivos, total, bytes, bytes totales)
+    file_finished = pyqtSignal(str, str, str)  # (archivo, estado, detalle)
     finished = pyqtSignal(list)  # Lista de archivos generados
-    error = pyqtSignal(str)  # Mensaje de error
+    error = pyqtSignal(str)  # Mensaje de error general
     
     def __init__(self, files: List[str], output_dir: Optional[str], 
-                 line_numbers: bool, style: str):
+                 line_numbers: bool, style: str, workers: Optional[int] = None,
+                 batch: Optional[BatchConverter] = None):
         super().__init__()
-        self.files = files
+        self.files = list(files)
         self.output_dir = output_dir
         self.line_numbers = line_numbers
         self.style = style
+        self.workers = workers
+        # Pool ya precargado de la ventana; si no hay, se crea uno para esta conversión
+        self.batch = batch
+        self._futures: list = []
+        self._cancelled = threading.Event()
+    
+    def cancel(self):
+        """Cancela las conversiones que aún no han empezado"""
+        self._cancelled.set()
+        for future in list(self._futures):
+            future.cancel()
     
     def run(self):
         """Ejecuta la conversión"""
         try:
-            generator = PDFGenerator(style=self.style)
             output_files = []
+            owns_batch = self.batch is None
+            batch = BatchConverter(
+                workers=self.workers,
+                style=self.style,
+                mp_context=multiprocessing.get_context('spawn')
+            ) if owns_batch else self.batch
             
-            for i, file in enumerate(self.files, 1):
+            sizes = {}
+            for file in self.files:
                 try:
-                    output_file = generator.convert_to_pdf(
-                        file,
-                        output_file=None if not self.output_dir else 
-                                   str(Path(self.output_dir) / Path(file).with_suffix('.pdf').name),
-                        line_numbers=self.line_numbers
-                    )
-                    output_files.append(output_file)
-                    self.progress.emit(i, len(self.files))
-                except Exception as e:
-                    self.error.emit(f"Error en {Path(file).name}: {str(e)}")
+                    sizes[file] = os.path.getsize(file)
+                except OSError:
+                    sizes[file] = 0
+            total_bytes = sum(sizes.values())
+            done_bytes = 0
+            
+            try:
+                futures = {
+                    batch.submit(file, get_output_path(file, self.output_dir), self.line_numbers): file
+                    for file in self.files
+                }
+                self._futures = list(futures)
+                if self._cancelled.is_set():
+                    self.cancel()
+                
+                for i, future in enumerate(as_completed(futures), 1):
+                    file = futures[future]
+                    if future.cancelled():
+                        self.file_finished.emit(file, 'cancelled', '')
+                    else:
+                        try:
+                            result = future.result()
+                        except Exception as e:
+                            # El proceso worker murió o no pudo devolver el resultado
+                            result = BatchResult(input_file=file, error=str(e))
+                        if result.ok:
+                            output_files.append(result.output_file)
+                            self.file_finished.emit(file, 'ok', result.output_file)
+                        else:
+                            self.file_finished.emit(file, 'error', result.error)
+                    done_bytes += sizes[file]
+                    self.progress.emit(i, len(self.files), done_bytes, total_bytes)
+            finally:
+                if owns_batch:
+                    batch.shutdown(cancel_pending=True)
             
             self.finished.emit(output_files)
             
@@ -66,6 +126,12 @@ class MainWindow(QMainWindow):
         self.files_to_convert: List[str] = []
         self.output_directory: Optional[str] = None
         self.conversion_thread: Optional[ConversionThread] = None
+        # Elemento de la lista de cada archivo, para actualizar su estado
+        self.file_items: dict = {}
+        self.conversion_errors = 0
+        # Pool de procesos compartido por todas las conversiones de la ventana;
+        # con spawn, porque hacer fork de un proceso con hilos de Qt no es seguro
+        self.batch = BatchConverter(style='default', mp_context=multiprocessing.get_context('spawn'))
         
         # Obtener ruta de assets
         self.assets_path = self._get_assets_path()
@@ -239,6 +305,12 @@ class MainWindow(QMainWindow):
         self.convert_btn.setEnabled(False)
         main_layout.addWidget(self.convert_btn)
         
+        # Botón de cancelación (visible solo durante la conversión)
+        self.cancel_btn = QPushButton("Cancelar")
+        self.cancel_btn.clicked.connect(self.cancel_conversion)
+        self.cancel_btn.setVisible(False)
+        main_layout.addWidget(self.cancel_btn)
+        
         # Información de formatos soportados
         info_label = QLabel(
             "Formatos soportados: .md, .txt, .py, .js, .jsx, .ts, .tsx, .java, "
@@ -248,6 +320,22 @@ class MainWindow(QMainWindow):
         info_label.setWordWrap(True)
         main_layout.addWidget(info_label)
     
+    def warm_up(self):
+        """Arranca los workers y precarga WeasyPrint en segundo plano"""
+        try:
+            self.batch.warm_up()
+        except Exception as e:
+            # La precarga es opcional: la conversión la repetirá si hace falta
+            print(f"No se pudo precargar el conversor: {e}", file=sys.stderr)
+    
+    def closeEvent(self, event):
+        """Detiene el pool de procesos al cerrar la ventana"""
+        if self.conversion_thread is not None and self.conversion_thread.isRunning():
+            self.conversion_thread.cancel()
+            self.conversion_thread.wait()
+        self.batch.shutdown(cancel_pending=True)
+        super().closeEvent(event)
+    
     def dragEnterEvent(self, event: QDragEnterEvent):
         """Maneja el evento de arrastrar archivos"""
         if event.mimeData().hasUrls():
@@ -264,7 +352,7 @@ class MainWindow(QMainWindow):
             self,
             "Seleccionar Archivos",
             "",
-            "Todos los archivos soportados (*.md *.txt *.py *.js *.jsx *.ts *.tsx *.java *.c *.cpp *.cs *.php *.rb *.go *.rs *.swift *.kt *.html *.css *.json *.xml);;Todos los archivos (*.*)"
+            file_dialog_filter()
         )
         
         if files:
@@ -275,7 +363,10 @@ class MainWindow(QMainWindow):
         for file in files:
             if file not in self.files_to_convert:
                 self.files_to_convert.append(file)
-                self.files_list.addItem(file)
+                item = QListWidgetItem(file)
+                item.setData(Qt.ItemDataRole.UserRole, file)
+                self.files_list.addItem(item)
+                self.file_items[file] = item
         
         self.update_buttons_state()
     
@@ -284,9 +375,10 @@ class MainWindow(QMainWindow):
         selected_items = self.files_list.selectedItems()
         
         for item in selected_items:
-            file_path = item.text()
+            file_path = item.data(Qt.ItemDataRole.UserRole)
             if file_path in self.files_to_convert:
                 self.files_to_convert.remove(file_path)
+            self.file_items.pop(file_path, None)
             self.files_list.takeItem(self.files_list.row(item))
         
         self.update_buttons_state()
@@ -294,9 +386,20 @@ class MainWindow(QMainWindow):
     def clear_files(self):
         """Limpia todos los archivos"""
         self.files_to_convert.clear()
+        self.file_items.clear()
         self.files_list.clear()
         self.update_buttons_state()
     
+    def set_file_status(self, file: str, status: str, detail: str = ""):
+        """Muestra el estado de un archivo en la lista"""
+        item = self.file_items.get(file)
+        if item is None:
+            return
+        label, color = FILE_STATUS[status]
+        item.setText(f"{file}  —  {label}" + (f": {detail}" if status == 'error' else ""))
+        item.setForeground(QColor(color))
+        item.setToolTip(detail or label)
+    
     def select_output_directory(self):
         """Selecciona directorio de salida"""
         directory = QFileDialog.getExistingDirectory(
@@ -338,48 +441,82 @@ class MainWindow(QMainWindow):
         self.add_files_btn.setEnabled(False)
         self.remove_files_btn.setEnabled(False)
         self.clear_files_btn.setEnabled(False)
+        self.cancel_btn.setEnabled(True)
+        self.cancel_btn.setVisible(True)
+        
+        for file in self.files_to_convert:
+            self.set_file_status(file, 'pending')
+        self.conversion_errors = 0
         
-        # Mostrar barra de progreso
+        # Mostrar barra de progreso (en milésimas de los bytes totales)
         self.progress_bar.setVisible(True)
-        self.progress_bar.setMaximum(len(self.files_to_convert))
+        self.progress_bar.setMaximum(1000)
         self.progress_bar.setValue(0)
+        self.progress_bar.setFormat(f"0/{len(self.files_to_convert)} archivos")
         
         # Crear y ejecutar thread de conversión
         self.conversion_thread = ConversionThread(
             self.files_to_convert,
             self.output_directory,
             self.line_numbers_check.isChecked(),
-            'default'  # Siempre usar estilo default
+            'default',  # Siempre usar estilo default
+            batch=self.batch
         )
         
         self.conversion_thread.progress.connect(self.on_conversion_progress)
+        self.conversion_thread.file_finished.connect(self.on_file_finished)
         self.conversion_thread.finished.connect(self.on_conversion_finished)
         self.conversion_thread.error.connect(self.on_conversion_error)
         
         self.conversion_thread.start()
     
-    def on_conversion_progress(self, current: int, total: int):
+    def cancel_conversion(self):
+        """Cancela los archivos que aún no se han empezado a convertir"""
+        if self.conversion_thread is not None:
+            self.conversion_thread.cancel()
+        self.cancel_btn.setEnabled(False)
+    
+    def on_conversion_progress(self, current: int, total: int, done_bytes: int, total_bytes: int):
         """Actualiza el progreso de la conversión"""
-        self.progress_bar.setValue(current)
+        if total_bytes:
+            self.progress_bar.setValue(int(done_bytes * 1000 / total_bytes))
+        else:
+            self.progress_bar.setValue(int(current * 1000 / total))
+        self.progress_bar.setFormat(
+            f"{current}/{total} archivos · {_format_size(done_bytes)} de {_format_size(total_bytes)}"
+        )
     
-    def on_conversion_finished(self, output_files: List[str]):
-        """Maneja la finalización de la conversión"""
+    def on_file_finished(self, file: str, status: str, detail: str):
+        """Actualiza el estado de un archivo terminado"""
+        if status == 'error':
+            self.conversion_errors += 1
+        self.set_file_status(file, status, detail)
+    
+    def _restore_controls(self):
+        """Vuelve a habilitar los controles al terminar o fallar la conversión"""
         self.progress_bar.setVisible(False)
+        self.cancel_btn.setVisible(False)
         
-        # Habilitar controles
-        self.convert_btn.setEnabled(True)
         self.add_files_btn.setEnabled(True)
-        self.clear_files_btn.setEnabled(True)
-        
-        # Mostrar mensaje de éxito
-        QMessageBox.information(
-            self,
-            "Conversión Completada",
-            f"Se han convertido exitosamente {len(output_files)} archivo(s) a PDF."
-        )
+        self.update_buttons_state()
+        self.on_selection_changed()
+    
+    def on_conversion_finished(self, output_files: List[str]):
+        """Maneja la finalización de la conversión (también si se canceló)"""
+        self._restore_controls()
+        
+        # Un único resumen al final; el detalle de cada error está en la lista
+        total = len(self.conversion_thread.files)
+        message = f"Se han convertido exitosamente {len(output_files)} de {total} archivo(s) a PDF."
+        if self.conversion_errors:
+            message += f"\n{self.conversion_errors} archivo(s) con errores: consulta la lista para ver el detalle."
+            QMessageBox.warning(self, "Conversión Completada con Errores", message)
+        else:
+            QMessageBox.information(self, "Conversión Completada", message)
     
     def on_conversion_error(self, error_message: str):
-        """Maneja errores durante la conversión"""
+        """Maneja errores generales de la conversión"""
+        self._restore_controls()
         QMessageBox.warning(
             self,
             "Error en la Conversión",
@@ -387,13 +524,45 @@ class MainWindow(QMainWindow):
         )
 
 
-def run_app():
-    """Ejecuta la aplicación"""
+def _format_size(size: int) -> str:
+    """Formatea un tamaño en bytes para mostrarlo"""
+    for unit in ('B', 'KB', 'MB'):
+        if size < 1024:
+            return f"{size:.0f} {unit}" if unit == 'B' else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GB"
+
+
+def run_app(started_at: Optional[float] = None):
+    """
+    Ejecuta la aplicación
+    
+    Args:
+        started_at: Instante de arranque del proceso (time.perf_counter()),
+            para medir el tiempo hasta mostrar la ventana
+    """
     app = QApplication(sys.argv)
     app.setStyle('Fusion')  # Estilo moderno
     
     window = MainWindow()
     window.show()
     
+    # La pila de conversión se carga después de pintar la ventana
+    QTimer.singleShot(0, window.warm_up)
+    
+    if os.environ.get('PADLEF_STARTUP_REPORT'):
+        QTimer.singleShot(0, lambda: _report_startup(app, started_at))
+    
     sys.exit(app.exec())
 
+
+def _report_startup(app: QApplication, started_at: Optional[float]):
+    """Escribe el tiempo hasta la ventana visible y cierra la aplicación"""
+    elapsed = time.perf_counter() - started_at if started_at is not None else None
+    heavy_modules = ['weasyprint', 'markdown2', 'pygments', 'pypdf']
+    print(json.dumps({
+        'window_shown_seconds': round(elapsed, 4) if elapsed is not None else None,
+        'loaded_at_startup': [name for name in heavy_modules if name in sys.modules],
+    }), file=sys.stderr, flush=True)
+    app.quit()
+
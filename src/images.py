@@ -0,0 +1,347 @@
+"""
+Carga de imágenes para WeasyPrint con una caché de imágenes reducidas
+
+Las capturas de pantalla de la documentación suelen tener mucha más
+resolución de la que cabe en el ancho de la página. El cargador las reduce
+una sola vez al ancho útil de la página a la resolución indicada y comparte
+el resultado entre todos los documentos del proceso, de modo que cada
+documento decodifica y embebe una imagen más pequeña.
+"""
+
+import os
+import re
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from io import BytesIO
+from typing import Optional
+from urllib.parse import unquote, urlsplit
+from urllib.request import url2pathname
+
+
+# Resolución (píxeles por pulgada) a la que se reducen las imágenes
+DEFAULT_IMAGE_DPI = 150
+
+# Bytes de imágenes reducidas que se conservan como máximo (LRU)
+DEFAULT_IMAGE_CACHE_BYTES = 64 * 1024 * 1024
+
+# Resolución de los píxeles CSS: por debajo de ella cambiaría la maquetación
+_CSS_DPI = 96
+
+# Imágenes de mapa de bits que se pueden reducir
+_RASTER_EXTENSIONS = frozenset({'.png', '.jpg', '.jpeg', '.webp', '.bmp', '.tif', '.tiff'})
+
+# Orientaciones EXIF que intercambian el ancho y el alto
+_ROTATED_ORIENTATIONS = frozenset({5, 6, 7, 8})
+
+# Marca para imágenes que no hace falta reducir (evita volver a abrirlas)
+_UNCHANGED = object()
+
+# Referencias a recursos en Markdown y HTML: imágenes en línea, definiciones
+# de referencias y atributos src
+_RESOURCE_RE = re.compile(
+    r'!\[[^\]]*\]\(\s*<?([^)\s>]+)'
+    r'|^ {0,3}\[[^\]]+\]:\s*<?([^\s>]+)'
+    r'|\bsrc\s*=\s*["\']([^"\']+)',
+    re.MULTILINE
+)
+
+
+def _downscale(path: str, max_width: int) -> Optional[tuple[bytes, str]]:
+    """
+    Reduce una imagen al ancho indicado
+
+    Args:
+        path: Ruta de la imagen
+        max_width: Ancho máximo en píxeles (tras aplicar la orientación EXIF)
+
+    Returns:
+        Tupla (bytes, tipo MIME), o None si la imagen ya es lo bastante
+        pequeña, está animada, no se puede abrir o es un JPEG que no ocupa
+        menos al reducirlo
+    """
+    from PIL import Image, ImageOps
+
+    try:
+        with Image.open(path) as image:
+            if getattr(image, 'n_frames', 1) > 1:
+                return None
+            rotated = image.getexif().get(0x0112, 1) in _ROTATED_ORIENTATIONS
+            width = image.height if rotated else image.width
+            if width <= max_width:
+                return None
+
+            image_format = image.format
+            # Antes de cargarla, para que los JPEG se decodifiquen ya reducidos
+            bounds = (image.width, max_width) if rotated else (max_width, image.height)
+            image.thumbnail(bounds, Image.Resampling.LANCZOS)
+            image = ImageOps.exif_transpose(image)
+
+            output = BytesIO()
+            if image_format == 'JPEG':
+                if image.mode not in ('RGB', 'L', 'CMYK'):
+                    image = image.convert('RGB')
+                image.save(output, 'JPEG', quality=90, optimize=True)
+                mime_type = 'image/jpeg'
+            else:
+                image.save(output, 'PNG')
+                mime_type = 'image/png'
+    except Exception:
+        # WeasyPrint cargará el original y mostrará su propio aviso si falla
+        return None
+
+    data = output.getvalue()
+    # WeasyPrint embebe los JPEG tal cual, pero el resto se recomprime por
+    # píxeles: en esos, menos píxeles siempre dan un PDF más pequeño
+    if mime_type == 'image/jpeg' and len(data) >= os.path.getsize(path):
+        return None
+    return data, mime_type
+
+
+def local_resources(content: str, base_dir: str) -> list[tuple[str, Optional[int], Optional[int]]]:
+    """
+    Lista los archivos locales que referencia un documento
+
+    Sirve para que la caché de PDFs detecte cambios en las imágenes: las
+    URLs con esquema (http:, data:...) se ignoran y las rutas relativas se
+    resuelven desde base_dir, igual que al renderizar.
+
+    Args:
+        content: Contenido Markdown o HTML
+        base_dir: Carpeta desde la que se resuelven las rutas relativas
+
+    Returns:
+        Lista ordenada de tuplas (ruta, fecha de modificación en ns, tamaño);
+        la fecha y el tamaño son None si el archivo no existe
+    """
+    resources = {}
+    for match in _RESOURCE_RE.finditer(content):
+        url = next(group for group in match.groups() if group is not None)
+        parts = urlsplit(url)
+        if parts.scheme == 'file':
+            path = url2pathname(parts.path)
+        elif parts.scheme and len(parts.scheme) > 1 or not parts.path:
+            # Recursos remotos, embebidos o anclas del propio documento
+            continue
+        else:
+            path = unquote(parts.path)
+        path = os.path.normpath(os.path.join(base_dir, path))
+        if path in resources:
+            continue
+        try:
+            stat = os.stat(path)
+            resources[path] = (path, stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            resources[path] = (path, None, None)
+    return sorted(resources.values())
+
+
+class ImageCache:
+    """Imágenes reducidas por (ruta, fecha de modificación, tamaño, ancho en píxeles)"""
+
+    def __init__(self, max_bytes: int = DEFAULT_IMAGE_CACHE_BYTES):
+        """
+        Inicializa la caché
+
+        Args:
+            max_bytes: Bytes de imágenes reducidas que se conservan como máximo
+        """
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.reduced = 0
+
+        self._images: OrderedDict[tuple, object] = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, path: str, max_width: int) -> Optional[tuple[bytes, str]]:
+        """
+        Obtiene una imagen reducida, reduciéndola solo la primera vez
+
+        Args:
+            path: Ruta de la imagen
+            max_width: Ancho máximo en píxeles
+
+        Returns:
+            Tupla (bytes, tipo MIME), o None si se debe usar el original
+        """
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+
+        key = (path, stat.st_mtime_ns, stat.st_size, max_width)
+        with self._lock:
+            entry = self._images.get(key)
+            if entry is not None:
+                self._images.move_to_end(key)
+                self.hits += 1
+                return None if entry is _UNCHANGED else entry
+            self.misses += 1
+
+        result = _downscale(path, max_width)
+        size = len(result[0]) if result is not None else 0
+        with self._lock:
+            if result is not None:
+                self.reduced += 1
+            # Descartar versiones anteriores de la misma imagen
+            for old_key in [k for k in self._images if k[0] == path and k[3] == max_width]:
+                self._forget(old_key)
+            if size <= self.max_bytes:
+                self._images[key] = result if result is not None else _UNCHANGED
+                self._bytes += size
+                while self._bytes > self.max_bytes:
+                    self._forget(next(iter(self._images)))
+        return result
+
+    def _forget(self, key: tuple) -> None:
+        """Elimina una entrada (con el cerrojo ya adquirido)"""
+        entry = self._images.pop(key)
+        if entry is not _UNCHANGED:
+            self._bytes -= len(entry[0])
+
+    def clear(self) -> None:
+        """Vacía la caché"""
+        with self._lock:
+            self._images.clear()
+            self._bytes = 0
+
+    def stats(self) -> dict:
+        """
+        Obtiene los contadores de la caché
+
+        Returns:
+            Diccionario con aciertos, fallos, tasa de aciertos, imágenes
+            en caché, bytes ocupados e imágenes reducidas
+        """
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / total if total else 0.0,
+                'images': len(self._images),
+                'bytes': self._bytes,
+                'reduced': self.reduced,
+            }
+
+
+# Caché compartida por todos los generadores del proceso
+_image_cache = ImageCache()
+
+
+def get_image_cache() -> ImageCache:
+    """Obtiene la caché de imágenes reducidas del proceso"""
+    return _image_cache
+
+
+class ImageFetcher:
+    """
+    Lógica común de los url_fetcher de WeasyPrint que sirven las imágenes
+    locales ya reducidas
+
+    El resto de recursos (y las imágenes que no hace falta reducir) se
+    cargan con el cargador por defecto de WeasyPrint. Las instancias se
+    crean con create_image_fetcher(), que elige la interfaz según la
+    versión de WeasyPrint instalada.
+    """
+
+    def __init__(self, dpi: int, content_width: float, cache: Optional[ImageCache] = None):
+        """
+        Inicializa el cargador
+
+        Args:
+            dpi: Resolución a la que se reducen las imágenes
+            content_width: Ancho útil de la página en puntos
+            cache: Caché de imágenes (por defecto, la del proceso)
+        """
+        # Nunca por debajo de los píxeles CSS, para no encoger las imágenes
+        self.max_width = round(content_width / 72 * max(dpi, _CSS_DPI))
+        self.cache = cache or _image_cache
+
+    def get_reduced(self, url: str) -> Optional[tuple[bytes, str]]:
+        """
+        Obtiene la versión reducida de una imagen local
+
+        Args:
+            url: URL del recurso
+
+        Returns:
+            Tupla (bytes, tipo MIME), o None si hay que cargar el original
+        """
+        if not url.startswith('file:'):
+            return None
+        path = url2pathname(urlsplit(url).path)
+        if os.path.splitext(path)[1].lower() not in _RASTER_EXTENSIONS:
+            return None
+        return self.cache.get(path, self.max_width)
+
+
+@lru_cache(maxsize=None)
+def _get_fetcher_class() -> type:
+    """
+    Crea (una sola vez) la clase de cargador para la WeasyPrint instalada
+
+    Desde WeasyPrint 68 los cargadores heredan de weasyprint.urls.URLFetcher
+    y devuelven URLFetcherResponse; las versiones anteriores esperan una
+    función que devuelve un diccionario.
+
+    Returns:
+        Clase que hereda de ImageFetcher
+    """
+    try:
+        from weasyprint.urls import URLFetcher, URLFetcherResponse
+    except ImportError:
+        URLFetcher = None
+
+    if URLFetcher is None:
+        class LegacyImageFetcher(ImageFetcher):
+            """Cargador con la interfaz de función de WeasyPrint < 68"""
+
+            def __call__(self, url: str, *args, **kwargs) -> dict:
+                result = self.get_reduced(url)
+                if result is not None:
+                    data, mime_type = result
+                    return {'string': data, 'mime_type': mime_type, 'redirected_url': url}
+
+                from weasyprint import default_url_fetcher
+
+                return default_url_fetcher(url, *args, **kwargs)
+
+        return LegacyImageFetcher
+
+    class URLImageFetcher(ImageFetcher, URLFetcher):
+        """Cargador con la interfaz URLFetcher de WeasyPrint >= 68"""
+
+        def __init__(self, dpi: int, content_width: float, cache: Optional[ImageCache] = None):
+            URLFetcher.__init__(self)
+            ImageFetcher.__init__(self, dpi, content_width, cache)
+
+        def fetch(self, url: str, headers: Optional[dict] = None):
+            result = self.get_reduced(url)
+            if result is not None:
+                data, mime_type = result
+                return URLFetcherResponse(url, data, {'Content-Type': mime_type})
+            return super().fetch(url, headers)
+
+    return URLImageFetcher
+
+
+def create_image_fetcher(
+    dpi: int,
+    content_width: float,
+    cache: Optional[ImageCache] = None
+) -> ImageFetcher:
+    """
+    Crea el url_fetcher de imágenes reducidas para la WeasyPrint instalada
+
+    Args:
+        dpi: Resolución a la que se reducen las imágenes
+        content_width: Ancho útil de la página en puntos
+        cache: Caché de imágenes (por defecto, la del proceso)
+
+    Returns:
+        Cargador que se pasa como url_fetcher a weasyprint.HTML
+    """
+    return _get_fetcher_class()(dpi, content_width, cache)
@@ -0,0 +1,139 @@
+"""
+Medición por etapas y perfilado de las conversiones
+"""
+
+import cProfile
+import os
+import re
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Callable, Iterator, Optional
+
+
+# Etapas del pipeline, en orden
+STAGES = ('read', 'detect', 'convert', 'template', 'render')
+
+
+@dataclass
+class ConversionStats:
+    """Métricas de la conversión de un archivo"""
+
+    input_file: str
+    kind: Optional[str] = None
+    stages: dict[str, float] = field(default_factory=dict)
+    input_bytes: int = 0
+    html_bytes: int = 0
+    output_bytes: int = 0
+    pages: int = 0
+    # Bytes que ahorran las opciones de salida (None si no se miden)
+    saved_bytes: Optional[int] = None
+    cached: bool = False
+    error: Optional[str] = None
+
+    @property
+    def elapsed(self) -> float:
+        """Tiempo total de las etapas medidas"""
+        return sum(self.stages.values())
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """
+        Mide el tiempo de una etapa (acumulándolo si se repite)
+
+        Args:
+            name: Nombre de la etapa
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stages[name] = self.stages.get(name, 0.0) + time.perf_counter() - start
+
+    def to_dict(self) -> dict:
+        """Convierte las métricas en un diccionario serializable a JSON"""
+        data = asdict(self)
+        data['stages'] = {name: round(seconds, 6) for name, seconds in self.stages.items()}
+        return data
+
+
+# Firma de las funciones que reciben las métricas de cada conversión
+StatsCallback = Callable[[ConversionStats], None]
+
+
+class SlowestFilesProfiler:
+    """Perfila cada conversión con cProfile y conserva los N archivos más lentos"""
+
+    def __init__(self, directory: str, top_n: int = 5):
+        """
+        Inicializa el perfilador
+
+        Args:
+            directory: Directorio donde guardar los archivos .prof
+            top_n: Número de archivos más lentos a conservar
+        """
+        self.directory = Path(directory)
+        self.top_n = top_n
+        # (segundos, ruta del .prof) de los perfiles conservados en este proceso
+        self._kept: list[tuple[float, Path]] = []
+
+    @contextmanager
+    def profile(self, input_file: str) -> Iterator[None]:
+        """
+        Perfila la conversión de un archivo
+
+        Args:
+            input_file: Ruta del archivo que se convierte
+        """
+        profiler = cProfile.Profile()
+        start = time.perf_counter()
+        profiler.enable()
+        try:
+            yield
+        finally:
+            profiler.disable()
+            self._record(input_file, time.perf_counter() - start, profiler)
+
+    def _record(self, input_file: str, elapsed: float, profiler: cProfile.Profile) -> None:
+        """Guarda el perfil si está entre los más lentos vistos en este proceso"""
+        if len(self._kept) >= self.top_n and elapsed <= self._kept[0][0]:
+            return
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        # El tiempo va en el nombre para poder elegir entre varios procesos
+        stem = re.sub(r'[^\w.-]', '_', Path(input_file).name)
+        path = self.directory / f"{int(elapsed * 1e6):012d}-{os.getpid()}-{stem}.prof"
+        profiler.dump_stats(str(path))
+
+        self._kept.append((elapsed, path))
+        self._kept.sort()
+        while len(self._kept) > self.top_n:
+            _, evicted = self._kept.pop(0)
+            evicted.unlink(missing_ok=True)
+
+    def finalize(self) -> list[str]:
+        """
+        Deja en el directorio solo los N perfiles más lentos de todos los procesos
+
+        Returns:
+            Rutas de los perfiles conservados, del más lento al más rápido
+        """
+        return prune_profiles(self.directory, self.top_n)
+
+
+def prune_profiles(directory: Path, top_n: int) -> list[str]:
+    """
+    Elimina los perfiles que no están entre los N más lentos
+
+    Args:
+        directory: Directorio de los archivos .prof
+        top_n: Número de perfiles a conservar
+
+    Returns:
+        Rutas de los perfiles conservados, del más lento al más rápido
+    """
+    profiles = sorted(Path(directory).glob('*.prof'), reverse=True)
+    for path in profiles[top_n:]:
+        path.unlink(missing_ok=True)
+    return [str(path) for path in profiles[:top_n]]
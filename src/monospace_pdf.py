@@ -0,0 +1,534 @@
+"""
+Renderizado directo a PDF de texto monoespaciado, sin maquetación HTML
+"""
+
+import re
+from array import array
+from pathlib import Path
+from typing import BinaryIO, Iterable, Iterator, Optional, Sequence, Union
+
+
+# Renderizadores disponibles para texto y código
+TEXT_RENDERERS = ('html', 'direct')
+DEFAULT_TEXT_RENDERER = 'html'
+
+# Tamaños de página de CSS en puntos (ancho, alto)
+_PAGE_SIZES = {
+    'a3': (841.89, 1190.55),
+    'a4': (595.28, 841.89),
+    'a5': (419.53, 595.28),
+    'letter': (612.0, 792.0),
+    'legal': (612.0, 1008.0),
+}
+
+# Puntos por unidad de longitud de CSS
+_UNITS = {'pt': 1.0, 'px': 0.75, 'in': 72.0, 'cm': 72 / 2.54, 'mm': 72 / 25.4, 'pc': 12.0}
+
+_PAGE_RULE_RE = re.compile(r'@page\s*\{([^}]*)\}', re.IGNORECASE)
+_LENGTH_RE = re.compile(r'^(-?\d*\.?\d+)(pt|px|in|cm|mm|pc)?$', re.IGNORECASE)
+
+# Las fuentes estándar de PDF no se incrustan; Courier avanza 0,6 em por carácter
+_CHAR_WIDTH = 0.6
+_FONTS = {
+    'F1': 'Courier',
+    'F2': 'Courier-Bold',
+    'F3': 'Courier-Oblique',
+    'F4': 'Courier-BoldOblique',
+    'F5': 'Helvetica',
+}
+
+# Colores fijos de la plantilla (números de línea, cabecera y separadores)
+_LINE_NUMBER_COLOR = (0.6, 0.6, 0.6)
+_HEADER_COLOR = (0.5, 0.55, 0.553)
+_RULE_COLOR = (0.867, 0.867, 0.867)
+
+# Fondo de los bloques pre de la plantilla, para el texto plano
+TEXT_BACKGROUND = '#f8f8f8'
+
+_HEADER_FONT_SIZE = 8.0
+_HEADER_HEIGHT = 20.0
+_GUTTER_PADDING = 8.0
+_TAB_SIZE = 8
+
+
+def _parse_length(value: str) -> Optional[float]:
+    """Convierte una longitud de CSS a puntos (None si no se reconoce)"""
+    match = _LENGTH_RE.match(value.strip())
+    if match is None:
+        return None
+    return float(match.group(1)) * _UNITS[(match.group(2) or 'px').lower()]
+
+
+def parse_page_setup(css_text: str) -> tuple[tuple[float, float], tuple[float, float, float, float]]:
+    """
+    Obtiene el tamaño y los márgenes de página de la regla @page de un CSS
+
+    Args:
+        css_text: Contenido de la hoja de estilo
+
+    Returns:
+        Tupla ((ancho, alto), (superior, derecho, inferior, izquierdo)) en
+        puntos; A4 con márgenes de 2 cm si no hay regla @page reconocible
+    """
+    size = _PAGE_SIZES['a4']
+    margins = (2 * _UNITS['cm'],) * 4
+
+    for rule in _PAGE_RULE_RE.findall(css_text):
+        for declaration in rule.split(';'):
+            name, _, value = declaration.partition(':')
+            name, values = name.strip().lower(), value.split()
+            if name == 'size' and values:
+                words = [v.lower() for v in values]
+                named = next((_PAGE_SIZES[w] for w in words if w in _PAGE_SIZES), None)
+                lengths = [_parse_length(v) for v in values]
+                if named is not None:
+                    size = named
+                elif len(lengths) == 2 and None not in lengths:
+                    size = (lengths[0], lengths[1])
+                if 'landscape' in words:
+                    size = (max(size), min(size))
+                elif 'portrait' in words:
+                    size = (min(size), max(size))
+            elif name == 'margin' and values:
+                lengths = [_parse_length(v) for v in values]
+                if None not in lengths and len(lengths) <= 4:
+                    # Mismo orden abreviado que CSS: 1, 2, 3 o 4 valores
+                    top, right, bottom, left = (lengths * 4)[:4]
+                    if len(lengths) == 2:
+                        bottom, left = lengths
+                    elif len(lengths) == 3:
+                        left = lengths[1]
+                    margins = (top, right, bottom, left)
+
+    return size, margins
+
+
+def _hex_to_rgb(color: Optional[str]) -> Optional[tuple[float, float, float]]:
+    """Convierte un color '#rrggbb' o 'rrggbb' a componentes entre 0 y 1"""
+    if not color:
+        return None
+    color = color.lstrip('#')
+    if len(color) == 3:
+        color = ''.join(c * 2 for c in color)
+    try:
+        return tuple(int(color[i:i + 2], 16) / 255 for i in (0, 2, 4))
+    except ValueError:
+        return None
+
+
+def _encode(text: str) -> bytes:
+    """Cadena PDF literal en WinAnsiEncoding, con los caracteres especiales escapados"""
+    data = text.encode('cp1252', 'replace')
+    return b'(' + data.replace(b'\\', b'\\\\').replace(b'(', b'\\(').replace(b')', b'\\)') + b')'
+
+
+def _number(value: float) -> bytes:
+    """Número en formato de operador PDF"""
+    return f'{value:.2f}'.rstrip('0').rstrip('.').encode('ascii')
+
+
+class _PDFWriter:
+    """
+    Escribe objetos PDF en un archivo a medida que se generan
+
+    pydyf.PDF guarda todos los objetos hasta write(); aquí cada objeto se
+    escribe en cuanto se crea y solo se conserva su posición para la tabla
+    de referencias cruzadas.
+    """
+
+    def __init__(self, output: BinaryIO):
+        """
+        Inicializa el escritor y escribe la cabecera del PDF
+
+        Args:
+            output: Archivo binario de salida (no hace falta que admita seek)
+        """
+        self.output = output
+        self.offsets = [0]
+        self.position = 0
+        self._emit(b'%PDF-1.7\n%\xf0\x9f\x96\xa4\n')
+
+    def _emit(self, data: bytes) -> None:
+        """Escribe bytes llevando la cuenta de la posición"""
+        self.output.write(data)
+        self.position += len(data)
+
+    def reserve(self) -> int:
+        """Reserva el número de un objeto que se escribirá más adelante"""
+        self.offsets.append(None)
+        return len(self.offsets) - 1
+
+    def write(self, pdf_object, number: Optional[int] = None) -> bytes:
+        """Escribe un objeto de pydyf (con un número reservado o uno nuevo) y devuelve su referencia"""
+        if number is None:
+            number = self.reserve()
+        pdf_object.number = number
+        self.offsets[number] = self.position
+        self._emit(pdf_object.indirect + b'\n')
+        return pdf_object.reference
+
+    def close(self, catalog: bytes, document_info: bytes) -> None:
+        """Escribe la tabla de referencias cruzadas y el trailer"""
+        xref = self.position
+        entries = [b'xref\n0 %d\n0000000000 65535 f \n' % len(self.offsets)]
+        entries.extend(b'%010d 00000 n \n' % offset for offset in self.offsets[1:])
+        entries.append(b'trailer\n<< /Size %d /Root %s /Info %s >>\nstartxref\n%d\n%%%%EOF\n' % (
+            len(self.offsets), catalog, document_info, xref
+        ))
+        self._emit(b''.join(entries))
+
+
+class MonospacePDFRenderer:
+    """
+    Escribe páginas PDF directamente a partir de líneas de texto o tokens
+
+    Cada línea ocupa una altura fija y se parte cuando no cabe en el ancho
+    de la página, así que no hace falta maquetar HTML: el coste es lineal
+    en el número de caracteres. Usa Courier (fuente estándar de PDF, sin
+    incrustar), por lo que solo admite caracteres de WinAnsiEncoding.
+    """
+
+    def __init__(
+        self,
+        style: str = 'default',
+        css_path: Optional[Union[str, Path]] = None,
+        font_size: float = 9.0,
+        line_height: float = 1.4
+    ):
+        """
+        Inicializa el renderizador
+
+        Args:
+            style: Estilo de Pygments del que se toman los colores
+            css_path: Hoja de estilo de la que se leen tamaño y márgenes de
+                página (@page); si no se indica, A4 con márgenes de 2 cm
+            font_size: Tamaño de letra en puntos (el de los bloques pre)
+            line_height: Interlineado relativo al tamaño de letra
+        """
+        from pygments.styles import get_style_by_name
+
+        self.style = get_style_by_name(style)
+        self.font_size = font_size
+        self.leading = font_size * line_height
+
+        css_text = ''
+        if css_path is not None:
+            try:
+                css_text = Path(css_path).read_text(encoding='utf-8')
+            except OSError:
+                pass
+        (self.page_width, self.page_height), self.margins = parse_page_setup(css_text)
+
+        # Estilo de cada tipo de token: (fuente, color), resuelto una sola vez
+        self._token_styles: dict = {}
+
+    @staticmethod
+    def can_render(text: str) -> bool:
+        """
+        Indica si un texto se puede escribir sin perder caracteres
+
+        Args:
+            text: Contenido a renderizar
+
+        Returns:
+            True si todos los caracteres existen en WinAnsiEncoding
+        """
+        if text.isascii():
+            return True
+        try:
+            text.encode('cp1252')
+            return True
+        except UnicodeEncodeError:
+            return False
+
+    @staticmethod
+    def measure(chunks: Iterable[str]) -> Optional[array]:
+        """
+        Mide el ancho de cada línea sin guardar el texto
+
+        Con estos anchos, render() conoce de antemano el número de líneas y
+        de páginas y puede escribir cada página en cuanto la completa.
+
+        Args:
+            chunks: Bloques de líneas completas (o el contenido entero)
+
+        Returns:
+            Ancho de cada línea con los tabuladores expandidos, o None si
+            hay caracteres que no existen en WinAnsiEncoding
+        """
+        widths = array('L')
+        for chunk in chunks:
+            if not MonospacePDFRenderer.can_render(chunk):
+                return None
+            if chunk.endswith('\n'):
+                chunk = chunk[:-1]
+            for line in chunk.split('\n'):
+                widths.append(len(line.expandtabs(_TAB_SIZE)) if '\t' in line else len(line))
+        return widths
+
+    def _get_token_style(self, token_type) -> tuple[bytes, Optional[tuple]]:
+        """Fuente y color de un tipo de token según el estilo de Pygments"""
+        token_style = self._token_styles.get(token_type)
+        if token_style is None:
+            definition = self.style.style_for_token(token_type)
+            font = 'F1'
+            if definition['bold'] and definition['italic']:
+                font = 'F4'
+            elif definition['bold']:
+                font = 'F2'
+            elif definition['italic']:
+                font = 'F3'
+            token_style = (font.encode('ascii'), _hex_to_rgb(definition['color']))
+            self._token_styles[token_type] = token_style
+        return token_style
+
+    @staticmethod
+    def split_lines(tokens: Iterable[tuple]) -> Iterator[list[tuple]]:
+        """
+        Agrupa un flujo de tokens (tipo, texto) en líneas
+
+        Args:
+            tokens: Tokens de Pygments o pares (Token.Text, texto)
+
+        Yields:
+            Lista de tokens de cada línea, sin el salto de línea
+        """
+        line = []
+        for token_type, value in tokens:
+            if '\n' not in value:
+                if value:
+                    line.append((token_type, value))
+                continue
+            pieces = value.split('\n')
+            for piece in pieces[:-1]:
+                if piece:
+                    line.append((token_type, piece))
+                yield line
+                line = []
+            if pieces[-1]:
+                line.append((token_type, pieces[-1]))
+        if line:
+            yield line
+
+    @staticmethod
+    def text_lines(text: str) -> Iterator[list[tuple]]:
+        """
+        Convierte texto plano en líneas de un único token
+
+        Args:
+            text: Contenido del archivo
+
+        Yields:
+            Lista de tokens de cada línea
+        """
+        from pygments.token import Token
+
+        if text.endswith('\n'):
+            text = text[:-1]
+        for line in text.split('\n'):
+            yield [(Token.Text, line)] if line else []
+
+    def _wrap(self, line: list[tuple], columns: int) -> list[list[tuple]]:
+        """Expande tabuladores y parte una línea en filas de como mucho `columns` caracteres"""
+        rows = [[]]
+        used = 0
+        position = 0
+        for token_type, value in line:
+            if '\t' in value:
+                expanded = []
+                column = position
+                for char in value:
+                    if char == '\t':
+                        char = ' ' * (_TAB_SIZE - column % _TAB_SIZE)
+                    expanded.append(char)
+                    column += len(char)
+                value = ''.join(expanded)
+            position += len(value)
+            start = 0
+            while start < len(value):
+                if used == columns:
+                    rows.append([])
+                    used = 0
+                piece = value[start:start + columns - used]
+                rows[-1].append((token_type, piece))
+                used += len(piece)
+                start += len(piece)
+        return rows
+
+    def render(
+        self,
+        lines: Iterable[list[tuple]],
+        output: Union[str, BinaryIO],
+        title: str = '',
+        info: str = '',
+        line_numbers: bool = False,
+        background: Optional[str] = None,
+        widths: Optional[Sequence[int]] = None
+    ) -> int:
+        """
+        Escribe un PDF con las líneas dadas
+
+        Cada página se comprime y se escribe en cuanto se completa, así que
+        con `widths` las líneas se consumen de una en una y en memoria solo
+        hay una página.
+
+        Args:
+            lines: Líneas como listas de tokens (tipo, texto)
+            output: Ruta o archivo binario del PDF
+            title: Título del documento (cabecera de cada página)
+            info: Descripción que acompaña al número de página
+            line_numbers: Si numerar las líneas
+            background: Color de fondo del área de texto (por defecto, el del
+                estilo de Pygments)
+            widths: Ancho de cada línea, de measure(); si no se indica, las
+                líneas se leen todas antes de empezar
+
+        Returns:
+            Número de páginas escritas
+        """
+        if isinstance(output, (str, Path)):
+            with open(output, 'wb') as f:
+                return self.render(lines, f, title, info, line_numbers, background, widths)
+
+        import pydyf
+
+        top, right, bottom, left = self.margins
+        char_width = self.font_size * _CHAR_WIDTH
+        text_top = self.page_height - top - _HEADER_HEIGHT
+        rows_per_page = max(1, int((text_top - bottom) // self.leading))
+
+        if widths is None:
+            lines = list(lines)
+            widths = [
+                len(''.join(value for _, value in line).expandtabs(_TAB_SIZE))
+                for line in lines
+            ]
+        digits = len(str(len(widths))) if line_numbers else 0
+        gutter = digits * char_width + _GUTTER_PADDING * 2 if line_numbers else 0.0
+        columns = max(1, int((self.page_width - left - right - gutter) // char_width))
+        rows = sum(max(1, -(-width // columns)) for width in widths)
+        total = max(1, -(-rows // rows_per_page))
+
+        fill = _hex_to_rgb(background or self.style.background_color)
+        if fill == (1.0, 1.0, 1.0):
+            fill = None
+        from pygments.token import Token
+
+        default_color = self._get_token_style(Token.Text)[1] or (0.0, 0.0, 0.0)
+
+        writer = _PDFWriter(output)
+        # El árbol de páginas se escribe al final, cuando se conocen todas
+        pages_number = writer.reserve()
+        fonts = pydyf.Dictionary()
+        for name, base_font in _FONTS.items():
+            fonts[name] = writer.write(pydyf.Dictionary({
+                'Type': '/Font',
+                'Subtype': '/Type1',
+                'BaseFont': f'/{base_font}',
+                'Encoding': '/WinAnsiEncoding',
+            }))
+        resources = writer.write(pydyf.Dictionary({'Font': fonts}))
+        kids = []
+
+        def write_page(ops: list[bytes]) -> None:
+            page_number = len(kids) + 1
+            ops.extend(self._header(title, f"{info} · {page_number}/{total}" if info else f"{page_number}/{total}"))
+            stream = writer.write(pydyf.Stream(ops, compress=True))
+            kids.append(writer.write(pydyf.Dictionary({
+                'Type': '/Page',
+                'Parent': f'{pages_number} 0 R'.encode('ascii'),
+                'MediaBox': pydyf.Array([0, 0, self.page_width, self.page_height]),
+                'Contents': stream,
+                'Resources': resources,
+            })))
+
+        font_size = _number(self.font_size)
+        ops: list[bytes] = []
+        row = rows_per_page
+
+        for number, line in enumerate(lines, start=1):
+            for index, segments in enumerate(self._wrap(line, columns)):
+                if row == rows_per_page:
+                    if ops:
+                        ops.append(b'ET')
+                        write_page(ops)
+                    ops = self._begin_page(fill, gutter, text_top, rows_per_page)
+                    row = 0
+                    current = None
+
+                y = _number(text_top - self.leading * (row + 1) + (self.leading - self.font_size) / 2)
+                if line_numbers and index == 0:
+                    ops.append(b'/F1 ' + font_size + b' Tf %s %s %s rg' % tuple(map(_number, _LINE_NUMBER_COLOR)))
+                    ops.append(b'1 0 0 1 ' + _number(left + _GUTTER_PADDING) + b' ' + y + b' Tm')
+                    ops.append(_encode(str(number).rjust(digits)) + b' Tj')
+                    current = None
+                ops.append(b'1 0 0 1 ' + _number(left + gutter) + b' ' + y + b' Tm')
+
+                for token_type, value in segments:
+                    font, color = self._get_token_style(token_type)
+                    state = (font, color or default_color)
+                    if state != current:
+                        ops.append(b'/' + font + b' ' + font_size + b' Tf %s %s %s rg' % tuple(map(_number, state[1])))
+                        current = state
+                    ops.append(_encode(value) + b' Tj')
+                row += 1
+
+        if ops:
+            ops.append(b'ET')
+        else:
+            ops = self._begin_page(fill, gutter, text_top, rows_per_page) + [b'ET']
+        write_page(ops)
+
+        writer.write(pydyf.Dictionary({
+            'Type': '/Pages',
+            'Kids': pydyf.Array(kids),
+            'Count': len(kids),
+        }), pages_number)
+        document_info = pydyf.Dictionary({'Producer': pydyf.String('Padlef')})
+        if title:
+            document_info['Title'] = pydyf.String(title)
+        writer.close(
+            writer.write(pydyf.Dictionary({'Type': '/Catalog', 'Pages': f'{pages_number} 0 R'.encode('ascii')})),
+            writer.write(document_info)
+        )
+        return len(kids)
+
+    def _begin_page(
+        self,
+        fill: Optional[tuple],
+        gutter: float,
+        text_top: float,
+        rows_per_page: int
+    ) -> list[bytes]:
+        """Operadores de inicio de página: fondo, separador de números y BT"""
+        top, right, bottom, left = self.margins
+        height = self.leading * rows_per_page
+        ops = []
+        if fill is not None:
+            ops.append(b'%s %s %s rg' % tuple(map(_number, fill)))
+            ops.append(b'%s %s %s %s re f' % tuple(map(_number, (
+                left, text_top - height, self.page_width - left - right, height
+            ))))
+        if gutter:
+            x = _number(left + gutter - _GUTTER_PADDING / 2)
+            ops.append(b'%s %s %s RG 0.5 w' % tuple(map(_number, _RULE_COLOR)))
+            ops.append(x + b' ' + _number(text_top) + b' m ' + x + b' ' + _number(text_top - height) + b' l S')
+        ops.append(b'BT')
+        return ops
+
+    def _header(self, title: str, right_text: str) -> list[bytes]:
+        """Operadores de la cabecera: título a la izquierda, página a la derecha y una línea"""
+        top, right, bottom, left = self.margins
+        baseline = _number(self.page_height - top - _HEADER_FONT_SIZE)
+        rule_y = _number(self.page_height - top - _HEADER_HEIGHT + 4)
+        size = _number(_HEADER_FONT_SIZE)
+        # Helvetica no es monoespaciada: se alinea a la derecha con un ancho medio aproximado
+        right_x = self.page_width - right - len(right_text) * _HEADER_FONT_SIZE * 0.5
+        return [
+            b'BT /F5 ' + size + b' Tf %s %s %s rg' % tuple(map(_number, _HEADER_COLOR)),
+            b'1 0 0 1 ' + _number(left) + b' ' + baseline + b' Tm ' + _encode(title) + b' Tj',
+            b'1 0 0 1 ' + _number(right_x) + b' ' + baseline + b' Tm ' + _encode(right_text) + b' Tj',
+            b'ET',
+            b'%s %s %s RG 0.5 w' % tuple(map(_number, _RULE_COLOR)),
+            _number(left) + b' ' + rule_y + b' m ' + _number(self.page_width - right) + b' ' + rule_y + b' l S',
+        ]
@@ -2,35 +2,288 @@
 Generador de archivos PDF a partir de HTML
 """
 
-from weasyprint import HTML, CSS
+import html
+import itertools
+import os
+import re
+import sys
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO
 from pathlib import Path
-from typing import Optional
+from typing import TYPE_CHECKING, BinaryIO, Callable, Optional, Union
 
-from .converters import MarkdownConverter, CodeConverter, TextConverter
+from .batch import BatchConverter, _init_worker, _render_in_worker, default_worker_count, get_output_path
+from .cache import OutputCache, hash_file
+from .converters import get_converter_kind, get_language, get_spec, supported_extensions
+from .converters.highlight_cache import DEFAULT_LINE_NUMBER_MODE, LINE_NUMBER_MODES
+from .converters.markdown_backends import DEFAULT_BACKEND
+from .images import DEFAULT_IMAGE_DPI, ImageFetcher, create_image_fetcher, local_resources
+from .instrumentation import ConversionStats, SlowestFilesProfiler, StatsCallback
+from .monospace_pdf import DEFAULT_TEXT_RENDERER, TEXT_BACKGROUND, TEXT_RENDERERS, parse_page_setup
+from .pdf_merge import merge_pdfs
+from .styles import get_font_config, get_stylesheets, warm_up_fonts
 from .utils import (
-    is_markdown_file, 
-    is_text_file, 
-    is_code_file,
+    decode_content,
+    iter_file_chunks,
+    read_file_content,
     ensure_directory_exists
 )
 
+if TYPE_CHECKING:
+    from .monospace_pdf import MonospacePDFRenderer
+
+
+# Tamaño a partir del cual los archivos de código y texto se renderizan por bloques
+DEFAULT_STREAM_THRESHOLD = 8 * 1024 * 1024
+
+# Bytes a partir de los cuales un documento se parte y se renderiza en paralelo
+DEFAULT_PARALLEL_THRESHOLD = 128 * 1024
+
+# Enlaces internos y notas al pie de Markdown: WeasyPrint descarta los que
+# apuntan a otra parte, así que esos documentos no se parten
+_INTERNAL_LINK_RE = re.compile(
+    r'\]\(\s*<?#|href\s*=\s*["\']#|\[\^|^ {0,3}\[[^\]]+\]:\s*<?#',
+    re.MULTILINE
+)
+
+# Marca del código resaltado por Pygments (código y bloques de Markdown):
+# solo el HTML que la contiene necesita el CSS de Pygments
+_HIGHLIGHT_MARKER = 'class="highlight'
+
 
 class PDFGenerator:
     """Genera archivos PDF a partir de diferentes tipos de archivos"""
     
-    def __init__(self, style: str = 'default'):
+    def __init__(
+        self,
+        style: str = 'default',
+        cache: Optional[OutputCache] = None,
+        stream_threshold: Optional[int] = DEFAULT_STREAM_THRESHOLD,
+        chunk_lines: int = 2000,
+        on_stats: Optional[StatsCallback] = None,
+        profiler: Optional[SlowestFilesProfiler] = None,
+        markdown_backend: str = DEFAULT_BACKEND,
+        line_number_mode: str = DEFAULT_LINE_NUMBER_MODE,
+        text_renderer: str = DEFAULT_TEXT_RENDERER,
+        image_dpi: Optional[int] = DEFAULT_IMAGE_DPI,
+        optimize_images: bool = False,
+        jpeg_quality: Optional[int] = None,
+        full_fonts: bool = False,
+        compress: bool = True,
+        report_savings: bool = False,
+        render_workers: Optional[int] = 1,
+        parallel_threshold: Optional[int] = DEFAULT_PARALLEL_THRESHOLD
+    ):
         """
         Inicializa el generador de PDF
         
         Args:
             style: Estilo de Pygments para resaltado de código
+            cache: Caché de PDFs generados para saltar archivos sin cambios (opcional)
+            stream_threshold: Tamaño en bytes a partir del cual el código y el
+                texto se renderizan por bloques (None para desactivarlo)
+            chunk_lines: Líneas por bloque en el renderizado por bloques
+            on_stats: Función que recibe las métricas por etapa de cada
+                conversión (opcional)
+            profiler: Perfilador de los archivos más lentos (opcional)
+            markdown_backend: Backend de Markdown ('markdown2' o 'markdown-it')
+            line_number_mode: Numeración de líneas del código: 'inline'
+                (rápida de paginar en archivos largos) o 'table'
+            text_renderer: Renderizado de texto y código: 'html' (WeasyPrint)
+                o 'direct' (páginas PDF monoespaciadas sin maquetación HTML)
+            image_dpi: Resolución a la que se reducen las imágenes locales
+                más anchas que la página (None para embeberlas sin reducir)
+            optimize_images: Recomprimir las imágenes al escribir el PDF y
+                limitarlas a image_dpi según el tamaño con que se muestran
+            jpeg_quality: Calidad (0-95) con la que se recomprimen los JPEG
+                (por defecto, se embeben tal cual)
+            full_fonts: Embeber las fuentes completas en lugar de solo los
+                glifos usados (PDFs editables, pero más grandes)
+            compress: Comprimir los flujos del PDF (False solo para depurar)
+            report_savings: Medir en cada documento los bytes que ahorran las
+                opciones de salida frente a las de WeasyPrint por defecto
+                (maqueta cada documento dos veces)
+            render_workers: Procesos que renderizan en paralelo las partes de
+                un documento grande (1, por defecto, lo desactiva; 0 o None,
+                uno por núcleo)
+            parallel_threshold: Bytes a partir de los cuales un documento
+                se parte y se renderiza en paralelo (None para desactivarlo)
         """
-        self.markdown_converter = MarkdownConverter()
-        self.code_converter = CodeConverter(style=style)
-        self.text_converter = TextConverter()
+        if text_renderer not in TEXT_RENDERERS:
+            raise ValueError(f"Renderizador de texto no soportado: {text_renderer}")
+        if line_number_mode not in LINE_NUMBER_MODES:
+            raise ValueError(f"Modo de numeración de líneas no soportado: {line_number_mode}")
+        self.style = style
+        self.markdown_backend = markdown_backend
+        self.line_number_mode = line_number_mode
+        self.text_renderer = text_renderer
+        self.image_dpi = image_dpi
+        if jpeg_quality is not None and not 0 <= jpeg_quality <= 95:
+            raise ValueError(f"Calidad JPEG fuera de rango (0-95): {jpeg_quality}")
+        self.optimize_images = optimize_images
+        self.jpeg_quality = jpeg_quality
+        self.full_fonts = full_fonts
+        self.compress = compress
+        self.report_savings = report_savings
+        self.pdf_options = self._get_pdf_options()
+        self._url_fetcher: Optional[ImageFetcher] = None
+        self._monospace_renderer: Optional['MonospacePDFRenderer'] = None
+        self.render_workers = max(1, render_workers or default_worker_count())
+        self.parallel_threshold = parallel_threshold
+        self._render_executor: Optional[ProcessPoolExecutor] = None
+        self.cache = cache
+        self.stream_threshold = stream_threshold
+        self.chunk_lines = chunk_lines
+        self.on_stats = on_stats
+        self.profiler = profiler
+        # Conversores por tipo, creados con su fábrica del registro al usarse
+        self._converters: dict = {}
         
         # Obtener ruta del archivo CSS
         self.css_path = Path(__file__).parent.parent / 'templates' / 'pdf_styles.css'
+        self._css_hash: Optional[tuple] = None
+    
+    def get_converter(self, kind: str):
+        """
+        Obtiene el conversor de un tipo, creándolo la primera vez
+        
+        Args:
+            kind: Tipo de conversor registrado
+            
+        Returns:
+            Conversor del tipo
+            
+        Raises:
+            ValueError: Si el tipo no está registrado
+        """
+        converter = self._converters.get(kind)
+        if converter is None:
+            converter = get_spec(kind).factory(self)
+            self._converters[kind] = converter
+        return converter
+    
+    @property
+    def code_converter(self):
+        """Conversor de código fuente"""
+        return self.get_converter('code')
+    
+    @property
+    def markdown_converter(self):
+        """Conversor de Markdown"""
+        return self.get_converter('markdown')
+    
+    @property
+    def text_converter(self):
+        """Conversor de texto plano"""
+        return self.get_converter('text')
+    
+    def _get_converter_kind(
+        self,
+        input_file: str,
+        content: Union[str, bytes, None] = None
+    ) -> str:
+        """
+        Determina qué conversor corresponde a un archivo
+        
+        Args:
+            input_file: Ruta (o nombre) del archivo de entrada
+            content: Contenido, si ya está en memoria; si no, los archivos
+                sin extensión se leen para buscar un shebang
+            
+        Returns:
+            Tipo registrado ('markdown', 'code', 'text'...)
+        """
+        if content is None and not Path(input_file).suffix:
+            try:
+                with open(input_file, 'rb') as f:
+                    content = f.read(2)
+            except OSError:
+                pass
+        return get_converter_kind(input_file, content)
+    
+    def _get_css_hash(self) -> str:
+        """
+        Obtiene el hash del archivo CSS (recalculado solo si cambia su mtime)
+        
+        Returns:
+            Hash en hexadecimal, o cadena vacía si no existe el archivo
+        """
+        try:
+            mtime = self.css_path.stat().st_mtime_ns
+        except OSError:
+            return ''
+        
+        if self._css_hash is None or self._css_hash[0] != mtime:
+            self._css_hash = (mtime, hash_file(str(self.css_path)))
+        return self._css_hash[1]
+    
+    def _get_cache_key(
+        self,
+        input_file: str,
+        kind: str,
+        line_numbers: bool,
+        render_parts: int = 1
+    ) -> str:
+        """
+        Calcula la clave de caché de una conversión
+        
+        Args:
+            input_file: Ruta del archivo de entrada
+            kind: Tipo de conversor
+            line_numbers: Si mostrar números de línea en código
+            render_parts: Partes en que se renderiza el archivo
+            
+        Returns:
+            Clave de caché
+        """
+        base_dir = str(Path(input_file).resolve().parent)
+        resources = None
+        if kind == 'markdown':
+            # Las imágenes locales se embeben en el PDF: cambiarlas lo invalida
+            content = read_file_content(input_file)
+            if content is not None:
+                resources = local_resources(content, base_dir)
+        
+        return self.cache.make_key(
+            input_file,
+            # El nombre aparece en el PDF (título, cabeceras)
+            name=Path(input_file).name,
+            # Las rutas relativas se resuelven desde la carpeta del archivo
+            base_dir=base_dir,
+            resources=resources,
+            kind=kind,
+            line_numbers=line_numbers,
+            style=self.style,
+            markdown_backend=self.markdown_backend,
+            line_number_mode=self.line_number_mode,
+            text_renderer=self.text_renderer if kind != 'markdown' else None,
+            image_dpi=self.image_dpi,
+            pdf_options=self.pdf_options,
+            # Cada parte renderizada en paralelo empieza en una página nueva
+            render_parts=render_parts if render_parts > 1 else None,
+            css=self._get_css_hash()
+        )
+    
+    def _get_pdf_options(self) -> dict:
+        """
+        Obtiene las opciones de WeasyPrint para maquetar y escribir el PDF
+        
+        Returns:
+            Solo las opciones que cambian respecto a los valores por defecto
+        """
+        options = {}
+        if self.optimize_images:
+            options['optimize_images'] = True
+            if self.image_dpi is not None:
+                options['dpi'] = self.image_dpi
+        if self.jpeg_quality is not None:
+            options['jpeg_quality'] = self.jpeg_quality
+        if self.full_fonts:
+            options['full_fonts'] = True
+        if not self.compress:
+            options['uncompressed_pdf'] = True
+        return options
     
     def _get_html_template(self, content: str, title: str = "Documento") -> str:
         """
@@ -38,31 +291,28 @@ class PDFGenerator:
         
         Args:
             content: Contenido HTML del cuerpo
-            title: Título del documento
+            title: Título del documento (texto sin escapar, p. ej. el
+                nombre del archivo)
             
         Returns:
             HTML completo con estructura
         """
-        # Obtener CSS de Pygments para resaltado de sintaxis
-        pygments_css = self.code_converter.get_css()
-        
-        html = f"""
+        # El CSS de Pygments se aplica como hoja de estilo ya parseada
+        # (ver _get_stylesheets), así que no se incrusta en el HTML
+        template = f"""
 <!DOCTYPE html>
 <html lang="es">
 <head>
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>{title}</title>
-    <style>
-        {pygments_css}
-    </style>
+    <title>{html.escape(title)}</title>
 </head>
 <body>
     {content}
 </body>
 </html>
 """
-        return html
+        return template
     
     def convert_to_pdf(
         self, 
@@ -91,57 +341,769 @@ class PDFGenerator:
         output_path = Path(output_file)
         ensure_directory_exists(str(output_path.parent))
         
-        # Convertir según el tipo de archivo
+        stats = ConversionStats(input_file=input_file)
         try:
-            if is_markdown_file(input_file):
-                html_content = self.markdown_converter.convert_file(input_file)
-            elif is_code_file(input_file):
-                html_content = self.code_converter.convert_file(input_file, line_numbers)
-            elif is_text_file(input_file):
-                html_content = self.text_converter.convert_file(input_file)
+            if self.profiler is not None:
+                with self.profiler.profile(input_file):
+                    self._convert_file(input_file, output_file, line_numbers, stats)
             else:
-                # Por defecto, tratar como texto plano
-                html_content = self.text_converter.convert_file(input_file)
+                self._convert_file(input_file, output_file, line_numbers, stats)
+            return output_file
             
-            # Crear HTML completo
-            full_html = self._get_html_template(
-                html_content, 
-                title=input_path.name
-            )
+        except Exception as e:
+            stats.error = str(e)
+            raise Exception(f"Error al convertir archivo a PDF: {str(e)}")
+        finally:
+            if self.on_stats is not None:
+                self.on_stats(stats)
+    
+    def _convert_file(
+        self,
+        input_file: str,
+        output_file: str,
+        line_numbers: bool,
+        stats: ConversionStats
+    ) -> None:
+        """
+        Convierte un archivo a PDF registrando las métricas de cada etapa
+        
+        Args:
+            input_file: Ruta del archivo de entrada
+            output_file: Ruta del archivo PDF de salida
+            line_numbers: Si mostrar números de línea en código
+            stats: Métricas de la conversión a completar
+        """
+        with stats.stage('detect'):
+            kind = self._get_converter_kind(input_file)
+        stats.kind = kind
+        stats.input_bytes = os.path.getsize(input_file)
+        render_parts = self._get_render_parts(input_file, kind, stats.input_bytes)
+        
+        # Reutilizar el PDF si la entrada y las opciones no han cambiado
+        cache_key = None
+        if self.cache is not None:
+            cache_key = self._get_cache_key(input_file, kind, line_numbers, render_parts)
+            metadata = self.cache.fetch(cache_key, output_file)
+            if metadata is not None:
+                stats.cached = True
+                stats.pages = metadata.get('pages', 0)
+                stats.output_bytes = os.path.getsize(output_file)
+                return
+            self.cache.detach(output_file)
+        
+        content = None
+        rendered = False
+        if kind in ('code', 'text') and self.text_renderer == 'direct':
+            # Texto y código sin maquetación HTML, salvo caracteres no representables
+            if self._should_stream(input_file):
+                rendered = self._convert_direct_streaming(
+                    input_file, output_file, kind, line_numbers, stats
+                )
+            else:
+                with stats.stage('read'):
+                    content = read_file_content(input_file)
+                if content is None:
+                    raise ValueError(f"No se pudo leer el archivo: {input_file}")
+                rendered = self._convert_direct(content, input_file, output_file, kind, line_numbers, stats)
+        
+        if rendered:
+            pass
+        elif kind in ('code', 'text') and self._should_stream(input_file):
+            # Archivos enormes: renderizar por bloques con memoria acotada
+            self._convert_streaming(input_file, output_file, kind, line_numbers, stats)
+        else:
+            if content is None:
+                with stats.stage('read'):
+                    content = read_file_content(input_file)
+            if content is None:
+                raise ValueError(f"No se pudo leer el archivo: {input_file}")
+            
+            if render_parts > 1 and not (kind == 'markdown' and _INTERNAL_LINK_RE.search(content)):
+                # Documentos grandes: repartir sus partes entre varios procesos
+                self._convert_parallel(content, input_file, output_file, kind, line_numbers, stats)
+            else:
+                html_content = self._convert_to_html(
+                    content, input_file, kind, line_numbers, stats
+                )
+                
+                # Crear HTML completo
+                with stats.stage('template'):
+                    full_html = self._get_html_template(
+                        html_content, 
+                        title=Path(input_file).name
+                    )
+                stats.html_bytes = len(full_html)
+                
+                # Generar PDF
+                with stats.stage('render'):
+                    stats.pages = self._generate_pdf_from_html(
+                        full_html, output_file, input_file, stats
+                    )
+        
+        stats.output_bytes = os.path.getsize(output_file)
+        
+        if cache_key is not None:
+            self.cache.store(cache_key, output_file, {'pages': stats.pages})
+    
+    def _convert_to_html(
+        self,
+        content: str,
+        input_file: str,
+        kind: str,
+        line_numbers: bool,
+        stats: Optional[ConversionStats] = None,
+        language: Optional[str] = None
+    ) -> str:
+        """
+        Convierte el contenido de un archivo al HTML del cuerpo
+        
+        Args:
+            content: Contenido del archivo ya leído
+            input_file: Ruta del archivo de entrada
+            kind: Tipo de conversor ('markdown', 'code' o 'text')
+            line_numbers: Si mostrar números de línea en código
+            stats: Métricas donde registrar las etapas (opcional)
+            language: Lenguaje del código (por defecto, según la extensión)
             
-            # Generar PDF
-            self._generate_pdf_from_html(full_html, output_file)
+        Returns:
+            Contenido HTML del cuerpo
+        """
+        if stats is None:
+            stats = ConversionStats(input_file=input_file)
+        filename = Path(input_file).name
+        
+        if kind == 'code':
+            language = self._detect_language(content, input_file, stats, language)
+            with stats.stage('convert'):
+                return self.code_converter.convert(content, language, filename, line_numbers)
+        
+        with stats.stage('convert'):
+            # Markdown, texto y cualquier tipo registrado: convert(contenido, nombre)
+            return self.get_converter(kind).convert(content, filename)
+    
+    def _detect_language(
+        self,
+        content: str,
+        input_file: str,
+        stats: ConversionStats,
+        language: Optional[str] = None
+    ) -> str:
+        """
+        Resuelve el lenguaje del código en su propia etapa ('detect')
+        
+        Primero por la extensión y, si no basta, por el contenido (shebang,
+        modelines o guess_lexer), que es lo que más cuesta.
+        
+        Args:
+            content: Contenido del código (o su primer bloque)
+            input_file: Ruta o nombre del archivo de entrada
+            stats: Métricas de la conversión
+            language: Lenguaje conocido (por defecto, según la extensión)
             
-            return output_file
+        Returns:
+            Lenguaje que se pasa al CodeConverter sin volver a detectarlo
+        """
+        # Crear el conversor (e importar Pygments) fuera de la etapa
+        converter = self.code_converter
+        with stats.stage('detect'):
+            if language is None:
+                language = get_language(input_file)
+            return converter.detect_language(content, language, Path(input_file).name)
+    
+    def _read_and_convert_to_html(self, input_file: str, kind: str, line_numbers: bool) -> str:
+        """
+        Lee un archivo y lo convierte al HTML del cuerpo
+        
+        Args:
+            input_file: Ruta del archivo de entrada
+            kind: Tipo de conversor ('markdown', 'code' o 'text')
+            line_numbers: Si mostrar números de línea en código
+            
+        Returns:
+            Contenido HTML del cuerpo
+        """
+        content = read_file_content(input_file)
+        if content is None:
+            raise ValueError(f"No se pudo leer el archivo: {input_file}")
+        return self._convert_to_html(content, input_file, kind, line_numbers)
+    
+    def convert_content(
+        self,
+        content: Union[str, bytes],
+        output: Optional[Union[str, BinaryIO]] = None,
+        filename: Optional[str] = None,
+        kind: Optional[str] = None,
+        language: Optional[str] = None,
+        line_numbers: bool = True,
+        base_url: Optional[str] = None
+    ) -> Optional[bytes]:
+        """
+        Convierte contenido en memoria a PDF sin archivos intermedios
+        
+        Args:
+            content: Texto o bytes del documento
+            output: Ruta o archivo binario donde escribir el PDF; si no se
+                indica, se devuelven los bytes
+            filename: Nombre de referencia para deducir el tipo, el lenguaje
+                y el título (opcional)
+            kind: Tipo registrado ('markdown', 'code', 'text'...); por
+                defecto, según filename
+            language: Lenguaje del código (por defecto, según filename o
+                detectado a partir del contenido)
+            line_numbers: Si mostrar números de línea en código
+            base_url: Ruta o URL desde la que se resuelven las imágenes
+                relativas (opcional)
+            
+        Returns:
+            Bytes del PDF si no se indica output; None en otro caso
+        """
+        name = filename or 'documento'
+        if kind is None:
+            kind = self._get_converter_kind(name, content)
+        else:
+            get_spec(kind)
+        
+        stats = ConversionStats(input_file=name, kind=kind)
+        try:
+            with stats.stage('read'):
+                if isinstance(content, bytes):
+                    stats.input_bytes = len(content)
+                    content = decode_content(content)
+                else:
+                    stats.input_bytes = len(content.encode('utf-8'))
+            
+            if kind in ('code', 'text') and self.text_renderer == 'direct':
+                target = BytesIO() if output is None else output
+                if self._convert_direct(content, name, target, kind, line_numbers, stats, language):
+                    if output is None:
+                        stats.output_bytes = len(target.getvalue())
+                        return target.getvalue()
+                    return None
+            
+            html_content = self._convert_to_html(
+                content, name, kind, line_numbers, stats, language
+            )
+            with stats.stage('template'):
+                full_html = self._get_html_template(html_content, title=name)
+            stats.html_bytes = len(full_html)
+            
+            with stats.stage('render'):
+                document = self._render_html(full_html, base_url)
+                stats.pages = len(document.pages)
+                data = document.write_pdf(**self.pdf_options)
+                stats.output_bytes = len(data)
+                if self.report_savings:
+                    stats.saved_bytes = self._measure_savings(full_html, base_url, len(data))
+                if output is None:
+                    return data
+                if isinstance(output, str):
+                    Path(output).write_bytes(data)
+                else:
+                    output.write(data)
+                return None
             
         except Exception as e:
-            raise Exception(f"Error al convertir archivo a PDF: {str(e)}")
+            stats.error = str(e)
+            raise Exception(f"Error al convertir contenido a PDF: {str(e)}")
+        finally:
+            if self.on_stats is not None:
+                self.on_stats(stats)
+    
+    def _convert_direct(
+        self,
+        content: str,
+        input_file: str,
+        output: Union[str, BinaryIO],
+        kind: str,
+        line_numbers: bool,
+        stats: ConversionStats,
+        language: Optional[str] = None
+    ) -> bool:
+        """
+        Escribe texto o código directamente como páginas PDF monoespaciadas
+        
+        Args:
+            content: Contenido del archivo ya leído
+            input_file: Ruta o nombre del archivo de entrada
+            output: Ruta o archivo binario del PDF
+            kind: Tipo de conversor ('code' o 'text')
+            line_numbers: Si mostrar números de línea en código
+            stats: Métricas de la conversión
+            language: Lenguaje del código (por defecto, según la extensión)
+            
+        Returns:
+            False si el contenido tiene caracteres que las fuentes estándar
+            de PDF no pueden mostrar (hay que usar el renderizado HTML)
+        """
+        renderer = self._get_monospace_renderer()
+        # El lexer recorta los espacios de los extremos (stripall)
+        widths = renderer.measure((content.strip() if kind == 'code' else content,))
+        if widths is None:
+            return False
+        
+        title = Path(input_file).name
+        if kind == 'code':
+            language = self._detect_language(content, input_file, stats, language)
+        with stats.stage('convert'):
+            if kind == 'code':
+                lexer, tokens = self.code_converter.tokenize(content, language, title)
+                lines = renderer.split_lines(tokens)
+                info = f"Archivo de código - {lexer.name}"
+            else:
+                lines = renderer.text_lines(content)
+                info = "Archivo de texto plano"
+        
+        # Los tokens se consumen a medida que se escribe cada página
+        with stats.stage('render'):
+            stats.pages = renderer.render(
+                lines,
+                output,
+                title=title,
+                info=info,
+                line_numbers=line_numbers and kind == 'code',
+                background=None if kind == 'code' else TEXT_BACKGROUND,
+                widths=widths
+            )
+        return True
+    
+    def _convert_direct_streaming(
+        self,
+        input_file: str,
+        output_file: str,
+        kind: str,
+        line_numbers: bool,
+        stats: ConversionStats
+    ) -> bool:
+        """
+        Escribe un archivo enorme como páginas PDF monoespaciadas con memoria acotada
+        
+        Una primera pasada por bloques mide las líneas (y comprueba que se
+        pueden mostrar); la segunda las tokeniza bloque a bloque y escribe
+        cada página en cuanto se completa. Como en _convert_streaming(), el
+        estado del lexer no se conserva entre bloques.
+        
+        Args:
+            input_file: Ruta del archivo de entrada
+            output_file: Ruta del archivo PDF de salida
+            kind: Tipo de conversor ('code' o 'text')
+            line_numbers: Si mostrar números de línea en código
+            stats: Métricas de la conversión (la segunda lectura se cuenta en 'render')
+            
+        Returns:
+            False si el archivo tiene caracteres que las fuentes estándar
+            de PDF no pueden mostrar (hay que usar el renderizado HTML)
+        """
+        renderer = self._get_monospace_renderer()
+        with stats.stage('read'):
+            widths = renderer.measure(iter_file_chunks(input_file, self.chunk_lines))
+        if widths is None:
+            return False
+        
+        title = Path(input_file).name
+        chunks = iter_file_chunks(input_file, self.chunk_lines)
+        if kind == 'code':
+            first = next(chunks, '')
+            language = self._detect_language(first, input_file, stats)
+            chunks = itertools.chain((first,), chunks)
+            with stats.stage('convert'):
+                lexer, tokens = self.code_converter.tokenize_chunks(chunks, language, title)
+            lines = renderer.split_lines(tokens)
+            info = f"Archivo de código - {lexer.name}"
+        else:
+            lines = (line for chunk in chunks for line in renderer.text_lines(chunk))
+            info = "Archivo de texto plano"
+        
+        with stats.stage('render'):
+            stats.pages = renderer.render(
+                lines,
+                output_file,
+                title=title,
+                info=info,
+                line_numbers=line_numbers and kind == 'code',
+                background=None if kind == 'code' else TEXT_BACKGROUND,
+                widths=widths
+            )
+        return True
+    
+    def _get_monospace_renderer(self) -> 'MonospacePDFRenderer':
+        """Crea el renderizador directo la primera vez que se necesita"""
+        if self._monospace_renderer is None:
+            # Importa pygments.styles: solo al renderizar de forma directa
+            from .monospace_pdf import MonospacePDFRenderer
+
+            self._monospace_renderer = MonospacePDFRenderer(
+                style=self.style,
+                css_path=self.css_path
+            )
+        return self._monospace_renderer
+    
+    def _should_stream(self, input_file: str) -> bool:
+        """
+        Indica si un archivo es lo bastante grande para renderizarse por bloques
+        
+        Args:
+            input_file: Ruta del archivo de entrada
+            
+        Returns:
+            True si se debe usar el renderizado por bloques
+        """
+        if self.stream_threshold is None:
+            return False
+        try:
+            return os.path.getsize(input_file) > self.stream_threshold
+        except OSError:
+            return False
+    
+    def _convert_streaming(
+        self,
+        input_file: str,
+        output_file: str,
+        kind: str,
+        line_numbers: bool,
+        stats: ConversionStats
+    ) -> None:
+        """
+        Convierte un archivo de código o texto renderizando bloque a bloque
+        
+        Cada bloque de líneas se convierte a HTML y se renderiza a un PDF
+        parcial en disco, de modo que en memoria solo hay un bloque a la vez.
+        Al final los PDFs parciales se unen en orden. Cada bloque empieza
+        en una página nueva.
+        
+        Args:
+            input_file: Ruta del archivo de entrada
+            output_file: Ruta del archivo PDF de salida
+            kind: Tipo de conversor ('code' o 'text')
+            line_numbers: Si mostrar números de línea en código
+            stats: Métricas de la conversión (la lectura se cuenta en 'convert')
+        """
+        title = Path(input_file).name
+        chunks = iter_file_chunks(input_file, self.chunk_lines)
+        
+        if kind == 'code':
+            with stats.stage('convert'):
+                first = next(chunks, '')
+            language = self._detect_language(first, input_file, stats)
+            chunks = itertools.chain((first,), chunks)
+            html_chunks = self.code_converter.convert_chunks(
+                chunks, language, title, line_numbers
+            )
+        else:
+            html_chunks = self.text_converter.convert_chunks(chunks, title)
+        
+        with tempfile.TemporaryDirectory(prefix='padlef-') as tmp_dir:
+            parts = []
+            while True:
+                with stats.stage('convert'):
+                    html_content = next(html_chunks, None)
+                if html_content is None:
+                    break
+                
+                part = os.path.join(tmp_dir, f"part-{len(parts):06d}.pdf")
+                with stats.stage('template'):
+                    full_html = self._get_html_template(html_content, title=title)
+                stats.html_bytes += len(full_html)
+                with stats.stage('render'):
+                    self._generate_pdf_from_html(full_html, part, input_file, stats)
+                parts.append(part)
+            
+            with stats.stage('render'):
+                stats.pages = merge_pdfs(parts, output_file)
+    
+    def _get_render_parts(self, input_file: str, kind: str, input_bytes: int) -> int:
+        """
+        Calcula en cuántas partes se renderiza un archivo
+        
+        Solo depende de las opciones y del tamaño de la entrada, así que se
+        conoce antes de leerla y forma parte de la clave de caché. Los
+        archivos que se renderizan por bloques o con el renderizado directo
+        no se parten.
+        
+        Args:
+            input_file: Ruta del archivo de entrada
+            kind: Tipo de conversor
+            input_bytes: Tamaño del archivo en bytes
+            
+        Returns:
+            Número de partes (1 si el archivo no se parte)
+        """
+        if (
+            self.parallel_threshold is None
+            or self.render_workers <= 1
+            or input_bytes <= self.parallel_threshold
+            or kind not in ('markdown', 'code', 'text')
+        ):
+            return 1
+        if kind != 'markdown' and (self.text_renderer == 'direct' or self._should_stream(input_file)):
+            return 1
+        return self.render_workers
+    
+    def _split_to_html(
+        self,
+        content: str,
+        input_file: str,
+        kind: str,
+        line_numbers: bool,
+        stats: ConversionStats
+    ) -> list[str]:
+        """
+        Convierte un documento al HTML del cuerpo partido en fragmentos consecutivos
+        
+        El documento se convierte entero una sola vez: el código se parte
+        por líneas con la numeración continua, el texto por bloques de
+        líneas y el Markdown antes de sus encabezados principales.
+        
+        Args:
+            content: Contenido del archivo ya leído
+            input_file: Ruta del archivo de entrada
+            kind: Tipo de conversor ('markdown', 'code' o 'text')
+            line_numbers: Si mostrar números de línea en código
+            stats: Métricas de la conversión
+            
+        Returns:
+            Lista de fragmentos HTML en orden
+        """
+        filename = Path(input_file).name
+        parts = self.render_workers
+        
+        if kind == 'code':
+            language = self._detect_language(content, input_file, stats)
+            with stats.stage('convert'):
+                block_lines = -(-(content.count('\n') + 1) // parts)
+                return self.code_converter.convert_blocks(
+                    content, language, filename, line_numbers, block_lines
+                )
+        
+        with stats.stage('convert'):
+            if kind == 'markdown':
+                return self.markdown_converter.split_sections(
+                    self.markdown_converter.convert(content, filename), parts
+                )
+            lines = content.splitlines(keepends=True)
+            block_lines = max(1, -(-len(lines) // parts))
+            chunks = (
+                ''.join(lines[i:i + block_lines])
+                for i in range(0, len(lines), block_lines)
+            )
+            return list(self.text_converter.convert_chunks(chunks, filename))
     
-    def _generate_pdf_from_html(self, html_content: str, output_file: str) -> None:
+    def _convert_parallel(
+        self,
+        content: str,
+        input_file: str,
+        output_file: str,
+        kind: str,
+        line_numbers: bool,
+        stats: ConversionStats
+    ) -> None:
+        """
+        Convierte un documento grande renderizando sus partes en paralelo
+        
+        Cada parte se maqueta en un proceso del pool de renderizado y los
+        PDFs parciales se unen en orden. Cada parte empieza en una página
+        nueva. WeasyPrint descarta los enlaces a anclas de otra parte, así
+        que los Markdown con enlaces internos o notas al pie no se parten.
+        
+        Args:
+            content: Contenido del archivo ya leído
+            input_file: Ruta del archivo de entrada
+            output_file: Ruta del archivo PDF de salida
+            kind: Tipo de conversor ('markdown', 'code' o 'text')
+            line_numbers: Si mostrar números de línea en código
+            stats: Métricas de la conversión
+        """
+        title = Path(input_file).name
+        html_parts = self._split_to_html(content, input_file, kind, line_numbers, stats)
+        
+        with stats.stage('template'):
+            full_parts = [self._get_html_template(part, title=title) for part in html_parts]
+        stats.html_bytes = sum(len(part) for part in full_parts)
+        
+        if len(full_parts) == 1:
+            with stats.stage('render'):
+                stats.pages = self._generate_pdf_from_html(
+                    full_parts[0], output_file, input_file, stats
+                )
+            return
+        
+        executor = self._get_render_executor()
+        with tempfile.TemporaryDirectory(prefix='padlef-') as tmp_dir:
+            with stats.stage('render'):
+                paths = [
+                    os.path.join(tmp_dir, f"part-{i:06d}.pdf")
+                    for i in range(len(full_parts))
+                ]
+                futures = [
+                    executor.submit(_render_in_worker, full_html, path, input_file)
+                    for full_html, path in zip(full_parts, paths)
+                ]
+                for future in futures:
+                    _, saved_bytes = future.result()
+                    if saved_bytes is not None:
+                        stats.saved_bytes = (stats.saved_bytes or 0) + saved_bytes
+                stats.pages = merge_pdfs(paths, output_file)
+    
+    def _get_render_executor(self) -> ProcessPoolExecutor:
+        """Crea el pool de renderizado la primera vez que se necesita"""
+        if self._render_executor is None:
+            self._render_executor = ProcessPoolExecutor(
+                max_workers=self.render_workers,
+                initializer=_init_worker,
+                initargs=(self.style, None, None, self.get_worker_options())
+            )
+        return self._render_executor
+    
+    def get_worker_options(self) -> dict:
+        """
+        Obtiene las opciones con las que los procesos worker crean su generador
+        
+        Son todas las opciones que afectan al PDF (salvo el estilo, la caché
+        y el perfilador, que se pasan aparte), de modo que un archivo
+        convertido en un worker es idéntico al convertido en este proceso.
+        
+        Returns:
+            Argumentos de PDFGenerator
+        """
+        return {
+            'stream_threshold': self.stream_threshold,
+            'chunk_lines': self.chunk_lines,
+            'markdown_backend': self.markdown_backend,
+            'line_number_mode': self.line_number_mode,
+            'text_renderer': self.text_renderer,
+            'image_dpi': self.image_dpi,
+            'optimize_images': self.optimize_images,
+            'jpeg_quality': self.jpeg_quality,
+            'full_fonts': self.full_fonts,
+            'compress': self.compress,
+            'report_savings': self.report_savings,
+        }
+    
+    def close(self) -> None:
+        """Detiene el pool de renderizado en paralelo si se llegó a crear"""
+        if self._render_executor is not None:
+            self._render_executor.shutdown(wait=True, cancel_futures=True)
+            self._render_executor = None
+    
+    def _generate_pdf_from_html(
+        self,
+        html_content: str,
+        output_file: str,
+        base_url: Optional[str] = None,
+        stats: Optional[ConversionStats] = None
+    ) -> int:
         """
         Genera un PDF a partir de contenido HTML
         
         Args:
             html_content: Contenido HTML completo
             output_file: Ruta del archivo PDF de salida
+            base_url: Ruta o URL desde la que se resuelven las imágenes y
+                enlaces relativos (normalmente, el archivo de entrada)
+            stats: Métricas donde acumular los bytes ahorrados (opcional)
+            
+        Returns:
+            Número de páginas generadas
+        """
+        # Maquetar y generar PDF
+        document = self._render_html(html_content, base_url)
+        document.write_pdf(output_file, **self.pdf_options)
+        if stats is not None and self.report_savings:
+            saved_bytes = self._measure_savings(
+                html_content, base_url, os.path.getsize(output_file)
+            )
+            stats.saved_bytes = (stats.saved_bytes or 0) + saved_bytes
+        return len(document.pages)
+    
+    def _measure_savings(self, html_content: str, base_url: Optional[str], size: int) -> int:
+        """
+        Calcula los bytes que ahorran las opciones de salida en un documento
+        
+        Vuelve a maquetar y escribir el documento con las opciones por
+        defecto de WeasyPrint (mismas fuentes e imágenes ya reducidas).
+        
+        Args:
+            html_content: Contenido HTML completo
+            base_url: Ruta o URL desde la que se resuelven las imágenes
+            size: Bytes del PDF escrito con las opciones de salida
+            
+        Returns:
+            Bytes ahorrados (negativo si el PDF es más grande)
+        """
+        baseline = self._render_html(html_content, base_url, pdf_options={}).write_pdf()
+        return len(baseline) - size
+    
+    def _render_html(
+        self,
+        html_content: str,
+        base_url: Optional[str] = None,
+        pdf_options: Optional[dict] = None
+    ):
+        """
+        Maqueta HTML en un documento de WeasyPrint sin escribir el PDF
+        
+        Args:
+            html_content: Contenido HTML completo
+            base_url: Ruta o URL desde la que se resuelven las imágenes y
+                enlaces relativos (opcional)
+            pdf_options: Opciones de WeasyPrint (por defecto, las del generador)
+            
+        Returns:
+            Documento de WeasyPrint con sus páginas
+        """
+        from weasyprint import HTML
+
+        url_fetcher = self._get_url_fetcher()
+        # Sin reducción de imágenes se usa el cargador por defecto de WeasyPrint
+        fetcher_options = {} if url_fetcher is None else {'url_fetcher': url_fetcher}
+        return HTML(string=html_content, base_url=base_url, **fetcher_options).render(
+            stylesheets=self._get_stylesheets(_HIGHLIGHT_MARKER in html_content),
+            font_config=get_font_config(),
+            **(self.pdf_options if pdf_options is None else pdf_options)
+        )
+    
+    def _get_url_fetcher(self) -> Optional[ImageFetcher]:
+        """Crea el cargador de imágenes reducidas la primera vez que se necesita"""
+        if self._url_fetcher is None and self.image_dpi is not None:
+            try:
+                css_text = self.css_path.read_text(encoding='utf-8')
+            except OSError:
+                css_text = ''
+            (width, _), (_, right, _, left) = parse_page_setup(css_text)
+            self._url_fetcher = create_image_fetcher(self.image_dpi, width - left - right)
+        return self._url_fetcher
+    
+    def warm_up(self) -> None:
+        """
+        Carga por adelantado WeasyPrint, las fuentes y las hojas de estilo
+
+        Permite pagar el coste de importación y de inicialización de fuentes
+        fuera de la primera conversión (p. ej. mientras se muestra la ventana).
         """
-        # Cargar CSS externo si existe
-        stylesheets = []
-        if self.css_path.exists():
-            stylesheets.append(CSS(filename=str(self.css_path)))
+        warm_up_fonts(self._get_stylesheets(highlight=False))
+    
+    def _get_stylesheets(self, highlight: bool = True) -> list:
+        """
+        Obtiene las hojas de estilo (plantilla y Pygments) desde la caché
         
-        # Generar PDF
-        html_obj = HTML(string=html_content)
-        html_obj.write_pdf(
-            output_file,
-            stylesheets=stylesheets
+        Args:
+            highlight: Si incluir el CSS de Pygments; sin él no se importa
+                Pygments (p. ej. para texto plano en HTML)
+        
+        Returns:
+            Lista de objetos CSS de WeasyPrint
+        """
+        return get_stylesheets(
+            self.css_path,
+            self.style,
+            self.code_converter.get_css() if highlight else None
         )
     
     def convert_multiple_files(
         self, 
         input_files: list[str],
         output_directory: Optional[str] = None,
-        line_numbers: bool = True
+        line_numbers: bool = True,
+        workers: Optional[int] = 1
     ) -> list[str]:
         """
         Convierte múltiples archivos a PDF
@@ -150,29 +1112,183 @@ class PDFGenerator:
             input_files: Lista de rutas de archivos de entrada
             output_directory: Directorio de salida (opcional)
             line_numbers: Si mostrar números de línea en código
+            workers: Número de procesos en paralelo (1, por defecto, en
+                este proceso; None o 0, uno por núcleo)
             
         Returns:
             Lista de rutas de archivos PDF generados
         """
+        if workers != 1 and len(input_files) > 1:
+            return self._convert_multiple_files_parallel(
+                input_files, output_directory, line_numbers, workers
+            )
+        
         output_files = []
         
         for input_file in input_files:
             try:
-                if output_directory:
-                    input_path = Path(input_file)
-                    output_file = str(Path(output_directory) / input_path.with_suffix('.pdf').name)
-                else:
-                    output_file = None
-                
+                output_file = get_output_path(input_file, output_directory)
                 result = self.convert_to_pdf(input_file, output_file, line_numbers)
                 output_files.append(result)
                 
             except Exception as e:
-                print(f"Error al convertir {input_file}: {str(e)}")
+                print(f"Error al convertir {input_file}: {str(e)}", file=sys.stderr)
                 continue
         
         return output_files
     
+    def _convert_multiple_files_parallel(
+        self,
+        input_files: list[str],
+        output_directory: Optional[str],
+        line_numbers: bool,
+        workers: Optional[int]
+    ) -> list[str]:
+        """
+        Convierte múltiples archivos repartiéndolos en un pool de procesos
+        
+        Args:
+            input_files: Lista de rutas de archivos de entrada
+            output_directory: Directorio de salida (opcional)
+            line_numbers: Si mostrar números de línea en código
+            workers: Número de procesos worker
+            
+        Returns:
+            Lista de rutas de archivos PDF generados (en orden de finalización)
+        """
+        output_files = []
+        
+        with BatchConverter(
+            workers=workers,
+            style=self.style,
+            cache=self.cache,
+            profiler=self.profiler,
+            generator_options=self.get_worker_options()
+        ) as batch:
+            for result in batch.iter_convert(input_files, output_directory, line_numbers):
+                if result.ok:
+                    output_files.append(result.output_file)
+                else:
+                    print(f"Error al convertir {result.input_file}: {result.error}", file=sys.stderr)
+            
+            # Acumular en esta caché los contadores de los procesos worker
+            if self.cache is not None:
+                stats = batch.cache_stats()
+                self.cache.record(stats['hits'], stats['misses'])
+        
+        return output_files
+    
+    def convert_to_bundle(
+        self,
+        input_files: list[str],
+        output_file: str,
+        line_numbers: bool = True,
+        table_of_contents: bool = True,
+        on_error: Optional[Callable[[str, Exception], None]] = None
+    ) -> str:
+        """
+        Convierte varios archivos en un único PDF
+        
+        Cada archivo se maqueta por separado y sus páginas se concatenan en
+        memoria, de modo que el PDF final se escribe una sola vez. Los
+        archivos que fallan se omiten del PDF.
+        
+        Args:
+            input_files: Lista de rutas de archivos de entrada, en orden
+            output_file: Ruta del PDF combinado
+            line_numbers: Si mostrar números de línea en código
+            table_of_contents: Si generar un índice al principio
+            on_error: Función que recibe la ruta y la excepción de cada
+                archivo omitido (por defecto, se informa en stderr)
+            
+        Returns:
+            Ruta del archivo PDF generado
+        """
+        documents = []
+        titles = []
+        
+        for input_file in input_files:
+            try:
+                kind = self._get_converter_kind(input_file)
+                html_content = self._read_and_convert_to_html(input_file, kind, line_numbers)
+                # Ancla para los enlaces del índice
+                anchor = f'padlef-file-{len(documents) + 1}'
+                html_content = f'<div id="{anchor}">{html_content}</div>'
+                
+                title = Path(input_file).name
+                full_html = self._get_html_template(html_content, title=title)
+                documents.append(self._render_html(full_html, input_file))
+                titles.append(title)
+                
+            except Exception as e:
+                if on_error is not None:
+                    on_error(input_file, e)
+                else:
+                    print(f"Error al convertir {input_file}: {str(e)}", file=sys.stderr)
+                continue
+        
+        if not documents:
+            raise Exception("Error al generar el PDF combinado: no se pudo convertir ningún archivo")
+        
+        pages = []
+        if table_of_contents:
+            page_counts = [len(document.pages) for document in documents]
+            pages.extend(self._render_table_of_contents(titles, page_counts).pages)
+        for document in documents:
+            pages.extend(document.pages)
+        
+        ensure_directory_exists(str(Path(output_file).parent))
+        bundle = documents[0].copy(pages)
+        bundle.metadata.title = Path(output_file).stem
+        bundle.write_pdf(output_file, **self.pdf_options)
+        
+        return output_file
+    
+    def _render_table_of_contents(self, titles: list[str], page_counts: list[int]):
+        """
+        Maqueta el índice del PDF combinado
+        
+        Los números de página dependen de cuántas páginas ocupe el propio
+        índice, así que se vuelve a maquetar si la estimación inicial falla.
+        
+        Args:
+            titles: Nombre de cada archivo incluido
+            page_counts: Páginas que ocupa cada archivo
+            
+        Returns:
+            Documento de WeasyPrint con las páginas del índice
+        """
+        toc_pages = 1
+        while True:
+            items = ''
+            page = toc_pages + 1
+            for i, (title, count) in enumerate(zip(titles, page_counts), 1):
+                items += f'<li><a href="#padlef-file-{i}">{html.escape(title)}</a>'
+                items += f'<span class="toc-page">{page}</span></li>'
+                page += count
+            
+            content = '<div class="document-header">'
+            content += '<div class="document-title">Índice</div>'
+            content += f'<div class="document-info">{len(titles)} archivo(s)</div>'
+            content += '</div>'
+            content += f'<ol class="bundle-toc">{items}</ol>'
+            
+            document = self._render_html(self._get_html_template(content, title="Índice"))
+            if len(document.pages) == toc_pages:
+                return document
+            toc_pages = len(document.pages)
+    
+    def cache_stats(self) -> Optional[dict]:
+        """
+        Obtiene los contadores de la caché de salida
+        
+        Returns:
+            Diccionario con aciertos y fallos, o None si no hay caché
+        """
+        if self.cache is None:
+            return None
+        return self.cache.stats()
+    
     def get_supported_extensions(self) -> list[str]:
         """
         Obtiene la lista de extensiones soportadas
@@ -180,15 +1296,5 @@ class PDFGenerator:
         Returns:
             Lista de extensiones de archivo soportadas
         """
-        return [
-            # Markdown
-            '.md', '.markdown',
-            # Texto
-            '.txt',
-            # Código
-            '.py', '.js', '.jsx', '.ts', '.tsx', '.java', '.c', '.cpp', '.h', '.hpp',
-            '.cs', '.php', '.rb', '.go', '.rs', '.swift', '.kt', '.scala', '.r',
-            '.html', '.css', '.scss', '.sass', '.json', '.xml', '.yaml', '.yml',
-            '.sh', '.bash', '.sql', '.vue', '.dart', '.lua', '.perl', '.asm'
-        ]
+        return supported_extensions()
 
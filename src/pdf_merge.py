@@ -0,0 +1,29 @@
+"""
+Unión de varios PDFs parciales en un único archivo
+"""
+
+from typing import BinaryIO, Union
+
+
+def merge_pdfs(parts: list, output: Union[str, BinaryIO]) -> int:
+    """
+    Une varios PDFs en orden en un solo documento
+
+    Args:
+        parts: Rutas o archivos binarios de los PDFs parciales, en orden
+        output: Ruta o archivo binario del PDF resultante
+
+    Returns:
+        Número de páginas del PDF resultante
+    """
+    # pypdf solo se carga cuando hay que unir bloques
+    from pypdf import PdfWriter
+
+    writer = PdfWriter()
+    try:
+        for part in parts:
+            writer.append(part)
+        writer.write(output)
+        return len(writer.pages)
+    finally:
+        writer.close()
@@ -0,0 +1,1091 @@
+"""
+Servidor de conversión persistente con API HTTP local
+
+Mantiene un pool de workers con WeasyPrint, fuentes, hojas de estilo y
+lexers ya cargados, de modo que cada trabajo solo paga la conversión.
+Escucha en localhost (TCP) o en un socket Unix.
+
+API:
+    GET  /health    Estado del servidor, cola y caché
+    POST /convert   {"input": ruta, "output": ruta, "line_numbers": true,
+                     "return": "path" | "pdf"}
+                    Devuelve un JSON con el resultado o el propio PDF
+    POST /convert   {"inputs": [rutas], "output_dir": ruta, "line_numbers": true}
+                    Devuelve una línea JSON por archivo según terminan
+    POST /convert   {"content": texto | "content_base64": datos,
+                     "filename": nombre, "kind": "markdown" | "code" | "text"}
+                    Convierte contenido sin archivos y devuelve el PDF
+
+Cuando la cola está llena durante más de queue_timeout segundos, el
+servidor responde 503 con Retry-After para que el cliente reintente.
+
+Los POST deben llevar Content-Type: application/json y la cabecera
+Authorization: Bearer <token>, con el token del archivo que crea el
+servidor (ver get_default_token_path). Sin --allow-remote, además se
+rechazan las peticiones cuyo Host no es de loopback (DNS rebinding).
+"""
+
+import argparse
+import base64
+import hmac
+import http.client
+import ipaddress
+import json
+import os
+import queue
+import secrets
+import socket
+import socketserver
+import stat
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Iterator, Optional, Union
+
+from .batch import BatchConverter, BatchResult, default_worker_count, get_output_path
+from .cache import OutputCache
+from .cli import add_pdf_arguments, get_generator_options
+from .pdf_generator import PDFGenerator
+
+
+# Dirección de escucha por defecto (solo accesible desde la propia máquina)
+DEFAULT_ADDRESS = '127.0.0.1:8765'
+
+# Trabajos encolados o en curso admitidos antes de aplicar contrapresión
+DEFAULT_MAX_QUEUE = 256
+
+# Segundos que un trabajo espera a que haya hueco en la cola
+DEFAULT_QUEUE_TIMEOUT = 30.0
+
+_UNIX_PREFIX = 'unix:'
+
+# Nombres de host de loopback que se aceptan en la cabecera Host
+_LOOPBACK_NAMES = frozenset({'localhost', 'localhost.'})
+
+
+class QueueFullError(RuntimeError):
+    """La cola de trabajos del servidor está llena"""
+
+
+def parse_address(address: str) -> Union[str, tuple[str, int]]:
+    """
+    Interpreta una dirección de escucha
+
+    Args:
+        address: 'host:puerto', 'puerto' o 'unix:/ruta/al/socket'
+
+    Returns:
+        Ruta del socket Unix o tupla (host, puerto)
+    """
+    if address.startswith(_UNIX_PREFIX):
+        return address[len(_UNIX_PREFIX):]
+    host, _, port = address.rpartition(':')
+    return (host or '127.0.0.1', int(port))
+
+
+def get_default_token_path() -> Path:
+    """
+    Obtiene la ruta por defecto del archivo con el token del servidor
+
+    Se puede sobrescribir con la variable de entorno PADLEF_TOKEN_FILE.
+
+    Returns:
+        Ruta del archivo del token
+    """
+    env_file = os.environ.get('PADLEF_TOKEN_FILE')
+    if env_file:
+        return Path(env_file)
+
+    if sys.platform == 'win32':
+        base = os.environ.get('APPDATA') or Path.home() / 'AppData' / 'Roaming'
+    else:
+        base = os.environ.get('XDG_CONFIG_HOME') or Path.home() / '.config'
+
+    return Path(base) / 'padlef' / 'server-token'
+
+
+def read_token(path: Union[str, Path, None] = None) -> Optional[str]:
+    """
+    Lee el token del servidor
+
+    Args:
+        path: Archivo del token (por defecto, get_default_token_path())
+
+    Returns:
+        Token, o None si el archivo no existe o está vacío
+    """
+    try:
+        token = Path(path or get_default_token_path()).read_text(encoding='utf-8').strip()
+    except OSError:
+        return None
+    return token or None
+
+
+def load_or_create_token(path: Union[str, Path, None] = None) -> str:
+    """
+    Obtiene el token del servidor, creándolo (modo 0600) si no existe
+
+    Varios servidores del mismo usuario comparten así el mismo token.
+
+    Args:
+        path: Archivo del token (por defecto, get_default_token_path())
+
+    Returns:
+        Token
+
+    Raises:
+        ValueError: Si el archivo lo pueden leer otros usuarios
+    """
+    path = Path(path or get_default_token_path())
+    path.parent.mkdir(parents=True, exist_ok=True, mode=0o700)
+    try:
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    except FileExistsError:
+        if os.name == 'posix' and os.stat(path).st_mode & 0o077:
+            raise ValueError(f"{path} lo pueden leer otros usuarios; usa chmod 600")
+        token = read_token(path)
+        if token is None:
+            raise ValueError(f"{path} está vacío")
+        return token
+
+    token = secrets.token_urlsafe(32)
+    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+        f.write(token + '\n')
+    return token
+
+
+def _future_result(future: Future, input_file: str) -> BatchResult:
+    """Obtiene el resultado de un trabajo terminado sin lanzar excepciones"""
+    if future.cancelled():
+        return BatchResult(input_file=input_file, error='Conversión cancelada')
+    error = future.exception()
+    if error is not None:
+        # El proceso worker murió o no pudo devolver el resultado
+        return BatchResult(input_file=input_file, error=str(error))
+    return future.result()
+
+
+def result_to_record(result: BatchResult) -> dict:
+    """
+    Convierte un resultado en el registro JSON que devuelve la API
+
+    Args:
+        result: Resultado de la conversión
+
+    Returns:
+        Diccionario serializable a JSON
+    """
+    record = {
+        'input': result.input_file,
+        'output': result.output_file,
+        'status': 'ok' if result.ok else 'error',
+        'seconds': round(result.elapsed, 4),
+        'cached': result.cached,
+    }
+    if result.stats is not None:
+        record['stages'] = result.stats['stages']
+        record['pages'] = result.stats['pages']
+    if not result.ok:
+        record['error'] = result.error
+    return record
+
+
+class ConversionService:
+    """Cola acotada de trabajos sobre un pool de workers precargados"""
+
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        style: str = 'default',
+        cache: Optional[OutputCache] = None,
+        max_queue: int = DEFAULT_MAX_QUEUE,
+        queue_timeout: float = DEFAULT_QUEUE_TIMEOUT,
+        generator_options: Optional[dict] = None
+    ):
+        """
+        Inicializa el servicio
+
+        Args:
+            workers: Número de procesos worker (por defecto, uno por núcleo)
+            style: Estilo de Pygments para resaltado de código
+            cache: Caché de PDFs compartida por los workers (opcional)
+            max_queue: Trabajos encolados o en curso como máximo
+            queue_timeout: Segundos que un trabajo espera hueco en la cola
+            generator_options: Argumentos adicionales del PDFGenerator de
+                cada worker (renderizador, backend, opciones del PDF...)
+        """
+        self.batch = BatchConverter(
+            workers=workers,
+            style=style,
+            cache=cache,
+            generator_options=generator_options
+        )
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+
+        self.pending = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self.started_at = time.time()
+
+        self._slots = threading.BoundedSemaphore(max_queue)
+        self._lock = threading.Lock()
+        self._temp_dir = tempfile.mkdtemp(prefix='padlef-server-')
+
+    def start(self) -> None:
+        """Arranca los workers y precarga en ellos la pila de conversión"""
+        self.batch.warm_up()
+
+    def submit(
+        self,
+        input_file: str,
+        output_file: Optional[str] = None,
+        line_numbers: bool = True,
+        timeout: Optional[float] = None
+    ) -> 'Future[BatchResult]':
+        """
+        Encola un trabajo, esperando hueco si la cola está llena
+
+        Args:
+            input_file: Ruta del archivo de entrada
+            output_file: Ruta del archivo PDF de salida (opcional)
+            line_numbers: Si mostrar números de línea en código
+            timeout: Segundos de espera (por defecto, queue_timeout)
+
+        Returns:
+            Futuro con el resultado de la conversión
+
+        Raises:
+            QueueFullError: Si no hubo hueco en la cola a tiempo
+        """
+        self._acquire(timeout)
+        try:
+            future = self.batch.submit(input_file, output_file, line_numbers)
+        except Exception:
+            self._release(ok=False)
+            raise
+        future.add_done_callback(
+            lambda done: self._release(ok=_future_result(done, input_file).ok)
+        )
+        return future
+
+    def submit_content(
+        self,
+        content: Union[str, bytes],
+        filename: Optional[str] = None,
+        kind: Optional[str] = None,
+        line_numbers: bool = True,
+        timeout: Optional[float] = None
+    ) -> 'Future[bytes]':
+        """
+        Encola la conversión de contenido en memoria
+
+        Args:
+            content: Texto o bytes del documento
+            filename: Nombre de referencia para deducir tipo y lenguaje (opcional)
+            kind: 'markdown', 'code' o 'text' (por defecto, según filename)
+            line_numbers: Si mostrar números de línea en código
+            timeout: Segundos de espera (por defecto, queue_timeout)
+
+        Returns:
+            Futuro con los bytes del PDF
+
+        Raises:
+            QueueFullError: Si no hubo hueco en la cola a tiempo
+        """
+        self._acquire(timeout)
+        try:
+            future = self.batch.submit_content(content, filename, kind, line_numbers)
+        except Exception:
+            self._release(ok=False)
+            raise
+        future.add_done_callback(
+            lambda done: self._release(ok=not done.cancelled() and done.exception() is None)
+        )
+        return future
+
+    def _acquire(self, timeout: Optional[float]) -> None:
+        """Reserva un hueco en la cola o lanza QueueFullError"""
+        wait = self.queue_timeout if timeout is None else timeout
+        if not self._slots.acquire(timeout=wait):
+            with self._lock:
+                self.rejected += 1
+            raise QueueFullError(
+                f"Cola llena ({self.max_queue} trabajos), inténtalo más tarde"
+            )
+        with self._lock:
+            self.pending += 1
+
+    def _release(self, ok: bool) -> None:
+        """Libera el hueco de un trabajo terminado y actualiza los contadores"""
+        with self._lock:
+            self.pending -= 1
+            if ok:
+                self.completed += 1
+            else:
+                self.failed += 1
+        self._slots.release()
+
+    def convert(
+        self,
+        input_file: str,
+        output_file: Optional[str] = None,
+        line_numbers: bool = True
+    ) -> BatchResult:
+        """
+        Convierte un archivo esperando a que termine
+
+        Args:
+            input_file: Ruta del archivo de entrada
+            output_file: Ruta del archivo PDF de salida (opcional)
+            line_numbers: Si mostrar números de línea en código
+
+        Returns:
+            Resultado de la conversión
+
+        Raises:
+            QueueFullError: Si no hubo hueco en la cola a tiempo
+        """
+        future = self.submit(input_file, output_file, line_numbers)
+        return _future_result(_wait(future), input_file)
+
+    def convert_to_bytes(self, input_file: str, line_numbers: bool = True) -> tuple[BatchResult, bytes]:
+        """
+        Convierte un archivo y devuelve el contenido del PDF
+
+        Args:
+            input_file: Ruta del archivo de entrada
+            line_numbers: Si mostrar números de línea en código
+
+        Returns:
+            Tupla (resultado, bytes del PDF; vacío si hubo error)
+        """
+        output_file = os.path.join(self._temp_dir, f"{uuid.uuid4().hex}.pdf")
+        result = self.convert(input_file, output_file, line_numbers)
+        try:
+            if not result.ok:
+                return result, b''
+            with open(output_file, 'rb') as f:
+                return result, f.read()
+        finally:
+            try:
+                os.unlink(output_file)
+            except OSError:
+                pass
+
+    def iter_convert(
+        self,
+        input_files: list[str],
+        output_directory: Optional[str] = None,
+        line_numbers: bool = True
+    ) -> Iterator[BatchResult]:
+        """
+        Encola varios trabajos y devuelve los resultados según terminan
+
+        Los trabajos se encolan a medida que hay hueco, así que un lote
+        grande no acapara la cola. Los que no consiguen hueco a tiempo
+        se devuelven como error.
+
+        Args:
+            input_files: Lista de rutas de archivos de entrada
+            output_directory: Directorio de salida (opcional)
+            line_numbers: Si mostrar números de línea en código
+
+        Yields:
+            Resultado de cada archivo en orden de finalización
+        """
+        results: queue.Queue = queue.Queue()
+        stopped = threading.Event()
+        futures: list[Future] = []
+
+        def feed() -> None:
+            for input_file in input_files:
+                if stopped.is_set():
+                    results.put(BatchResult(input_file=input_file, error='Conversión cancelada'))
+                    continue
+                try:
+                    future = self.submit(
+                        input_file,
+                        get_output_path(input_file, output_directory),
+                        line_numbers
+                    )
+                except Exception as e:
+                    results.put(BatchResult(input_file=input_file, error=str(e)))
+                    continue
+                futures.append(future)
+                future.add_done_callback(
+                    lambda done, name=input_file: results.put(_future_result(done, name))
+                )
+
+        feeder = threading.Thread(target=feed, name='padlef-feeder', daemon=True)
+        feeder.start()
+        try:
+            for _ in input_files:
+                yield results.get()
+        finally:
+            # Si el cliente se desconecta, no seguir encolando su lote
+            stopped.set()
+            feeder.join()
+            for future in futures:
+                future.cancel()
+
+    def stats(self) -> dict:
+        """
+        Obtiene el estado del servicio
+
+        Returns:
+            Diccionario con workers, cola, contadores y caché
+        """
+        with self._lock:
+            data = {
+                'workers': self.batch.workers,
+                'max_queue': self.max_queue,
+                'pending': self.pending,
+                'completed': self.completed,
+                'failed': self.failed,
+                'rejected': self.rejected,
+                'uptime': round(time.time() - self.started_at, 1),
+            }
+        if self.batch.cache is not None:
+            data['cache'] = self.batch.cache_stats()
+        return data
+
+    def close(self) -> None:
+        """Detiene los workers y elimina los archivos temporales"""
+        self.batch.shutdown(cancel_pending=True)
+        try:
+            for name in os.listdir(self._temp_dir):
+                os.unlink(os.path.join(self._temp_dir, name))
+            os.rmdir(self._temp_dir)
+        except OSError:
+            pass
+
+
+def _wait(future: Future) -> Future:
+    """Espera a que termine un futuro sin propagar sus excepciones"""
+    try:
+        future.result()
+    except BaseException:
+        pass
+    return future
+
+
+def _check_job(job: dict) -> None:
+    """
+    Comprueba los tipos de los campos de un trabajo
+
+    Args:
+        job: Cuerpo JSON de POST /convert
+
+    Raises:
+        ValueError: Si algún campo no tiene el tipo esperado
+    """
+    if 'inputs' in job:
+        inputs = job['inputs']
+        if not isinstance(inputs, list) or not all(isinstance(path, str) for path in inputs):
+            raise ValueError("'inputs' debe ser una lista de rutas")
+    for field in ('input', 'output', 'output_dir', 'filename', 'kind', 'content_base64'):
+        if job.get(field) is not None and not isinstance(job[field], str):
+            raise ValueError(f"'{field}' debe ser una cadena")
+    if 'line_numbers' in job and not isinstance(job['line_numbers'], bool):
+        raise ValueError("'line_numbers' debe ser true o false")
+
+
+def _is_loopback_host(host: str) -> bool:
+    """
+    Indica si una cabecera Host nombra la propia máquina
+
+    No se resuelve el nombre: con DNS rebinding, un dominio externo puede
+    resolver a 127.0.0.1, así que solo valen localhost y las IP de loopback.
+
+    Args:
+        host: Valor de la cabecera Host (con o sin puerto)
+
+    Returns:
+        True si es localhost o una dirección IP de loopback
+    """
+    host = host.strip().lower()
+    if host.startswith('['):
+        host = host[1:host.find(']')]
+    elif host.count(':') == 1:
+        host = host.rsplit(':', 1)[0]
+    if host in _LOOPBACK_NAMES:
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+
+class ConversionRequestHandler(BaseHTTPRequestHandler):
+    """Atiende las peticiones HTTP de la API de conversión"""
+
+    server_version = 'padlef'
+
+    def log_message(self, format: str, *args) -> None:
+        """Registra las peticiones solo en modo detallado"""
+        if getattr(self.server, 'verbose', False):
+            print(f"{self.command} {self.path} - {format % args}", file=sys.stderr)
+
+    def _check_origin(self) -> bool:
+        """
+        Rechaza (403) las peticiones con un Host ajeno, salvo con --allow-remote
+
+        Returns:
+            True si la petición puede continuar
+        """
+        if getattr(self.server, 'allow_remote', False):
+            return True
+        if _is_loopback_host(self.headers.get('Host', '')):
+            return True
+        self._send_json(403, {'error': "Host no permitido"})
+        return False
+
+    def _check_auth(self) -> bool:
+        """
+        Comprueba el tipo de contenido (415) y el token (401) de un POST
+
+        Un formulario o un fetch sin preflight de otra web no puede enviar
+        application/json ni la cabecera Authorization.
+
+        Returns:
+            True si la petición puede continuar
+        """
+        content_type = self.headers.get('Content-Type', '').split(';')[0].strip().lower()
+        if content_type != 'application/json':
+            self._send_json(415, {'error': "Se esperaba Content-Type: application/json"})
+            return False
+
+        token = getattr(self.server, 'token', None)
+        if token is not None:
+            scheme, _, value = self.headers.get('Authorization', '').partition(' ')
+            if scheme.lower() != 'bearer' or not hmac.compare_digest(
+                value.strip().encode('utf-8'), token.encode('utf-8')
+            ):
+                self._send_json(401, {'error': "Token no válido"}, {'WWW-Authenticate': 'Bearer'})
+                return False
+        return True
+
+    def do_GET(self) -> None:
+        """GET /health"""
+        if not self._check_origin():
+            return
+        if self.path.rstrip('/') == '/health':
+            self._send_json(200, self.server.service.stats())
+        else:
+            self._send_json(404, {'error': f"Ruta desconocida: {self.path}"})
+
+    def do_POST(self) -> None:
+        """POST /convert"""
+        if not self._check_origin() or not self._check_auth():
+            return
+        if self.path.rstrip('/') != '/convert':
+            self._send_json(404, {'error': f"Ruta desconocida: {self.path}"})
+            return
+
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+            job = json.loads(self.rfile.read(length) or b'{}')
+            if not isinstance(job, dict):
+                raise ValueError("se esperaba un objeto JSON")
+            _check_job(job)
+        except ValueError as e:
+            self._send_json(400, {'error': f"Petición no válida: {e}"})
+            return
+
+        line_numbers = job.get('line_numbers', True)
+        try:
+            if 'content' in job or 'content_base64' in job:
+                self._convert_content(job, line_numbers)
+            elif 'inputs' in job:
+                self._convert_many(job['inputs'], job.get('output_dir'), line_numbers)
+            elif 'input' in job:
+                self._convert_one(job, line_numbers)
+            else:
+                self._send_json(400, {'error': "Falta 'input' o 'inputs'"})
+        except QueueFullError as e:
+            self._send_json(503, {'error': str(e)}, {'Retry-After': '1'})
+
+    def _convert_one(self, job: dict, line_numbers: bool) -> None:
+        """Convierte un archivo y devuelve su resultado o el PDF"""
+        service = self.server.service
+        if job.get('return') == 'pdf':
+            result, data = service.convert_to_bytes(job['input'], line_numbers)
+            if result.ok:
+                self._send_pdf(data)
+                return
+        else:
+            result = service.convert(job['input'], job.get('output'), line_numbers)
+        self._send_json(200 if result.ok else 422, result_to_record(result))
+
+    def _convert_content(self, job: dict, line_numbers: bool) -> None:
+        """Convierte contenido enviado en la petición y devuelve el PDF"""
+        try:
+            if 'content_base64' in job:
+                content = base64.b64decode(job['content_base64'], validate=True)
+            else:
+                content = str(job['content'])
+        except ValueError as e:
+            self._send_json(400, {'error': f"Contenido no válido: {e}"})
+            return
+
+        future = self.server.service.submit_content(
+            content, job.get('filename'), job.get('kind'), line_numbers
+        )
+        try:
+            data = future.result()
+        except Exception as e:
+            self._send_json(422, {'status': 'error', 'error': str(e)})
+            return
+        self._send_pdf(data)
+
+    def _convert_many(self, input_files: list[str], output_directory: Optional[str], line_numbers: bool) -> None:
+        """Convierte un lote enviando una línea JSON por archivo según terminan"""
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/x-ndjson')
+        self.end_headers()
+        results = self.server.service.iter_convert(input_files, output_directory, line_numbers)
+        try:
+            for result in results:
+                self.wfile.write(json.dumps(result_to_record(result), ensure_ascii=False).encode('utf-8') + b'\n')
+                self.wfile.flush()
+        except OSError:
+            # El cliente cerró la conexión: se cancela el resto del lote
+            pass
+        finally:
+            results.close()
+
+    def _send_pdf(self, data: bytes) -> None:
+        """Envía un PDF como respuesta"""
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/pdf')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _send_json(self, status: int, data: dict, headers: Optional[dict] = None) -> None:
+        """Envía una respuesta JSON"""
+        body = json.dumps(data, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class _TCPServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+
+if hasattr(socketserver, 'ThreadingUnixStreamServer'):
+    class _UnixServer(socketserver.ThreadingUnixStreamServer):
+        daemon_threads = True
+else:
+    _UnixServer = None
+
+
+def is_loopback(host: str) -> bool:
+    """
+    Indica si un host solo es accesible desde la propia máquina
+
+    Args:
+        host: Nombre o dirección IP
+
+    Returns:
+        True si todas las direcciones a las que resuelve son de loopback
+    """
+    try:
+        addresses = {info[4][0] for info in socket.getaddrinfo(host, None)}
+    except (OSError, UnicodeError):
+        return False
+    return bool(addresses) and all(
+        ipaddress.ip_address(address.split('%')[0]).is_loopback for address in addresses
+    )
+
+
+def _remove_stale_socket(path: str) -> None:
+    """
+    Elimina el socket Unix de una ejecución anterior
+
+    Raises:
+        ValueError: Si la ruta existe y no es un socket, o si hay otro
+            servidor escuchando en él
+    """
+    try:
+        mode = os.lstat(path).st_mode
+    except FileNotFoundError:
+        return
+    if not stat.S_ISSOCK(mode):
+        raise ValueError(f"{path} existe y no es un socket; no se sobrescribe")
+
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(path)
+    except OSError:
+        # Nadie escucha: es un socket abandonado
+        os.unlink(path)
+    else:
+        raise ValueError(f"Ya hay un servidor escuchando en {path}")
+    finally:
+        probe.close()
+
+
+def create_server(
+    service: ConversionService,
+    address: str = DEFAULT_ADDRESS,
+    verbose: bool = False,
+    allow_remote: bool = False,
+    token: Optional[str] = None
+) -> socketserver.BaseServer:
+    """
+    Crea el servidor HTTP sobre TCP o socket Unix
+
+    La API lee y escribe rutas arbitrarias con los permisos del servidor,
+    así que por defecto solo se escucha en direcciones de loopback y solo
+    se atienden peticiones dirigidas a ellas.
+
+    Args:
+        service: Servicio de conversión que atiende los trabajos
+        address: Dirección de escucha (ver parse_address)
+        verbose: Si registrar cada petición en stderr
+        allow_remote: Permitir direcciones (y cabeceras Host) que no son
+            de loopback
+        token: Token que deben enviar los POST (None = sin token)
+
+    Returns:
+        Servidor listo para serve_forever()
+
+    Raises:
+        ValueError: Si la dirección no es de loopback (sin allow_remote) o
+            la ruta del socket Unix no se puede usar
+    """
+    parsed = parse_address(address)
+    if isinstance(parsed, str):
+        if _UnixServer is None:
+            raise ValueError("Los sockets Unix no están disponibles en esta plataforma")
+        _remove_stale_socket(parsed)
+        server = _UnixServer(parsed, ConversionRequestHandler)
+    else:
+        if not allow_remote and not is_loopback(parsed[0]):
+            raise ValueError(
+                f"{parsed[0]} no es una dirección de loopback; "
+                f"usa --allow-remote para escuchar en ella"
+            )
+        server = _TCPServer(parsed, ConversionRequestHandler)
+    server.service = service
+    server.verbose = verbose
+    server.allow_remote = allow_remote
+    server.token = token
+    return server
+
+
+class _UnixHTTPConnection(http.client.HTTPConnection):
+    """Conexión HTTP sobre un socket Unix"""
+
+    def __init__(self, path: str, timeout: Optional[float] = None):
+        super().__init__('localhost', timeout=timeout)
+        self.unix_path = path
+
+    def connect(self) -> None:
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        if self.timeout is not None:
+            self.sock.settimeout(self.timeout)
+        self.sock.connect(self.unix_path)
+
+
+class ServerClient:
+    """Cliente de la API del servidor de conversión"""
+
+    def __init__(
+        self,
+        address: str = DEFAULT_ADDRESS,
+        timeout: Optional[float] = None,
+        token: Optional[str] = None
+    ):
+        """
+        Inicializa el cliente
+
+        Args:
+            address: Dirección del servidor (ver parse_address)
+            timeout: Segundos de espera de la conexión (opcional)
+            token: Token del servidor (por defecto, el de get_default_token_path())
+        """
+        self.address = parse_address(address)
+        self.timeout = timeout
+        self.token = token or read_token()
+
+    def _connect(self) -> http.client.HTTPConnection:
+        if isinstance(self.address, str):
+            return _UnixHTTPConnection(self.address, timeout=self.timeout)
+        host, port = self.address
+        return http.client.HTTPConnection(host, port, timeout=self.timeout)
+
+    def _request(self, method: str, path: str, body: Optional[dict] = None):
+        connection = self._connect()
+        payload = json.dumps(body).encode('utf-8') if body is not None else None
+        headers = {'Content-Type': 'application/json'} if payload is not None else {}
+        if self.token:
+            headers['Authorization'] = f"Bearer {self.token}"
+        connection.request(method, path, body=payload, headers=headers)
+        return connection, connection.getresponse()
+
+    def health(self) -> dict:
+        """
+        Obtiene el estado del servidor
+
+        Returns:
+            Diccionario devuelto por GET /health
+        """
+        connection, response = self._request('GET', '/health')
+        try:
+            return json.loads(response.read())
+        finally:
+            connection.close()
+
+    def convert(
+        self,
+        input_file: str,
+        output_file: Optional[str] = None,
+        line_numbers: bool = True
+    ) -> dict:
+        """
+        Convierte un archivo en el servidor
+
+        Args:
+            input_file: Ruta del archivo de entrada
+            output_file: Ruta del archivo PDF de salida (opcional)
+            line_numbers: Si mostrar números de línea en código
+
+        Returns:
+            Registro JSON del resultado
+        """
+        job = {'input': os.path.abspath(input_file), 'line_numbers': line_numbers}
+        if output_file is not None:
+            job['output'] = os.path.abspath(output_file)
+        connection, response = self._request('POST', '/convert', job)
+        try:
+            return json.loads(response.read())
+        finally:
+            connection.close()
+
+    def convert_to_bytes(self, input_file: str, line_numbers: bool = True) -> bytes:
+        """
+        Convierte un archivo en el servidor y devuelve el PDF
+
+        Args:
+            input_file: Ruta del archivo de entrada
+            line_numbers: Si mostrar números de línea en código
+
+        Returns:
+            Contenido del PDF
+        """
+        job = {'input': os.path.abspath(input_file), 'line_numbers': line_numbers, 'return': 'pdf'}
+        connection, response = self._request('POST', '/convert', job)
+        try:
+            data = response.read()
+            if response.status != 200:
+                raise Exception(json.loads(data).get('error', f"HTTP {response.status}"))
+            return data
+        finally:
+            connection.close()
+
+    def convert_content(
+        self,
+        content: Union[str, bytes],
+        filename: Optional[str] = None,
+        kind: Optional[str] = None,
+        line_numbers: bool = True
+    ) -> bytes:
+        """
+        Envía contenido en memoria al servidor y devuelve el PDF
+
+        Args:
+            content: Texto o bytes del documento
+            filename: Nombre de referencia para deducir tipo y lenguaje (opcional)
+            kind: 'markdown', 'code' o 'text' (por defecto, según filename)
+            line_numbers: Si mostrar números de línea en código
+
+        Returns:
+            Contenido del PDF
+        """
+        job = {'filename': filename, 'kind': kind, 'line_numbers': line_numbers}
+        if isinstance(content, bytes):
+            job['content_base64'] = base64.b64encode(content).decode('ascii')
+        else:
+            job['content'] = content
+        connection, response = self._request('POST', '/convert', job)
+        try:
+            data = response.read()
+            if response.status != 200:
+                raise Exception(json.loads(data).get('error', f"HTTP {response.status}"))
+            return data
+        finally:
+            connection.close()
+
+    def iter_convert(
+        self,
+        input_files: list[str],
+        output_directory: Optional[str] = None,
+        line_numbers: bool = True
+    ) -> Iterator[dict]:
+        """
+        Convierte un lote en el servidor
+
+        Args:
+            input_files: Lista de rutas de archivos de entrada
+            output_directory: Directorio de salida (opcional)
+            line_numbers: Si mostrar números de línea en código
+
+        Yields:
+            Registro JSON de cada archivo en orden de finalización
+        """
+        job = {
+            'inputs': [os.path.abspath(path) for path in input_files],
+            'line_numbers': line_numbers,
+        }
+        if output_directory:
+            job['output_dir'] = os.path.abspath(output_directory)
+        connection, response = self._request('POST', '/convert', job)
+        try:
+            if response.status != 200:
+                raise Exception(json.loads(response.read()).get('error', f"HTTP {response.status}"))
+            for line in response:
+                if line.strip():
+                    yield json.loads(line)
+        finally:
+            connection.close()
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """
+    Construye el parser de argumentos del servidor
+
+    Returns:
+        Parser configurado
+    """
+    parser = argparse.ArgumentParser(
+        prog='padlef serve',
+        description='Servidor de conversión persistente con API HTTP local'
+    )
+    parser.add_argument(
+        '--listen', default=DEFAULT_ADDRESS,
+        help=f'host:puerto o unix:/ruta/socket (por defecto {DEFAULT_ADDRESS})'
+    )
+    parser.add_argument(
+        '--allow-remote', action='store_true',
+        help='Permitir escuchar en direcciones que no son de loopback '
+             '(la API accede a rutas del servidor; solo la protege el token)'
+    )
+    parser.add_argument(
+        '--token-file',
+        help='Archivo con el token que exigen los POST; se crea con modo 0600 '
+             f'si no existe (por defecto {get_default_token_path()})'
+    )
+    parser.add_argument(
+        '-j', '--jobs', type=int, default=0,
+        help='Número de procesos worker (0 = uno por núcleo, por defecto)'
+    )
+    parser.add_argument(
+        '--style', default='default',
+        help='Estilo de Pygments para el resaltado de código'
+    )
+    add_pdf_arguments(parser)
+    parser.add_argument(
+        '--cache', action='store_true',
+        help='Reutilizar PDFs de archivos sin cambios desde la caché en disco'
+    )
+    parser.add_argument(
+        '--cache-dir',
+        help='Directorio de la caché (implica --cache)'
+    )
+    parser.add_argument(
+        '--max-queue', type=int, default=DEFAULT_MAX_QUEUE,
+        help=f'Trabajos encolados como máximo (por defecto {DEFAULT_MAX_QUEUE})'
+    )
+    parser.add_argument(
+        '--queue-timeout', type=float, default=DEFAULT_QUEUE_TIMEOUT,
+        help='Segundos de espera por hueco en la cola antes de responder 503'
+    )
+    parser.add_argument(
+        '-v', '--verbose', action='store_true',
+        help='Registrar cada petición en stderr'
+    )
+    return parser
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    """
+    Punto de entrada del servidor
+
+    Args:
+        argv: Argumentos (por defecto, los de sys.argv)
+
+    Returns:
+        Código de salida
+    """
+    args = build_parser().parse_args(argv)
+    generator_options = get_generator_options(args)
+    try:
+        # Validar las opciones aquí y no al arrancar cada worker
+        PDFGenerator(style=args.style, **generator_options)
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 2
+
+    try:
+        token = load_or_create_token(args.token_file)
+    except (OSError, ValueError) as e:
+        print(f"Error: no se pudo leer el token: {e}", file=sys.stderr)
+        return 1
+
+    cache = None
+    if args.cache or args.cache_dir:
+        cache = OutputCache(directory=args.cache_dir)
+
+    service = ConversionService(
+        workers=args.jobs if args.jobs > 0 else default_worker_count(),
+        style=args.style,
+        cache=cache,
+        max_queue=args.max_queue,
+        queue_timeout=args.queue_timeout,
+        generator_options=generator_options
+    )
+    try:
+        server = create_server(service, args.listen, args.verbose, args.allow_remote, token)
+    except (OSError, ValueError) as e:
+        service.close()
+        print(f"Error: no se pudo escuchar en {args.listen}: {e}", file=sys.stderr)
+        return 1
+
+    service.start()
+    print(json.dumps({
+        'listening': args.listen,
+        'workers': service.batch.workers,
+        'token_file': str(args.token_file or get_default_token_path()),
+    }), flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.close()
+        if isinstance(server.server_address, str):
+            try:
+                os.unlink(server.server_address)
+            except OSError:
+                pass
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
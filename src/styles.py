@@ -0,0 +1,117 @@
+"""
+Caché de hojas de estilo y configuración de fuentes compartida para WeasyPrint
+"""
+
+import threading
+from pathlib import Path
+from typing import TYPE_CHECKING, Optional
+
+from .fonts import FONT_SAMPLE_HTML, get_font_face_css
+
+# WeasyPrint se importa al usarse: cargarlo tarda y no hace falta para arrancar
+if TYPE_CHECKING:
+    from weasyprint import CSS
+    from weasyprint.text.fonts import FontConfiguration
+
+
+# Configuración de fuentes compartida por todas las conversiones del proceso
+_font_config: Optional['FontConfiguration'] = None
+
+# Hojas de estilo ya parseadas: (estilo, ruta CSS, mtime) -> lista de CSS
+_stylesheet_cache: dict[tuple, list['CSS']] = {}
+
+# Si ya se maquetó el documento de muestra con las fuentes de la plantilla
+_fonts_warmed = False
+
+_lock = threading.Lock()
+
+
+def get_font_config() -> 'FontConfiguration':
+    """
+    Obtiene la configuración de fuentes compartida del proceso
+
+    Returns:
+        Instancia única de FontConfiguration
+    """
+    global _font_config
+    with _lock:
+        if _font_config is None:
+            from weasyprint.text.fonts import FontConfiguration
+
+            _font_config = FontConfiguration()
+        return _font_config
+
+
+def get_stylesheets(css_path: Path, style: str, pygments_css: Optional[str] = None) -> list['CSS']:
+    """
+    Obtiene las hojas de estilo parseadas, reutilizándolas entre conversiones
+
+    La caché se invalida automáticamente cuando cambia el estilo de Pygments
+    o la fecha de modificación del archivo CSS.
+
+    Args:
+        css_path: Ruta del archivo CSS de la plantilla
+        style: Estilo de Pygments usado para el resaltado
+        pygments_css: CSS de Pygments correspondiente al estilo (None si el
+            documento no tiene código resaltado)
+
+    Returns:
+        Lista de objetos CSS listos para WeasyPrint
+    """
+    try:
+        mtime = css_path.stat().st_mtime_ns
+    except OSError:
+        mtime = None
+
+    key = (style, str(css_path), pygments_css is not None, mtime)
+    with _lock:
+        stylesheets = _stylesheet_cache.get(key)
+    if stylesheets is not None:
+        return stylesheets
+
+    from weasyprint import CSS
+
+    # Las familias de @font-face se resuelven aquí, una vez por proceso; el
+    # CSS de Pygments va antes que la plantilla para que esta tenga prioridad
+    font_config = get_font_config()
+    stylesheets = [CSS(string=get_font_face_css(), font_config=font_config)]
+    if pygments_css is not None:
+        stylesheets.append(CSS(string=pygments_css, font_config=font_config))
+    if mtime is not None:
+        stylesheets.append(CSS(filename=str(css_path), font_config=font_config))
+
+    with _lock:
+        # Descartar versiones anteriores del mismo estilo y archivo
+        for old_key in [k for k in _stylesheet_cache if k[:3] == key[:3]]:
+            del _stylesheet_cache[old_key]
+        _stylesheet_cache[key] = stylesheets
+
+    return stylesheets
+
+
+def warm_up_fonts(stylesheets: list['CSS']) -> None:
+    """
+    Maqueta una vez un documento de muestra con todas las variantes de fuente
+
+    Carga en la configuración de fuentes compartida las caras de la
+    plantilla (normal, negrita y cursiva, proporcional y monoespaciada), de
+    modo que la primera conversión real no paga esa búsqueda.
+
+    Args:
+        stylesheets: Hojas de estilo de la plantilla
+    """
+    global _fonts_warmed
+    with _lock:
+        if _fonts_warmed:
+            return
+        _fonts_warmed = True
+
+    from weasyprint import HTML
+
+    HTML(string=FONT_SAMPLE_HTML).render(stylesheets=stylesheets, font_config=get_font_config())
+
+
+def clear_stylesheet_cache() -> None:
+    """Vacía la caché de hojas de estilo parseadas"""
+    with _lock:
+        _stylesheet_cache.clear()
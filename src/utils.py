@@ -2,9 +2,36 @@
 Utilidades generales para el proyecto
 """
 
+import codecs
+import mmap
 import os
+import sys
 from pathlib import Path
-from typing import Optional
+from typing import Iterator, Optional
+
+from .converters.registry import get_language, get_registered_kind
+
+
+# Bytes iniciales usados para detectar la codificación
+_SAMPLE_SIZE = 64 * 1024
+
+# Zona inicial donde se buscan bytes nulos de UTF-16 sin BOM
+_NUL_SCAN_SIZE = 4 * 1024
+
+# Tamaño a partir del cual los archivos se leen con mmap
+_MMAP_THRESHOLD = 1024 * 1024
+
+# Bytes leídos en cada bloque por el decodificador incremental
+_READ_BLOCK_SIZE = 1024 * 1024
+
+# Marcas de orden de bytes (UTF-32 antes que UTF-16: comparten prefijo)
+_BOMS = (
+    (codecs.BOM_UTF32_LE, 'utf-32'),
+    (codecs.BOM_UTF32_BE, 'utf-32'),
+    (codecs.BOM_UTF8, 'utf-8-sig'),
+    (codecs.BOM_UTF16_LE, 'utf-16'),
+    (codecs.BOM_UTF16_BE, 'utf-16'),
+)
 
 
 def get_file_extension(filepath: str) -> str:
@@ -21,24 +48,18 @@ def get_file_extension(filepath: str) -> str:
 
 
 def is_markdown_file(filepath: str) -> bool:
-    """Verifica si el archivo es Markdown"""
-    return get_file_extension(filepath).lower() in ['md', 'markdown']
+    """Verifica si la extensión del archivo está registrada como Markdown"""
+    return get_registered_kind(filepath) == 'markdown'
 
 
 def is_text_file(filepath: str) -> bool:
-    """Verifica si el archivo es texto plano"""
-    return get_file_extension(filepath).lower() == 'txt'
+    """Verifica si la extensión del archivo está registrada como texto plano"""
+    return get_registered_kind(filepath) == 'text'
 
 
 def is_code_file(filepath: str) -> bool:
-    """Verifica si el archivo es código fuente"""
-    code_extensions = [
-        'py', 'js', 'jsx', 'ts', 'tsx', 'java', 'c', 'cpp', 'h', 'hpp',
-        'cs', 'php', 'rb', 'go', 'rs', 'swift', 'kt', 'scala', 'r',
-        'html', 'css', 'scss', 'sass', 'json', 'xml', 'yaml', 'yml',
-        'sh', 'bash', 'sql', 'vue', 'dart', 'lua', 'perl', 'asm'
-    ]
-    return get_file_extension(filepath).lower() in code_extensions
+    """Verifica si la extensión del archivo está registrada como código fuente"""
+    return get_registered_kind(filepath) == 'code'
 
 
 def get_language_from_extension(filepath: str) -> str:
@@ -51,76 +72,179 @@ def get_language_from_extension(filepath: str) -> str:
     Returns:
         Nombre del lenguaje para Pygments
     """
-    ext = get_file_extension(filepath).lower()
+    return get_language(filepath)
+
+
+def detect_encoding(sample: bytes, default: str = 'utf-8') -> str:
+    """
+    Detecta la codificación a partir de una muestra inicial del archivo
     
-    language_map = {
-        'py': 'python',
-        'js': 'javascript',
-        'jsx': 'jsx',
-        'ts': 'typescript',
-        'tsx': 'tsx',
-        'java': 'java',
-        'c': 'c',
-        'cpp': 'cpp',
-        'h': 'c',
-        'hpp': 'cpp',
-        'cs': 'csharp',
-        'php': 'php',
-        'rb': 'ruby',
-        'go': 'go',
-        'rs': 'rust',
-        'swift': 'swift',
-        'kt': 'kotlin',
-        'scala': 'scala',
-        'r': 'r',
-        'html': 'html',
-        'css': 'css',
-        'scss': 'scss',
-        'sass': 'sass',
-        'json': 'json',
-        'xml': 'xml',
-        'yaml': 'yaml',
-        'yml': 'yaml',
-        'sh': 'bash',
-        'bash': 'bash',
-        'sql': 'sql',
-        'vue': 'vue',
-        'dart': 'dart',
-        'lua': 'lua',
-        'perl': 'perl',
-        'asm': 'nasm'
-    }
+    Args:
+        sample: Primeros bytes del archivo
+        default: Codificación preferida si no hay BOM
+        
+    Returns:
+        Nombre de la codificación para decodificar el archivo completo
+    """
+    for bom, encoding in _BOMS:
+        if sample.startswith(bom):
+            return encoding
+    
+    # UTF-16 sin BOM: uno de cada dos bytes es nulo en texto ASCII
+    if len(sample) >= 4 and b'\x00' in sample[:_NUL_SCAN_SIZE]:
+        head = sample[:_NUL_SCAN_SIZE]
+        if head[1::2].count(0) > len(head) // 4 and head[0::2].count(0) == 0:
+            return 'utf-16-le'
+        if head[0::2].count(0) > len(head) // 4 and head[1::2].count(0) == 0:
+            return 'utf-16-be'
     
-    return language_map.get(ext, 'text')
+    try:
+        sample.decode(default)
+    except UnicodeDecodeError as e:
+        # Ignorar un posible carácter multibyte cortado al final de la muestra
+        if e.start < len(sample) - 4:
+            return 'latin-1'
+    return default
+
+
+def _normalize_newlines(text: str) -> str:
+    """Convierte los saltos de línea \\r\\n y \\r en \\n (como el modo texto)"""
+    if '\r' not in text:
+        return text
+    return text.replace('\r\n', '\n').replace('\r', '\n')
+
+
+def decode_content(data, encoding: str = 'utf-8') -> str:
+    """
+    Decodifica contenido en memoria en una sola pasada
+    
+    La codificación se detecta con una muestra inicial (BOM, UTF-16 o la
+    codificación preferida); si el resto del contenido no es válido se
+    decodifica como latin-1 sin volver a leerlo.
+    
+    Args:
+        data: Bytes del contenido (o cualquier objeto con protocolo buffer,
+            como un mmap)
+        encoding: Codificación preferida
+        
+    Returns:
+        Texto decodificado con saltos de línea normalizados
+    """
+    detected = detect_encoding(bytes(data[:_SAMPLE_SIZE]), encoding)
+    try:
+        text = str(data, detected)
+    except UnicodeDecodeError:
+        text = str(data, 'latin-1')
+    return _normalize_newlines(text)
 
 
 def read_file_content(filepath: str, encoding: str = 'utf-8') -> Optional[str]:
     """
     Lee el contenido de un archivo
     
+    El archivo se lee una sola vez (con mmap si es grande, para no copiar
+    los bytes en memoria antes de decodificarlos) y se decodifica una vez.
+    
     Args:
         filepath: Ruta del archivo
-        encoding: Codificación del archivo
+        encoding: Codificación preferida del archivo
         
     Returns:
         Contenido del archivo o None si hay error
     """
     try:
-        with open(filepath, 'r', encoding=encoding) as f:
-            return f.read()
-    except UnicodeDecodeError:
-        # Intentar con otra codificación
-        try:
-            with open(filepath, 'r', encoding='latin-1') as f:
-                return f.read()
-        except Exception as e:
-            print(f"Error al leer archivo: {e}")
-            return None
+        with open(filepath, 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            if size < _MMAP_THRESHOLD:
+                return decode_content(f.read(), encoding)
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                return decode_content(mapped, encoding)
     except Exception as e:
-        print(f"Error al leer archivo: {e}")
+        print(f"Error al leer archivo: {e}", file=sys.stderr)
         return None
 
 
+def iter_decoded_chunks(
+    filepath: str,
+    chunk_size: int = _READ_BLOCK_SIZE,
+    encoding: str = 'utf-8'
+) -> Iterator[str]:
+    """
+    Decodifica un archivo por bloques con un decodificador incremental
+    
+    La codificación se detecta con el primer bloque, con el mismo criterio
+    que decode_content(): si no es válido en la codificación preferida, el
+    archivo se lee como latin-1. Si los bytes no válidos aparecen en un
+    bloque posterior, el texto ya devuelto no se puede corregir, así que
+    se decodifica como latin-1 desde ese punto. Los caracteres multibyte
+    y los \\r\\n partidos entre bloques se reconstruyen.
+    
+    Args:
+        filepath: Ruta del archivo
+        chunk_size: Bytes leídos en cada bloque
+        encoding: Codificación preferida del archivo
+        
+    Yields:
+        Fragmentos de texto con saltos de línea normalizados
+    """
+    with open(filepath, 'rb') as f:
+        block = f.read(max(chunk_size, _SAMPLE_SIZE))
+        decoder = codecs.getincrementaldecoder(detect_encoding(block, encoding))()
+        
+        carry_cr = False
+        while True:
+            final = not block
+            try:
+                text = decoder.decode(block, final=final)
+            except UnicodeDecodeError as e:
+                # Lo válido hasta el error en su codificación; el resto, latin-1
+                text = e.object[:e.start].decode(e.encoding) + e.object[e.start:].decode('latin-1')
+                decoder = codecs.getincrementaldecoder('latin-1')()
+            if carry_cr:
+                text = '\r' + text
+            # Un \r al final puede ser la mitad de un \r\n
+            carry_cr = not final and text.endswith('\r')
+            if carry_cr:
+                text = text[:-1]
+            if text:
+                yield _normalize_newlines(text)
+            if final:
+                break
+            block = f.read(chunk_size)
+
+
+def iter_file_chunks(
+    filepath: str,
+    max_lines: int = 2000,
+    encoding: str = 'utf-8'
+) -> Iterator[str]:
+    """
+    Lee un archivo por bloques de líneas completas sin cargarlo entero
+
+    Args:
+        filepath: Ruta del archivo
+        max_lines: Número máximo de líneas por bloque
+        encoding: Codificación preferida del archivo
+
+    Yields:
+        Bloques de texto que terminan en un salto de línea (salvo el último)
+    """
+    lines = []
+    tail = ''
+    for text in iter_decoded_chunks(filepath, encoding=encoding):
+        parts = (tail + text).split('\n')
+        tail = parts.pop()
+        for line in parts:
+            lines.append(line + '\n')
+            if len(lines) >= max_lines:
+                yield ''.join(lines)
+                lines = []
+    if tail:
+        lines.append(tail)
+    if lines:
+        yield ''.join(lines)
+
+
 def ensure_directory_exists(directory: str) -> None:
     """
     Asegura que un directorio exista, creándolo si es necesario
@@ -0,0 +1,158 @@
+"""
+Vigilancia de directorios para reconvertir solo los archivos modificados
+"""
+
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Optional
+
+from .batch import get_output_path
+
+
+# Segundos entre dos sondeos de los archivos vigilados
+DEFAULT_POLL_INTERVAL = 0.25
+
+# Segundos sin cambios que debe pasar un archivo antes de reconvertirlo
+DEFAULT_DEBOUNCE = 0.2
+
+
+def is_up_to_date(input_file: str, output_directory: Optional[str] = None) -> bool:
+    """
+    Indica si el PDF de un archivo existe y es posterior a su fuente
+
+    Args:
+        input_file: Ruta del archivo de entrada
+        output_directory: Directorio de salida (opcional)
+
+    Returns:
+        True si no hace falta volver a convertir el archivo
+    """
+    output_file = get_output_path(input_file, output_directory) or str(Path(input_file).with_suffix('.pdf'))
+    try:
+        return os.stat(output_file).st_mtime_ns >= os.stat(input_file).st_mtime_ns
+    except OSError:
+        return False
+
+
+class FileWatcher:
+    """Detecta archivos nuevos o modificados sondeando su mtime y tamaño"""
+
+    def __init__(
+        self,
+        roots: list[str],
+        extensions: list[str],
+        debounce: float = DEFAULT_DEBOUNCE
+    ):
+        """
+        Inicializa el vigilante con el estado actual de los archivos
+
+        Args:
+            roots: Directorios (se recorren recursivamente) y archivos a vigilar
+            extensions: Extensiones soportadas (con punto) dentro de los directorios
+            debounce: Segundos sin cambios antes de dar un archivo por modificado
+        """
+        self.roots = [str(root) for root in roots]
+        self.extensions = {ext.lower() for ext in extensions}
+        self.debounce = debounce
+        self._known = self.snapshot()
+        # Cambios aún sin estabilizar: ruta -> (firma, instante del último cambio)
+        self._pending: dict[str, tuple[tuple[int, int], float]] = {}
+
+    def snapshot(self) -> dict[str, tuple[int, int]]:
+        """
+        Obtiene la firma (mtime, tamaño) de todos los archivos vigilados
+
+        Returns:
+            Diccionario ruta -> (mtime en ns, tamaño)
+        """
+        files: dict[str, tuple[int, int]] = {}
+        for root in self.roots:
+            if os.path.isdir(root):
+                self._scan_directory(root, files)
+            else:
+                try:
+                    stat = os.stat(root)
+                except OSError:
+                    continue
+                files[root] = (stat.st_mtime_ns, stat.st_size)
+        return files
+
+    def _scan_directory(self, directory: str, files: dict) -> None:
+        """Recorre un directorio con os.scandir, que evita un stat por entrada"""
+        try:
+            entries = list(os.scandir(directory))
+        except OSError:
+            return
+        for entry in entries:
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    self._scan_directory(entry.path, files)
+                elif Path(entry.name).suffix.lower() in self.extensions:
+                    stat = entry.stat()
+                    files[entry.path] = (stat.st_mtime_ns, stat.st_size)
+            except OSError:
+                continue
+
+    def poll(self) -> tuple[list[str], list[str]]:
+        """
+        Compara el estado actual con el anterior
+
+        Un archivo cambiado solo se devuelve cuando su firma lleva
+        `debounce` segundos sin variar, así una ráfaga de guardados
+        produce una única reconversión.
+
+        Returns:
+            Tupla (archivos nuevos o modificados, archivos eliminados)
+        """
+        now = time.monotonic()
+        current = self.snapshot()
+
+        for path, signature in current.items():
+            if self._known.get(path) != signature:
+                pending = self._pending.get(path)
+                if pending is None or pending[0] != signature:
+                    self._pending[path] = (signature, now)
+
+        changed = []
+        for path, (signature, since) in list(self._pending.items()):
+            if path not in current:
+                del self._pending[path]
+            elif now - since >= self.debounce:
+                changed.append(path)
+                self._known[path] = signature
+                del self._pending[path]
+
+        removed = [path for path in self._known if path not in current]
+        for path in removed:
+            del self._known[path]
+
+        return sorted(changed), sorted(removed)
+
+
+def watch(
+    watcher: FileWatcher,
+    on_change: Callable[[list[str]], None],
+    on_remove: Optional[Callable[[list[str]], None]] = None,
+    interval: float = DEFAULT_POLL_INTERVAL,
+    stop_event: Optional[threading.Event] = None
+) -> None:
+    """
+    Sondea los archivos vigilados hasta que se detenga
+
+    Args:
+        watcher: Vigilante de archivos
+        on_change: Función que recibe los archivos nuevos o modificados
+        on_remove: Función que recibe los archivos eliminados (opcional)
+        interval: Segundos entre sondeos
+        stop_event: Evento para detener la vigilancia (opcional; si no,
+            se detiene con Ctrl+C)
+    """
+    stop_event = stop_event or threading.Event()
+    while not stop_event.wait(interval):
+        changed, removed = watcher.poll()
+        if removed and on_remove is not None:
+            on_remove(removed)
+        if changed:
+            on_change(changed)
@@ -0,0 +1,46 @@
+"""
+Pruebas de la API asíncrona
+"""
+
+import tempfile
+import unittest
+from pathlib import Path
+
+from pypdf import PdfReader
+
+from src.async_api import AsyncPDFGenerator
+from src.pdf_generator import PDFGenerator
+
+
+class AsyncPDFGeneratorTest(unittest.IsolatedAsyncioTestCase):
+    """Conversión en el pool de procesos con las opciones del generador"""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.tmp = Path(self.tmp_dir.name)
+        self.input_file = self.tmp / 'registro.txt'
+        self.input_file.write_text('arranque\nparada\n', encoding='utf-8')
+
+    async def test_generator_options_reach_the_workers(self):
+        # El renderizador directo escribe "nombre · página/total" en la cabecera
+        options = PDFGenerator(text_renderer='direct').get_worker_options()
+        async with AsyncPDFGenerator(workers=1, generator_options=options) as generator:
+            output_file = await generator.convert_to_pdf(str(self.input_file))
+
+        header = PdfReader(output_file).pages[0].extract_text()
+        self.assertIn('registro.txt', header)
+        self.assertIn('1/1', header)
+
+    async def test_failures_raise(self):
+        options = {'text_renderer': 'direct'}
+        async with AsyncPDFGenerator(workers=1, generator_options=options) as generator:
+            with self.assertRaises(Exception):
+                await generator.convert_to_pdf(str(self.tmp / 'no-existe.txt'))
+            results = await generator.convert_many([str(self.input_file), str(self.tmp / 'no-existe.txt')])
+
+        self.assertEqual(sorted(result.ok for result in results), [False, True])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+"""
+Pruebas del motor de conversión por lotes
+"""
+
+import contextlib
+import io
+import tempfile
+import unittest
+from pathlib import Path
+
+from pypdf import PdfReader
+
+from src.batch import BatchConverter
+from src.pdf_generator import PDFGenerator
+
+
+# El renderizador directo no necesita WeasyPrint (ni Pango)
+DIRECT = {'text_renderer': 'direct'}
+
+
+class BatchConverterTest(unittest.TestCase):
+    """Conversión en procesos worker y propagación de errores"""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.tmp = Path(self.tmp_dir.name)
+
+        self.files = []
+        for name, content in (
+            ('uno.txt', 'primera línea\nsegunda línea\n'),
+            ('dos.log', '\n'.join(f"evento {i}" for i in range(200)) + '\n'),
+            ('tres.py', 'def f(x):\n    return x * 2\n'),
+        ):
+            path = self.tmp / name
+            path.write_text(content, encoding='utf-8')
+            self.files.append(str(path))
+        self.missing = str(self.tmp / 'no-existe.txt')
+
+    def test_converts_in_worker_processes(self):
+        with BatchConverter(workers=2, generator_options=DIRECT) as batch:
+            results = batch.convert(self.files, str(self.tmp / 'pdfs'))
+
+        self.assertEqual(sorted(r.input_file for r in results), sorted(self.files))
+        for result in results:
+            with self.subTest(input_file=Path(result.input_file).name):
+                self.assertTrue(result.ok, result.error)
+                self.assertEqual(Path(result.output_file).parent, self.tmp / 'pdfs')
+                self.assertEqual(result.stats['pages'], len(PdfReader(result.output_file).pages))
+
+    def test_failures_are_returned_per_file(self):
+        with BatchConverter(workers=2, generator_options=DIRECT) as batch:
+            results = {r.input_file: r for r in batch.iter_convert(self.files + [self.missing])}
+
+        failed = results.pop(self.missing)
+        self.assertFalse(failed.ok)
+        self.assertIsNone(failed.output_file)
+        self.assertTrue(failed.error)
+        self.assertTrue(all(result.ok for result in results.values()))
+
+    def test_convert_multiple_files_reports_failures_on_stderr(self):
+        generator = PDFGenerator(**DIRECT)
+        stdout, stderr = io.StringIO(), io.StringIO()
+        with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+            output_files = generator.convert_multiple_files(
+                self.files + [self.missing], str(self.tmp / 'pdfs'), workers=2
+            )
+
+        self.assertEqual(len(output_files), len(self.files))
+        self.assertEqual(stdout.getvalue(), '')
+        self.assertIn(self.missing, stderr.getvalue())
+
+
+if __name__ == '__main__':
+    unittest.main()
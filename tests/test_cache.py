@@ -0,0 +1,101 @@
+"""
+Pruebas de la caché de PDFs
+"""
+
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+from pypdf import PdfReader
+
+from src.cache import OutputCache
+from src.instrumentation import ConversionStats
+from src.pdf_generator import PDFGenerator
+
+
+class OutputCacheTest(unittest.TestCase):
+    """Claves, aciertos y metadatos de las entradas"""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.tmp = Path(self.tmp_dir.name)
+        self.cache = OutputCache(directory=str(self.tmp / 'cache'))
+
+        self.source = self.tmp / 'alpha.py'
+        self.source.write_text('print(1)\n', encoding='utf-8')
+        self.pdf = self.tmp / 'generado.pdf'
+        self.pdf.write_bytes(b'%PDF-1.7 prueba')
+
+    def test_key_depends_on_content_and_options(self):
+        key = self.cache.make_key(str(self.source), style='default')
+        self.assertEqual(key, self.cache.make_key(str(self.source), style='default'))
+        self.assertNotEqual(key, self.cache.make_key(str(self.source), style='monokai'))
+
+        self.source.write_text('print(2)\n', encoding='utf-8')
+        self.assertNotEqual(key, self.cache.make_key(str(self.source), style='default'))
+
+    def test_fetch_returns_stored_metadata(self):
+        key = self.cache.make_key(str(self.source))
+        output = self.tmp / 'salida.pdf'
+        self.assertIsNone(self.cache.fetch(key, str(output)))
+
+        self.cache.store(key, str(self.pdf), {'pages': 3})
+        self.assertEqual(self.cache.fetch(key, str(output)), {'pages': 3})
+        self.assertEqual(output.read_bytes(), self.pdf.read_bytes())
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 1))
+
+    def test_eviction_removes_metadata(self):
+        cache = OutputCache(directory=str(self.tmp / 'pequeña'), max_bytes=1)
+        key = cache.make_key(str(self.source))
+        cache.store(key, str(self.pdf), {'pages': 1})
+        self.assertEqual(list((self.tmp / 'pequeña').glob('*/*')), [])
+
+
+class GeneratorCacheTest(unittest.TestCase):
+    """Aciertos de caché de PDFGenerator (renderizado directo, sin WeasyPrint)"""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.tmp = Path(self.tmp_dir.name)
+        self.cache_dir = str(self.tmp / 'cache')
+
+        self.alpha = self.tmp / 'alpha.py'
+        self.alpha.write_text(
+            '\n'.join(f"valor_{i} = {i}" for i in range(150)) + '\n', encoding='utf-8'
+        )
+
+    def _convert(self, input_file: Path) -> ConversionStats:
+        stats = []
+        generator = PDFGenerator(
+            text_renderer='direct',
+            cache=OutputCache(directory=self.cache_dir),
+            on_stats=stats.append
+        )
+        generator.convert_to_pdf(str(input_file))
+        return stats[0]
+
+    def test_hit_reports_pages(self):
+        first = self._convert(self.alpha)
+        self.assertFalse(first.cached)
+
+        second = self._convert(self.alpha)
+        self.assertTrue(second.cached)
+        self.assertEqual(second.pages, first.pages)
+        self.assertEqual(second.pages, len(PdfReader(str(self.tmp / 'alpha.pdf')).pages))
+
+    def test_same_content_with_another_name_is_not_a_hit(self):
+        self._convert(self.alpha)
+        beta = self.tmp / 'beta.py'
+        shutil.copyfile(self.alpha, beta)
+
+        self.assertFalse(self._convert(beta).cached)
+        header = PdfReader(str(self.tmp / 'beta.pdf')).pages[0].extract_text()
+        self.assertIn('beta.py', header)
+        self.assertNotIn('alpha.py', header)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,67 @@
+"""
+Pruebas de la línea de comandos
+"""
+
+import contextlib
+import io
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from src import cli
+from src.pdf_generator import PDFGenerator
+
+
+class BundleTest(unittest.TestCase):
+    """Errores de --bundle como registros JSON"""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.tmp = Path(self.tmp_dir.name)
+
+        self.files = []
+        for name in ('uno.md', 'dos.md'):
+            path = self.tmp / name
+            path.write_text(f"# {name}\n", encoding='utf-8')
+            self.files.append(str(path))
+
+    def _run(self, argv: list[str]) -> tuple[int, list[dict], str]:
+        stdout, stderr = io.StringIO(), io.StringIO()
+        with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+            code = cli.main(argv)
+        # Cada línea de stdout debe ser JSON
+        records = [json.loads(line) for line in stdout.getvalue().splitlines()]
+        return code, records, stderr.getvalue()
+
+    def test_failures_are_json_records(self):
+        output = str(self.tmp / 'todo.pdf')
+        with mock.patch.object(
+            PDFGenerator, '_read_and_convert_to_html', side_effect=ValueError('roto')
+        ):
+            code, records, _ = self._run(['--bundle', output] + self.files)
+
+        self.assertEqual(code, 1)
+        errors = [record for record in records if record.get('input')]
+        self.assertEqual([record['input'] for record in errors], self.files)
+        self.assertTrue(all(record['status'] == 'error' for record in errors))
+        self.assertIn('roto', errors[0]['error'])
+
+        summary = records[-1]['summary']
+        self.assertEqual((summary['converted'], summary['failed']), (0, len(self.files)))
+
+
+    def test_watch_rejects_bundle_and_server(self):
+        for extra in (['--bundle', str(self.tmp / 'todo.pdf')], ['--server', '127.0.0.1:1']):
+            with self.subTest(extra=extra):
+                stderr = io.StringIO()
+                with contextlib.redirect_stderr(stderr), self.assertRaises(SystemExit) as raised:
+                    cli.main(['--watch'] + extra + self.files)
+                self.assertEqual(raised.exception.code, 2)
+                self.assertIn('--watch', stderr.getvalue())
+
+
+if __name__ == '__main__':
+    unittest.main()
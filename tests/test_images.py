@@ -0,0 +1,64 @@
+"""
+Pruebas del cargador de imágenes reducidas
+"""
+
+import io
+import tempfile
+import unittest
+from pathlib import Path
+
+from PIL import Image
+
+from src.images import ImageCache, ImageFetcher, create_image_fetcher
+
+try:
+    from weasyprint.urls import URLFetcher, fetch
+except (ImportError, OSError):
+    # Sin WeasyPrint o sin sus bibliotecas nativas (Pango)
+    URLFetcher = fetch = None
+
+
+# Ancho útil de A4 con márgenes de 2 cm, en puntos
+CONTENT_WIDTH = 481.9
+
+
+class ImageFetcherTest(unittest.TestCase):
+    """Reducción de imágenes a través del url_fetcher"""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        directory = Path(self.tmp_dir.name)
+        self.big = directory / 'captura.png'
+        self.small = directory / 'icono.png'
+        Image.new('RGB', (3000, 1500), 'white').save(self.big)
+        Image.new('RGB', (300, 150), 'red').save(self.small)
+        self.cache = ImageCache()
+
+    def test_reduces_wide_images_once(self):
+        fetcher = ImageFetcher(150, CONTENT_WIDTH, self.cache)
+        data, mime_type = fetcher.get_reduced(self.big.as_uri())
+        self.assertEqual(mime_type, 'image/png')
+        self.assertEqual(Image.open(io.BytesIO(data)).size, (1004, 502))
+        self.assertIsNone(fetcher.get_reduced(self.small.as_uri()))
+
+        fetcher.get_reduced(self.big.as_uri())
+        stats = self.cache.stats()
+        self.assertEqual((stats['hits'], stats['misses'], stats['reduced']), (1, 2, 1))
+
+    @unittest.skipIf(fetch is None, 'WeasyPrint no está disponible')
+    def test_weasyprint_fetch(self):
+        fetcher = create_image_fetcher(150, CONTENT_WIDTH, self.cache)
+        self.assertIsInstance(fetcher, URLFetcher)
+
+        with fetch(fetcher, self.big.as_uri()) as response:
+            self.assertEqual(response.content_type, 'image/png')
+            self.assertEqual(Image.open(io.BytesIO(response.read())).size, (1004, 502))
+
+        # Las imágenes que no hace falta reducir se cargan tal cual
+        with fetch(fetcher, self.small.as_uri()) as response:
+            self.assertEqual(response.read(), self.small.read_bytes())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,67 @@
+"""
+Pruebas del renderizado directo de texto y código
+"""
+
+import tempfile
+import unittest
+from pathlib import Path
+
+from pypdf import PdfReader
+
+from src.monospace_pdf import MonospacePDFRenderer
+from src.pdf_generator import PDFGenerator
+
+
+class DirectRendererTest(unittest.TestCase):
+    """Páginas escritas sobre la marcha, con y sin lectura por bloques"""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.tmp = Path(self.tmp_dir.name)
+
+        lines = []
+        for i in range(3000):
+            # Tabuladores y líneas más anchas que la página
+            lines.append('\t' * (i % 3) + f"linea {i} " + 'x' * (i % 7 * 40))
+        self.text_file = self.tmp / 'log.txt'
+        self.text_file.write_text('\n'.join(lines) + '\n', encoding='utf-8')
+
+    def _convert(self, input_file: Path, stream_threshold) -> PdfReader:
+        output = self.tmp / f"{input_file.stem}-{stream_threshold}.pdf"
+        generator = PDFGenerator(
+            text_renderer='direct', stream_threshold=stream_threshold, chunk_lines=500
+        )
+        generator.convert_to_pdf(str(input_file), str(output))
+        return PdfReader(str(output))
+
+    def test_page_total_matches_written_pages(self):
+        for stream_threshold in (None, 1024):
+            with self.subTest(stream_threshold=stream_threshold):
+                reader = self._convert(self.text_file, stream_threshold)
+                total = len(reader.pages)
+                self.assertGreater(total, 1)
+                self.assertIn(f"{total}/{total}", reader.pages[-1].extract_text())
+
+    def test_streaming_matches_in_memory(self):
+        code_file = self.tmp / 'modulo.py'
+        code_file.write_text(
+            '\n\n'.join(f"def f{i}(x):\n\treturn x * {i}" for i in range(1500)) + '\n',
+            encoding='utf-8'
+        )
+        for input_file in (self.text_file, code_file):
+            with self.subTest(input_file=input_file.name):
+                in_memory = self._convert(input_file, None)
+                streamed = self._convert(input_file, 1024)
+                self.assertEqual(len(in_memory.pages), len(streamed.pages))
+                self.assertEqual(
+                    in_memory.pages[-1].extract_text(), streamed.pages[-1].extract_text()
+                )
+
+    def test_measure_rejects_unsupported_characters(self):
+        self.assertIsNone(MonospacePDFRenderer.measure(['ok\n', 'π\n']))
+        self.assertEqual(list(MonospacePDFRenderer.measure(['a\tb\n', '\n'])), [9, 0])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,93 @@
+"""
+Pruebas del renderizado en paralelo de documentos grandes
+"""
+
+import re
+import tempfile
+import unittest
+from pathlib import Path
+
+from pypdf import PdfReader
+
+from src.converters.cached_markdown import slugify
+from src.converters.code_converter import CodeConverter
+from src.converters.markdown_converter import MarkdownConverter
+from src.pdf_generator import PDFGenerator
+
+try:
+    import weasyprint
+except (ImportError, OSError):
+    # Sin WeasyPrint o sin sus bibliotecas nativas (Pango)
+    weasyprint = None
+
+
+_LINE_NUMBER_RE = re.compile(r'<span class="linenos">\s*(\d+)</span>')
+
+
+class SplitTest(unittest.TestCase):
+    """Partes de un documento (sin renderizar)"""
+
+    def test_render_parts_depend_on_size_and_options(self):
+        generator = PDFGenerator(render_workers=4, parallel_threshold=1000)
+        self.assertEqual(generator._get_render_parts('a.md', 'markdown', 999), 1)
+        self.assertEqual(generator._get_render_parts('a.md', 'markdown', 5000), 4)
+        self.assertEqual(generator._get_render_parts('a.py', 'code', 5000), 4)
+
+        direct = PDFGenerator(render_workers=4, parallel_threshold=1000, text_renderer='direct')
+        self.assertEqual(direct._get_render_parts('a.py', 'code', 5000), 1)
+        self.assertEqual(PDFGenerator(render_workers=1)._get_render_parts('a.md', 'markdown', 10 ** 9), 1)
+
+    def test_code_blocks_keep_numbering(self):
+        code = ''.join(f"x_{i} = {i}\n" for i in range(1, 101))
+        blocks = CodeConverter().convert_blocks(code, 'python', 'mod.py', True, block_lines=40)
+
+        self.assertEqual(len(blocks), 3)
+        self.assertIn('mod.py', blocks[0])
+        self.assertFalse(any('mod.py' in block for block in blocks[1:]))
+        numbers = [int(n) for block in blocks for n in _LINE_NUMBER_RE.findall(block)]
+        self.assertEqual(numbers, list(range(1, 101)))
+
+    def test_markdown_splits_before_headings(self):
+        converter = MarkdownConverter()
+        html = converter.convert(
+            ''.join(f"# Sección {i}\n\n{'texto ' * 200}\n\n" for i in range(6)), 'doc.md'
+        )
+        parts = converter.split_sections(html, 3)
+
+        self.assertEqual(len(parts), 3)
+        self.assertEqual(''.join(parts), html)
+        self.assertTrue(all(part.lstrip().startswith('<h1') for part in parts[1:]))
+
+    def test_slugify_matches_markdown2_header_ids(self):
+        html = MarkdownConverter().convert('# Año 2024: ¡Ñandú & C++!\n', 'doc.md')
+        self.assertIn(f'id="{slugify("Año 2024: ¡Ñandú & C++!")}"', html)
+
+
+@unittest.skipIf(weasyprint is None, "WeasyPrint no está disponible")
+class ParallelRenderTest(unittest.TestCase):
+    """Renderizado en paralelo frente al renderizado en un solo proceso"""
+
+    def test_parallel_matches_single_render(self):
+        with tempfile.TemporaryDirectory() as directory:
+            source = Path(directory) / 'grande.py'
+            source.write_text(''.join(f"valor_{i} = {i}\n" for i in range(3000)), encoding='utf-8')
+
+            pages = []
+            for render_workers in (1, 2):
+                output = Path(directory) / f"grande-{render_workers}.pdf"
+                generator = PDFGenerator(render_workers=render_workers, parallel_threshold=1024)
+                try:
+                    generator.convert_to_pdf(str(source), str(output))
+                finally:
+                    generator.close()
+                reader = PdfReader(str(output))
+                pages.append(len(reader.pages))
+                self.assertIn('valor_2999', reader.pages[-1].extract_text())
+
+            # Cada parte empieza en una página nueva: como mucho una más por parte
+            self.assertGreaterEqual(pages[1], pages[0])
+            self.assertLessEqual(pages[1], pages[0] + 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,64 @@
+"""
+Pruebas del registro de conversores
+"""
+
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+from src.converters import get_converter_kind, get_language, get_registered_kind, register_converter
+from src.pdf_generator import PDFGenerator
+
+
+class RegistryTest(unittest.TestCase):
+    """Resolución del tipo de conversor de cada archivo"""
+
+    def test_dispatch_by_extension(self):
+        self.assertEqual(get_converter_kind('README.MD'), 'markdown')
+        self.assertEqual(get_converter_kind('src/app.py'), 'code')
+        self.assertEqual(get_language('src/app.py'), 'python')
+        self.assertEqual(get_converter_kind('notas.txt'), 'text')
+
+    def test_unknown_extensions_fall_back_to_text(self):
+        self.assertIsNone(get_registered_kind('datos.desconocida'))
+        self.assertEqual(get_converter_kind('datos.desconocida'), 'text')
+        self.assertEqual(get_converter_kind('LICENSE'), 'text')
+
+    def test_extensionless_scripts_are_code(self):
+        self.assertEqual(get_converter_kind('deploy', '#!/bin/sh\n'), 'code')
+        self.assertEqual(get_converter_kind('deploy', b'#!/bin/sh\n'), 'code')
+        self.assertEqual(get_converter_kind('notas.txt', '#!/bin/sh\n'), 'text')
+
+        with tempfile.TemporaryDirectory() as directory:
+            script = Path(directory) / 'deploy'
+            script.write_text('#!/usr/bin/env python3\nprint(1)\n', encoding='utf-8')
+            self.assertEqual(PDFGenerator()._get_converter_kind(str(script)), 'code')
+
+    def test_reregistering_replaces_extensions(self):
+        factory = lambda generator: None
+        register_converter('prueba-registro', factory, extensions=('.preg', '.preg2'))
+        self.assertEqual(get_converter_kind('a.preg2'), 'prueba-registro')
+
+        register_converter('prueba-registro', factory, extensions=('.PREG',))
+        self.assertEqual(get_converter_kind('a.preg'), 'prueba-registro')
+        self.assertIsNone(get_registered_kind('a.preg2'))
+
+    def test_importing_the_generator_does_not_load_pygments(self):
+        code = (
+            "import sys, src.pdf_generator, src.cli; "
+            "print(any(name.split('.')[0] == 'pygments' for name in sys.modules))"
+        )
+        result = subprocess.run(
+            [sys.executable, '-c', code],
+            cwd=Path(__file__).resolve().parent.parent,
+            capture_output=True,
+            text=True,
+            check=True
+        )
+        self.assertEqual(result.stdout.strip(), 'False')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,121 @@
+"""
+Pruebas de la API HTTP del servidor de conversión
+"""
+
+import http.client
+import json
+import os
+import stat
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+
+from src.server import ConversionService, ServerClient, create_server, load_or_create_token
+
+
+TOKEN = 'secreto'
+
+
+class ServerAPITest(unittest.TestCase):
+    """Respuestas 400, 401, 403, 415 y 503 (sin llegar a los workers)"""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.tmp = Path(self.tmp_dir.name)
+
+        self.service = ConversionService(
+            workers=1,
+            max_queue=1,
+            queue_timeout=0.05,
+            generator_options={'text_renderer': 'direct'}
+        )
+        self.addCleanup(self.service.close)
+        self.server = create_server(self.service, '127.0.0.1:0', token=TOKEN)
+        self.addCleanup(self.server.server_close)
+        thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        thread.start()
+        self.addCleanup(self.server.shutdown)
+        self.port = self.server.server_address[1]
+
+        self.input_file = self.tmp / 'notas.txt'
+        self.input_file.write_text('hola\n', encoding='utf-8')
+
+    def _post(self, body, headers: dict = None) -> tuple[int, dict]:
+        request_headers = {
+            'Content-Type': 'application/json',
+            'Authorization': f"Bearer {TOKEN}",
+        }
+        request_headers.update(headers or {})
+        payload = body if isinstance(body, bytes) else json.dumps(body).encode('utf-8')
+        connection = http.client.HTTPConnection('127.0.0.1', self.port, timeout=30)
+        try:
+            connection.request('POST', '/convert', body=payload, headers=request_headers)
+            response = connection.getresponse()
+            return response.status, json.loads(response.read())
+        finally:
+            connection.close()
+
+    def test_invalid_jobs_are_rejected_with_400(self):
+        for body in (
+            b'{no es json',
+            [str(self.input_file)],
+            {'input': 42},
+            {'inputs': 'notas.txt'},
+            {'input': str(self.input_file), 'line_numbers': 'false'},
+            {},
+        ):
+            with self.subTest(body=body):
+                status, data = self._post(body)
+                self.assertEqual(status, 400)
+                self.assertIn('error', data)
+
+    def test_requests_without_json_token_or_local_host_are_rejected(self):
+        job = {'input': str(self.input_file)}
+        self.assertEqual(self._post(job, {'Content-Type': 'text/plain'})[0], 415)
+        self.assertEqual(self._post(job, {'Authorization': 'Bearer otro'})[0], 401)
+        self.assertEqual(self._post(job, {'Host': f"ataque.example:{self.port}"})[0], 403)
+
+    def test_full_queue_answers_503(self):
+        # Ocupar el único hueco de la cola
+        self.service._acquire(None)
+        self.addCleanup(self.service._release, True)
+
+        connection = http.client.HTTPConnection('127.0.0.1', self.port, timeout=30)
+        self.addCleanup(connection.close)
+        connection.request(
+            'POST', '/convert',
+            body=json.dumps({'input': str(self.input_file)}),
+            headers={'Content-Type': 'application/json', 'Authorization': f"Bearer {TOKEN}"}
+        )
+        response = connection.getresponse()
+        self.assertEqual(response.status, 503)
+        self.assertEqual(response.getheader('Retry-After'), '1')
+        self.assertEqual(self.service.stats()['rejected'], 1)
+
+    def test_client_converts_with_token(self):
+        client = ServerClient(f"127.0.0.1:{self.port}", timeout=60, token=TOKEN)
+        record = client.convert(str(self.input_file))
+        self.assertEqual(record['status'], 'ok', record)
+        self.assertTrue(os.path.exists(record['output']))
+
+
+class TokenFileTest(unittest.TestCase):
+    """Archivo del token compartido por servidor y clientes"""
+
+    def test_token_is_created_private_and_reused(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / 'padlef' / 'server-token'
+            token = load_or_create_token(path)
+            self.assertTrue(token)
+            self.assertEqual(load_or_create_token(path), token)
+            if os.name == 'posix':
+                self.assertEqual(stat.S_IMODE(path.stat().st_mode), 0o600)
+                path.chmod(0o644)
+                with self.assertRaises(ValueError):
+                    load_or_create_token(path)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,105 @@
+"""
+Pruebas de la lectura de archivos
+"""
+
+import tempfile
+import unittest
+from pathlib import Path
+
+from src.utils import (
+    _SAMPLE_SIZE,
+    decode_content,
+    detect_encoding,
+    iter_decoded_chunks,
+    iter_file_chunks
+)
+
+
+class ChunkedReadingTest(unittest.TestCase):
+    """Lectura por bloques con memoria acotada"""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.tmp = Path(self.tmp_dir.name)
+
+    def _write(self, name: str, data: bytes) -> str:
+        path = self.tmp / name
+        path.write_bytes(data)
+        return str(path)
+
+    def test_crlf_split_between_blocks(self):
+        # El primer bloque termina justo entre el \r y el \n
+        head = b'x' * (_SAMPLE_SIZE - 1)
+        path = self._write('crlf.txt', head + b'\r\nghi\r\n\rjk')
+        chunks = list(iter_decoded_chunks(path, chunk_size=3))
+        self.assertGreater(len(chunks), 1)
+        self.assertEqual(''.join(chunks), 'x' * (_SAMPLE_SIZE - 1) + '\nghi\n\njk')
+        self.assertTrue(all('\r' not in chunk for chunk in chunks))
+
+    def test_multibyte_character_split_between_blocks(self):
+        for offset in (1, 2):
+            with self.subTest(offset=offset):
+                # El límite del primer bloque cae dentro de un € (3 bytes)
+                head = 'x' * (_SAMPLE_SIZE - offset)
+                path = self._write('utf8.txt', (head + '€ñ\n' * 3).encode('utf-8'))
+                text = ''.join(iter_decoded_chunks(path, chunk_size=1))
+                self.assertEqual(text, head + '€ñ\n' * 3)
+
+    def test_file_chunks_hold_complete_lines(self):
+        lines = [f"línea {i}\r\n" for i in range(25)]
+        path = self._write('lineas.txt', ''.join(lines).encode('utf-8') + b'sin salto')
+        chunks = list(iter_file_chunks(path, max_lines=10))
+
+        self.assertEqual([chunk.count('\n') for chunk in chunks], [10, 10, 5])
+        self.assertTrue(all(chunk.endswith('\n') for chunk in chunks[:-1]))
+        self.assertEqual(
+            ''.join(chunks), ''.join(line.replace('\r\n', '\n') for line in lines) + 'sin salto'
+        )
+
+
+class DecodingTest(unittest.TestCase):
+    """Detección de la codificación: BOM, UTF-16 y latin-1"""
+
+    TEXT = 'Año, señal y €\r\nsegunda línea\n'
+    EXPECTED = 'Año, señal y €\nsegunda línea\n'
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.tmp = Path(self.tmp_dir.name)
+
+    def test_byte_order_marks(self):
+        for encoding in ('utf-8-sig', 'utf-16', 'utf-16-le', 'utf-16-be', 'utf-32'):
+            with self.subTest(encoding=encoding):
+                data = self.TEXT.encode(encoding)
+                if encoding in ('utf-16-le', 'utf-16-be'):
+                    # Con BOM explícito del orden indicado
+                    data = '\ufeff'.encode(encoding) + data
+                self.assertEqual(decode_content(data), self.EXPECTED)
+
+    def test_utf16_without_bom(self):
+        for encoding in ('utf-16-le', 'utf-16-be'):
+            with self.subTest(encoding=encoding):
+                data = self.TEXT.encode(encoding)
+                self.assertEqual(detect_encoding(data), encoding)
+                self.assertEqual(decode_content(data), self.EXPECTED)
+
+    def test_latin1_fallback(self):
+        data = self.TEXT.replace('€', 'E').encode('latin-1')
+        self.assertEqual(detect_encoding(data), 'latin-1')
+        self.assertEqual(decode_content(data), self.EXPECTED.replace('€', 'E'))
+
+    def test_invalid_bytes_after_the_first_block(self):
+        # Lo anterior se conserva en UTF-8 y lo posterior se lee como latin-1
+        head = 'ñ' * _SAMPLE_SIZE
+        path = self.tmp / 'mixto.txt'
+        path.write_bytes(head.encode('utf-8') + 'café\n'.encode('latin-1'))
+
+        text = ''.join(iter_decoded_chunks(str(path), chunk_size=1024))
+        self.assertEqual(text, head + 'café\n')
+        self.assertNotIn('\ufffd', text)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+"""
+Pruebas de la vigilancia de archivos
+"""
+
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from src.watch import FileWatcher, is_up_to_date
+
+
+class FileWatcherTest(unittest.TestCase):
+    """Detección de cambios con espera hasta que se estabilizan"""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.tmp = Path(self.tmp_dir.name)
+        self.doc = self.tmp / 'doc.md'
+        self.doc.write_text('v1', encoding='utf-8')
+        (self.tmp / 'ignorado.bin').write_bytes(b'x')
+
+        self.now = 100.0
+        patcher = mock.patch('src.watch.time.monotonic', side_effect=lambda: self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.watcher = FileWatcher([str(self.tmp)], ['.md'], debounce=1.0)
+
+    def _touch(self, content: str) -> None:
+        self.doc.write_text(content, encoding='utf-8')
+        # Fecha distinta aunque el sistema de archivos tenga poca resolución
+        os.utime(self.doc, ns=(0, int(self.now * 1e9)))
+
+    def test_burst_of_saves_is_reported_once(self):
+        self._touch('v2')
+        self.assertEqual(self.watcher.poll(), ([], []))
+
+        # Otro guardado antes del plazo reinicia la espera
+        self.now += 0.6
+        self._touch('v3')
+        self.assertEqual(self.watcher.poll(), ([], []))
+        self.now += 0.6
+        self.assertEqual(self.watcher.poll(), ([], []))
+
+        self.now += 0.5
+        self.assertEqual(self.watcher.poll(), ([str(self.doc)], []))
+        self.now += 5
+        self.assertEqual(self.watcher.poll(), ([], []))
+
+    def test_new_and_removed_files(self):
+        new = self.tmp / 'sub' / 'nuevo.md'
+        new.parent.mkdir()
+        new.write_text('x', encoding='utf-8')
+        self.watcher.poll()
+        self.now += 1
+        self.assertEqual(self.watcher.poll(), ([str(new)], []))
+
+        self.doc.unlink()
+        self.assertEqual(self.watcher.poll(), ([], [str(self.doc)]))
+
+    def test_is_up_to_date(self):
+        self.assertFalse(is_up_to_date(str(self.doc)))
+        pdf = self.doc.with_suffix('.pdf')
+        pdf.write_bytes(b'%PDF')
+        os.utime(self.doc, ns=(0, 1_000_000_000))
+        os.utime(pdf, ns=(0, 2_000_000_000))
+        self.assertTrue(is_up_to_date(str(self.doc)))
+        os.utime(self.doc, ns=(0, 3_000_000_000))
+        self.assertFalse(is_up_to_date(str(self.doc)))
+
+
+if __name__ == '__main__':
+    unittest.main()